@@ -0,0 +1,150 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+from starlette.types import ASGIApp, Scope
+
+RECORDED_PREFIXES = ("/rankings/", "/stats/", "/charts/", "/games/", "/meta/")
+# marca no scope ASGI das chamadas do pré-aquecimento; só `_call` a define (não vem da rede)
+PREWARM_EXTENSION = "ia_games.prewarm"
+
+Key = Tuple[str, str, Tuple[Tuple[str, str], ...], Optional[str]]
+
+
+def normalize_key(method: str, path: str, params: Dict[str, Any], body: Optional[dict] = None) -> Key:
+    """Chave canônica de uma consulta: parâmetros vazios descartados e ordenados; corpo JSON compacto."""
+    items = tuple(sorted((str(k), str(v).strip()) for k, v in params.items() if v is not None and str(v).strip()))
+    raw_body = json.dumps(body, ensure_ascii=False, sort_keys=True, separators=(",", ":")) if body else None
+    return method.upper(), path, items, raw_body
+
+
+class AccessRecorder:
+    """
+    Conta as consultas atendidas (chaves normalizadas) e acumula as contagens num arquivo JSON local,
+    somando às que já estão lá (vários workers podem compartilhar o arquivo).
+    O arquivo é regravado no máximo a cada `flush_interval` segundos e no shutdown.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 30.0):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending: Counter = Counter()
+        self._last_flush = time.monotonic()
+
+    def record(self, method: str, path: str, params: Dict[str, Any], body: Optional[dict] = None) -> None:
+        key = normalize_key(method, path, params, body)
+        with self._lock:
+            self._pending[key] += 1
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def _read(self) -> Counter:
+        counts: Counter = Counter()
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return counts
+        for e in data.get("keys", []):
+            key = (e["method"], e["path"], tuple(tuple(p) for p in e.get("params", [])), e.get("body"))
+            counts[key] += int(e.get("count", 0))
+        return counts
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        counts = self._read()
+        counts.update(pending)
+        entries = [
+            {"method": m, "path": p, "params": [list(kv) for kv in params], "body": body, "count": n}
+            for (m, p, params, body), n in counts.most_common()
+        ]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"keys": entries}, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def top(self, n: int) -> List[Key]:
+        """As `n` chaves mais frequentes (arquivo + contagens ainda não gravadas)."""
+        counts = self._read()
+        with self._lock:
+            counts.update(self._pending)
+        return [k for k, _ in counts.most_common(n)]
+
+
+def is_prewarm(scope: Scope) -> bool:
+    """True para as chamadas feitas pelo próprio pré-aquecimento."""
+    return PREWARM_EXTENSION in (scope.get("extensions") or {})
+
+
+async def _call(app: ASGIApp, key: Key) -> int:
+    method, path, params, body = key
+    payload = body.encode("utf-8") if body else b""
+    headers = [(b"host", b"prewarm")]
+    if body:
+        headers.append((b"content-type", b"application/json"))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": quote(path).encode(),
+        "query_string": urlencode(list(params)).encode(),
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 0),
+        "server": ("prewarm", 80),
+        "extensions": {PREWARM_EXTENSION: {}},
+    }
+    done = asyncio.Event()
+    status = 0
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body"):
+            done.set()
+
+    await app(scope, receive, send)
+    done.set()
+    return status
+
+
+def replay(app: ASGIApp, keys: List[Key]) -> Dict[str, Any]:
+    """
+    Refaz as consultas dentro do próprio processo (sem rede), pelo mesmo caminho de uma requisição
+    normal, para popular os caches de resultado e as estruturas derivadas. Não são registradas de novo.
+    """
+    t0 = time.perf_counter()
+
+    async def _run():
+        return [await _call(app, k) for k in keys]
+
+    statuses = asyncio.run(_run())
+    return {
+        "replayed": len(keys),
+        "ok": sum(1 for s in statuses if 200 <= s < 400),
+        "seconds": round(time.perf_counter() - t0, 4),
+    }
@@ -0,0 +1,182 @@
+import asyncio
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .access_log import is_prewarm
+from .observability.metrics import observe_admission
+
+# custo (tokens) por prefixo de rota; vale o prefixo mais longo que casar, 1.0 se nenhum
+DEFAULT_COSTS: Dict[str, float] = {
+    "/healthz": 0.0,
+    "/readyz": 0.0,
+    "/metrics": 0.0,
+    "/meta/": 0.25,
+    "/stats/overview": 0.25,
+    "/rankings/": 1.0,
+    "/games/": 1.0,
+    "/games/suggest": 2.0,
+    "/ws/suggest": 2.0,
+    "/stats/aggregate": 2.0,
+    "/charts/": 2.0,
+    "/franchises": 1.0,
+    "/stats/pivot": 4.0,
+    "/ask": 3.0,
+}
+
+
+class _Bucket:
+    __slots__ = ("tokens", "ts")
+
+    def __init__(self, tokens: float, ts: float):
+        self.tokens = tokens
+        self.ts = ts
+
+
+def route_cost(path: str, costs: Dict[str, float]) -> Tuple[str, float]:
+    """(prefixo, custo) da rota pelo prefixo mais longo de `costs`."""
+    best = ""
+    for prefix in costs:
+        if path.startswith(prefix) and len(prefix) > len(best):
+            best = prefix
+    return (best, costs[best]) if best else ("other", 1.0)
+
+
+class TokenBuckets:
+    """
+    Um token bucket por cliente (`rate` tokens/s, até `burst`), com no máximo `max_clients`
+    buckets em memória (LRU; um bucket esquecido volta cheio, o mesmo que ele teria depois de
+    ficar parado). `reserve` desconta o custo na hora, mesmo que o saldo fique negativo: o
+    tempo de espera devolvido cresce com a fila do próprio cliente, então as requisições de um
+    cliente saem na ordem de chegada e um cliente apressado não atrasa os outros.
+    """
+
+    def __init__(self, rate: float, burst: float, max_clients: int = 10000, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, _Bucket]" = OrderedDict()
+
+    def reserve(self, client: str, cost: float, max_wait: float) -> Optional[float]:
+        """Segundos a esperar antes de atender (0 = já), ou None se passaria de `max_wait` (nada é descontado)."""
+        now = self.clock()
+        with self._lock:
+            b = self._buckets.get(client)
+            if b is None:
+                b = self._buckets[client] = _Bucket(self.burst, now)
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+                b.tokens = min(self.burst, b.tokens + (now - b.ts) * self.rate)
+                b.ts = now
+            wait = max(0.0, (cost - b.tokens) / self.rate)
+            if wait > max_wait:
+                return None
+            b.tokens -= cost
+            return wait
+
+    def retry_after(self, client: str, cost: float) -> float:
+        with self._lock:
+            b = self._buckets.get(client)
+            tokens = self.burst if b is None else min(self.burst, b.tokens + (self.clock() - b.ts) * self.rate)
+        return max(0.0, (cost - tokens) / self.rate)
+
+
+class AdmissionMiddleware:
+    """
+    Controle de admissão por cliente (IP, ou o header `client_header` se configurado) na frente
+    das rotas: cada requisição custa tokens conforme a rota; sem saldo, espera até `max_wait`
+    segundos na fila do próprio cliente e, além disso, recebe 429 com Retry-After.
+    Em WebSockets o custo da rota vale para a conexão e para cada mensagem recebida; sem saldo,
+    a conexão é fechada (código 1008). Só as chamadas do pré-aquecimento (marcadas no scope por
+    `access_log`) não passam pelo limite.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rate: float = 20.0,
+        burst: float = 40.0,
+        max_wait: float = 1.0,
+        costs: Optional[Dict[str, float]] = None,
+        client_header: Optional[str] = None,
+        max_clients: int = 10000,
+    ):
+        self.app = app
+        self.costs = DEFAULT_COSTS if costs is None else costs
+        self.max_wait = max_wait
+        self.client_header = client_header.lower() if client_header else None
+        self.buckets = TokenBuckets(rate, burst, max_clients=max_clients)
+
+    def _client(self, scope: Scope, headers: Headers) -> str:
+        if self.client_header and headers.get(self.client_header):
+            return headers[self.client_header]
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        prefix, cost = route_cost(scope["path"], self.costs)
+        if cost <= 0 or is_prewarm(scope):
+            await self.app(scope, receive, send)
+            return
+
+        client = self._client(scope, headers)
+        wait = self.buckets.reserve(client, cost, self.max_wait)
+        if wait is None and scope["type"] == "websocket":
+            observe_admission(prefix, rejected=True)
+            await receive()  # websocket.connect
+            await send({"type": "websocket.close", "code": 1008})
+            return
+        if wait is None:
+            observe_admission(prefix, rejected=True)
+            retry = max(1, math.ceil(self.buckets.retry_after(client, cost)))
+            body = json.dumps({"detail": "Muitas requisições; tente novamente mais tarde"}).encode("utf-8")
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(retry).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+        observe_admission(prefix, waited=wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        if scope["type"] == "websocket":
+            receive = self._metered(receive, send, client, prefix, cost)
+        await self.app(scope, receive, send)
+
+    def _metered(self, receive: Receive, send: Send, client: str, prefix: str, cost: float) -> Receive:
+        """`receive` de um WebSocket que desconta `cost` de cada mensagem do cliente."""
+
+        async def _receive():
+            message = await receive()
+            if message["type"] != "websocket.receive":
+                return message
+            wait = self.buckets.reserve(client, cost, self.max_wait)
+            if wait is None:
+                observe_admission(prefix, rejected=True)
+                await send({"type": "websocket.close", "code": 1008, "reason": "Muitas requisições"})
+                return {"type": "websocket.disconnect", "code": 1008}
+            observe_admission(prefix, waited=wait)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            return message
+
+        return _receive
@@ -0,0 +1,123 @@
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except Exception:
+    brotli = None
+
+
+def _accepted(accept_encoding: str) -> set[str]:
+    out = set()
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if token and q > 0:
+            out.add(token.strip().lower())
+    return out
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Negocia o encoding: brotli (se a lib estiver instalada) > gzip > nenhum."""
+    accepted = _accepted(accept_encoding or "")
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+class _Encoder:
+    def __init__(self, encoding: str, level: int):
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=min(level, 11))
+            self._flush = self._c.flush
+            self._finish = self._c.finish
+            self._write = self._c.process
+        else:
+            self._c = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._flush = lambda: self._c.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._c.flush
+            self._write = self._c.compress
+
+    def chunk(self, data: bytes, last: bool) -> bytes:
+        out = self._write(data)
+        return out + (self._finish() if last else self._flush())
+
+
+class CompressionMiddleware:
+    """
+    Compressão negociada por Accept-Encoding (br/gzip) para respostas a partir de `minimum_size`
+    bytes. Respostas que já têm Content-Encoding (ex.: /metrics) passam intactas.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message = {}
+        encoder: Optional[_Encoder] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                passthrough = "content-encoding" in Headers(raw=message["headers"])
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+
+            if passthrough:
+                if start:
+                    await send(start)
+                    start = {}
+                await send(message)
+                return
+
+            if encoder is None:
+                if len(body) < self.minimum_size and not more:
+                    passthrough = True
+                    await send(start)
+                    start = {}
+                    await send(message)
+                    return
+                encoder = _Encoder(encoding, self.levels[encoding])
+                headers = MutableHeaders(raw=start["headers"])
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                data = encoder.chunk(body, last=not more)
+                if more:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(data))
+                await send(start)
+                start = {}
+                await send({"type": "http.response.body", "body": data, "more_body": more})
+                return
+
+            await send({"type": "http.response.body", "body": encoder.chunk(body, last=not more), "more_body": more})
+
+        await self.app(scope, receive, send_compressed)
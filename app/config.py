@@ -1,2 +1,15 @@
 import os
 DATA_PATH=os.getenv('DATA_PATH','data/base_jogos.csv')
+DATA_BACKEND=os.getenv('DATA_BACKEND','pandas').lower()
+ADMIN_TOKEN=os.getenv('ADMIN_TOKEN','')
+PROFILING_ENABLED=os.getenv('PROFILING_ENABLED','0').lower() in ('1','true','yes')
+COMPRESSION_MIN_BYTES=int(os.getenv('COMPRESSION_MIN_BYTES','1024'))
+RESULT_CACHE_SIZE=int(os.getenv('RESULT_CACHE_SIZE','512'))
+ACCESS_LOG_PATH=os.getenv('ACCESS_LOG_PATH','')
+PREWARM_TOP_N=int(os.getenv('PREWARM_TOP_N','50'))
+PIVOT_MAX_CELLS=int(os.getenv('PIVOT_MAX_CELLS','5000'))
+RATE_LIMIT_ENABLED=os.getenv('RATE_LIMIT_ENABLED','0').lower() in ('1','true','yes')
+RATE_LIMIT_RATE=float(os.getenv('RATE_LIMIT_RATE','20'))
+RATE_LIMIT_BURST=float(os.getenv('RATE_LIMIT_BURST','40'))
+RATE_LIMIT_MAX_WAIT=float(os.getenv('RATE_LIMIT_MAX_WAIT','1.0'))
+RATE_LIMIT_CLIENT_HEADER=os.getenv('RATE_LIMIT_CLIENT_HEADER','')
@@ -1,7 +1,42 @@
-from functools import lru_cache
+import secrets
+from functools import lru_cache, wraps
+from typing import Callable, Optional, TypeVar
 import pandas as pd
-from .config import DATA_PATH
+from fastapi import Header, HTTPException
+from .config import ADMIN_TOKEN, DATA_BACKEND, DATA_PATH
+from .observability.metrics import set_dataset_rows
+from .services.backends import QueryBackend, create_backend
 from .services.dataset import load_dataset
-@lru_cache(maxsize=1)
+from .services.meta import MetaSnapshot, build_meta_snapshot
+from .services.singleflight import flight
+T = TypeVar("T")
+def _load_once(fn: Callable[[], T]) -> Callable[[], T]:
+    """lru_cache + single-flight: o warmup em background e as primeiras requisições não carregam em dobro."""
+    cached = lru_cache(maxsize=1)(fn)
+    @wraps(fn)
+    def get() -> T:
+        return flight.do(("deps", fn.__name__), cached)
+    get.cache_clear = cached.cache_clear
+    return get
+@_load_once
 def get_df() -> pd.DataFrame:
-    return load_dataset(DATA_PATH)
+    df = load_dataset(DATA_PATH)
+    set_dataset_rows(len(df))
+    return df
+@_load_once
+def get_backend() -> QueryBackend:
+    """
+    Backend de rankings/agregados/busca/overview/metadados escolhido por DATA_BACKEND (pandas|duckdb).
+    Com duckdb, o DataFrame não é carregado aqui: só quando um endpoint que depende dele é chamado.
+    """
+    backend = create_backend(DATA_BACKEND, DATA_PATH, get_df)
+    set_dataset_rows(backend.rows)
+    return backend
+@_load_once
+def get_meta() -> MetaSnapshot:
+    backend = get_backend()
+    return build_meta_snapshot(backend.dimensions(), backend.overview())
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Rotas /admin/*: exigem ADMIN_TOKEN configurado e enviado no header X-Admin-Token."""
+    if not ADMIN_TOKEN or not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Forbidden")
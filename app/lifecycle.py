@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .observability.metrics import set_time_to_ready
+
+Step = Tuple[str, Callable[[], Any]]
+
+
+def process_age() -> Optional[float]:
+    """Segundos desde que o processo foi criado (Linux, via /proc); None em outros sistemas."""
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except Exception:
+        return None
+
+
+class Warmup:
+    """
+    Carga do dataset e das estruturas derivadas numa thread em background, para que o
+    processo atenda /healthz (liveness) de imediato e /readyz (readiness) só quando tudo estiver pronto.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.state = "idle"
+        self.error: Optional[str] = None
+        self.steps: Dict[str, float] = {}
+        self.details: Dict[str, Any] = {}
+        self.started_at: Optional[float] = None
+        self.ready_at: Optional[float] = None
+        self.time_to_ready: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def start(self, steps: List[Step]) -> bool:
+        """Dispara o warmup; não faz nada se já houver um em andamento."""
+        with self._lock:
+            if self.state == "loading":
+                return False
+            self.state, self.error, self.steps, self.details = "loading", None, {}, {}
+            self.started_at, self.ready_at = time.perf_counter(), None
+            self._thread = threading.Thread(target=self._run, args=(steps,), name="warmup", daemon=True)
+            self._thread.start()
+            return True
+
+    def _run(self, steps: List[Step]) -> None:
+        try:
+            for name, fn in steps:
+                t0 = time.perf_counter()
+                result = fn()
+                self.steps[name] = round(time.perf_counter() - t0, 4)
+                if isinstance(result, dict):
+                    self.details[name] = result
+        except Exception as e:
+            with self._lock:
+                self.state, self.error = "error", f"{name}: {e}"
+            return
+        with self._lock:
+            self.state, self.ready_at = "ready", time.perf_counter()
+            if self.time_to_ready is None:
+                self.time_to_ready = process_age()
+        if self.time_to_ready is not None:
+            set_time_to_ready(self.time_to_ready)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.ready
+
+    def status(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"state": self.state, "steps": dict(self.steps)}
+        if self.started_at is not None:
+            end = self.ready_at or time.perf_counter()
+            out["warmup_s"] = round(end - self.started_at, 4)
+        if self.time_to_ready is not None:
+            out["time_to_ready_s"] = round(self.time_to_ready, 3)
+        if self.details:
+            out["details"] = dict(self.details)
+        if self.error:
+            out["error"] = self.error
+        return out
+
+
+warmup = Warmup()
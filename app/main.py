@@ -1,74 +1,308 @@
-from typing import Optional, Dict, Any
+import asyncio
+import json
+from typing import Optional, Dict, Any, List, Union
 import pandas as pd
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, WebSocket
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
 
-from .deps import get_df
-from .schemas import Overview, RankingResponse, GameItem
+from .admission import AdmissionMiddleware
+from .compression import CompressionMiddleware
+from .access_log import RECORDED_PREFIXES, AccessRecorder, is_prewarm, replay
+from .config import (
+    ACCESS_LOG_PATH,
+    COMPRESSION_MIN_BYTES,
+    DATA_BACKEND,
+    PIVOT_MAX_CELLS,
+    PREWARM_TOP_N,
+    PROFILING_ENABLED,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_CLIENT_HEADER,
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_MAX_WAIT,
+    RATE_LIMIT_RATE,
+    RESULT_CACHE_SIZE,
+)
+from .deps import get_backend, get_df, get_meta, require_admin
+from .lifecycle import warmup
+from .schemas import Overview, RankingResponse, GameItem, TitleItem
 from .observability.metrics import setup_metrics
+from .services.backends import QueryBackend
 from .services.queries import (
-    overview as overview_fn,
-    rankings,
-    best_match,
     METRICS_MAP,
-    aggregate_metric,
+    explain_filters,
+    filter_stats,
+    normalize_filters,
+    ranked_frame,
+    rankings_multi,
+)
+from .services.frame_cache import derived
+from .services.arrow_io import (
+    ARROW_STREAM,
+    arrow_available,
+    items_frame_to_arrow,
+    records_to_arrow,
+    wants_arrow,
 )
-from .services.suggest import suggest_names
+from .services.distribution import QUANTILES, aggregate_distribution, distribution_cube, exact_distribution
+from .services.franchises import (
+    franchise_aggregate,
+    franchise_by_year,
+    franchise_frame,
+    franchise_table,
+    list_franchises,
+    resolve,
+)
+from .services.scoring import PRESETS, score_rankings, weights_to_expression
+from .services.pivot import PIVOT_AGGS, PIVOT_DIMS, PIVOT_METRICS, pivot
+from .services.titles import title_details, title_rankings, title_table
+from .services.charts import CHART_FIELDS, aggregate_by_year_chart, ranking_chart, top_by_year_chart
+from .services.suggest import SuggestSession, suggest_names
 from .services.nlq import parse_question
 
 
+RESPONSE_FORMATS = ("rows", "columnar")
+LEVELS = ("game", "title")
+
 app = FastAPI(title="IA Games API", version="1.2.0")
 
 setup_metrics(app)
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_BYTES)
+if RATE_LIMIT_ENABLED:
+    # adicionado depois = mais externo: requisições recusadas não passam por compressão nem métricas
+    app.add_middleware(
+        AdmissionMiddleware,
+        rate=RATE_LIMIT_RATE,
+        burst=RATE_LIMIT_BURST,
+        max_wait=RATE_LIMIT_MAX_WAIT,
+        client_header=RATE_LIMIT_CLIENT_HEADER or None,
+    )
+
+if PROFILING_ENABLED:
+    from .observability.profiling import setup_profiling
+    setup_profiling(app)
+
+recorder = AccessRecorder(ACCESS_LOG_PATH) if ACCESS_LOG_PATH else None
+
+if recorder is not None:
+    @app.middleware("http")
+    async def _record_access(request: Request, call_next):
+        response = await call_next(request)
+        if (
+            request.method == "GET"
+            and response.status_code == 200
+            and request.url.path.startswith(RECORDED_PREFIXES)
+            and not is_prewarm(request.scope)
+        ):
+            recorder.record("GET", request.url.path, dict(request.query_params))
+        return response
+
+
+def _cached(owner: Any, key: tuple, fn):
+    """Cache de resultados por dataset carregado (descartado no reload); chamadas simultâneas são coalescidas."""
+    return derived(owner, key, fn, max_entries=RESULT_CACHE_SIZE)
+
+
+def _rankings(
+    backend: QueryBackend, metric: str, filters: Dict[str, Any], limit: int, offset: int, columnar: bool = False
+):
+    key = ("rankings", metric, normalize_filters(filters), limit, offset, columnar)
+    return _cached(
+        backend, key, lambda: backend.rankings(metric, filters, limit=limit, offset=offset, columnar=columnar)
+    )
+
+
+def _aggregate(
+    metric: str,
+    filters: Dict[str, Any],
+    name_contains: Optional[str],
+    distribution: bool = False,
+    franchise: Optional[str] = None,
+):
+    if franchise:
+        df = get_df()
+        ids = _resolve_franchise(df, franchise)
+        if len(ids):
+            return _aggregate_franchise(df, metric, filters, franchise, ids, distribution)
+        # termo que não é de nenhuma franquia: busca por substring no nome
+        res = _aggregate(metric, filters, franchise, distribution)
+        return {**res, "franchise": franchise, "matched_by": "name"}
+
+    term = (name_contains or "").lower().strip() or None
+    key = ("aggregate", metric, normalize_filters(filters), term, distribution)
+    if distribution:
+        df = get_df()
+        fn = lambda: aggregate_distribution(df, metric=metric, filters=filters, name_contains=name_contains)
+        res = _cached(df, key, fn)
+    else:
+        backend = get_backend()
+        res = _cached(backend, key, lambda: backend.aggregate_metric(metric, filters, name_contains=name_contains))
+    # o resultado é compartilhado entre as chamadas coalescidas: ecoa os parâmetros desta
+    return {**res, "filters": {k: v for k, v in filters.items() if v is not None}, "name_contains": name_contains}
+
+
+def _resolve_franchise(df: pd.DataFrame, franchise: str):
+    return _cached(df, ("franchise_ids", " ".join((franchise or "").lower().split())), lambda: resolve(df, franchise))
+
+
+def _aggregate_franchise(
+    df: pd.DataFrame, metric: str, filters: Dict[str, Any], franchise: str, ids, distribution: bool
+):
+    key = ("aggregate_franchise", metric, normalize_filters(filters), tuple(ids.tolist()), distribution)
+    if distribution:
+        fn = lambda: exact_distribution(franchise_frame(df, metric, ids, filters)[METRICS_MAP[metric]], metric)
+    else:
+        fn = lambda: franchise_aggregate(df, metric, ids, filters)
+    res = _cached(df, key, fn)
+    return {
+        "metric": metric,
+        "filters": {k: v for k, v in filters.items() if v is not None},
+        "name_contains": None,
+        "franchise": franchise,
+        "franchises": franchise_table(df).franchises(ids),
+        "matched_by": "franchise",
+        **res,
+    }
+
+
+def _wants_arrow(request: Request) -> bool:
+    if not wants_arrow(request.headers.get("accept")):
+        return False
+    if not arrow_available():
+        raise HTTPException(status_code=406, detail="Formato Arrow indisponível (pyarrow não instalado)")
+    return True
+
+
+def _arrow_response(payload: bytes) -> Response:
+    return Response(content=payload, media_type=ARROW_STREAM)
+
+
+def _snapshot_response(request: Request, name: str) -> Response:
+    snap = get_meta()
+    etag = snap.etags[name]
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in (request.headers.get("if-none-match") or ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snap.payloads[name], media_type="application/json", headers=headers)
+
+
+def _prewarm() -> dict:
+    return replay(app, recorder.top(PREWARM_TOP_N))
+
+
+def _warmup_steps():
+    if DATA_BACKEND == "pandas":
+        steps = [
+            ("dataset", get_df),
+            ("backend", get_backend),
+            ("meta", get_meta),
+            ("filter_stats", lambda: filter_stats(get_df())),
+            ("distribution", lambda: distribution_cube(get_df())),
+            ("franchises", lambda: franchise_table(get_df())),
+            ("titles", lambda: title_table(get_df())),
+        ]
+    else:
+        # o DataFrame (e o que deriva dele) só é carregado se um endpoint só-pandas for chamado
+        steps = [("backend", get_backend), ("meta", get_meta)]
+    if recorder is not None and PREWARM_TOP_N > 0:
+        steps.append(("prewarm", _prewarm))
+    return steps
 
 
 @app.on_event("startup")
 def startup_event():
+    # não bloqueia o startup: o processo já aceita conexões (liveness) enquanto carrega
+    warmup.start(_warmup_steps())
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    if recorder is not None:
+        recorder.flush()
 
-    _ = get_df()
 
 @app.get("/healthz")
 def healthz():
-    try:
-        df = get_df()
-        return {"status": "ok", "dataset_loaded": True, "rows": len(df)}
-    except Exception as e:
-        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+    """Liveness: responde assim que o processo sobe, sem esperar o dataset."""
+    body = {"status": "ok", "dataset_loaded": warmup.ready}
+    if warmup.ready:
+        body["rows"] = get_backend().rows
+    return body
+
+
+@app.get("/readyz")
+def readyz():
+    """Readiness: 200 só depois de dataset, backend, snapshot de metadados, cubo, franquias e títulos carregados."""
+    if warmup.state == "idle":
+        warmup.start(_warmup_steps())
+    status = warmup.status()
+    if not warmup.ready:
+        return JSONResponse(status_code=503, content=status)
+    return status
+
+
+@app.post("/admin/reload", status_code=202, dependencies=[Depends(require_admin)], include_in_schema=False)
+def admin_reload():
+    """
+    Relê o dataset e refaz o warmup (incluindo o pré-aquecimento pelas consultas registradas).
+    Os caches de resultado e estruturas derivadas do dataset anterior são descartados com ele.
+    """
+    if warmup.state == "loading":
+        raise HTTPException(status_code=409, detail="Carregamento já em andamento")
+    for loader in (get_meta, get_backend, get_df):
+        loader.cache_clear()
+    warmup.start(_warmup_steps())
+    return warmup.status()
+
+
+@app.get("/admin/explain", dependencies=[Depends(require_admin)], include_in_schema=False)
+def admin_explain(
+    year: Optional[int] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    platform: Optional[str] = None,
+    genre: Optional[str] = None,
+    publisher: Optional[str] = None,
+    rating: Optional[str] = None,
+):
+    """Plano dos filtros: ordem dos predicados (mais seletivo primeiro) e linhas estimadas x reais."""
+    filters = {
+        "year": year,
+        "year_from": year_from,
+        "year_to": year_to,
+        "platform": platform,
+        "genre": genre,
+        "publisher": publisher,
+        "rating": rating,
+    }
+    return explain_filters(get_df(), filters)
+
 
 @app.get("/meta/platforms")
-def meta_platforms():
-    df = get_df()
-    plats = sorted(str(p) for p in df["Platform"].dropna().unique())
-    return {"items": plats, "count": len(plats)}
+def meta_platforms(request: Request):
+    return _snapshot_response(request, "platforms")
 
 @app.get("/meta/genres")
-def meta_genres():
-    df = get_df()
-    gens = sorted(str(g) for g in df["Genre"].dropna().unique())
-    return {"items": gens, "count": len(gens)}
+def meta_genres(request: Request):
+    return _snapshot_response(request, "genres")
 
 @app.get("/meta/years")
-def meta_years():
-    import pandas as pd
-    df = get_df()
-    years = (
-        pd.to_numeric(df["Year_of_Release"], errors="coerce")
-        .dropna()
-        .astype(int)
-        .unique()
-        .tolist()
-    )
-    years = sorted(set(years))
-    return {"items": years, "count": len(years)}
+def meta_years(request: Request):
+    return _snapshot_response(request, "years")
+
+@app.get("/meta/bootstrap")
+def meta_bootstrap(request: Request):
+    """Plataformas, gêneros, anos e overview numa única resposta (snapshot por versão do dataset)."""
+    return _snapshot_response(request, "bootstrap")
 
 @app.get("/stats/overview", response_model=Overview)
-def stats_overview():
-    df = get_df()
-    return overview_fn(df)
+def stats_overview(request: Request):
+    return _snapshot_response(request, "overview")
 
 
 @app.get("/stats/aggregate")
 def stats_aggregate(
+    request: Request,
     metric: str = Query("critic_score", enum=list(METRICS_MAP.keys())),
     name_contains: Optional[str] = None,
     year: Optional[int] = None,
@@ -78,13 +312,69 @@ def stats_aggregate(
     genre: Optional[str] = None,
     publisher: Optional[str] = None,
     rating: Optional[str] = None,
+    distribution: bool = Query(False, description="Inclui p25/mediana/p75/p90, min/max e histograma"),
+    franchise: Optional[str] = Query(None, description="Franquia (ex.: zelda, final fantasy); alternativa a name_contains"),
 ):
     """
     Agregações por "franquia"/termo no nome + filtros: média e soma da métrica.
+    Com `franchise`, usa a tabela de franquias (totais pré-calculados); se o termo não for de
+    nenhuma franquia, cai na busca por substring no nome (`matched_by` indica qual foi usada).
+    Com `distribution=true`, inclui percentis e histograma (aproximados via cubo de sketches,
+    ou exatos quando há `publisher`/`name_contains`/`franchise`).
     Exemplos:
       - /stats/aggregate?metric=critic_score&name_contains=zelda
+      - /stats/aggregate?metric=critic_score&franchise=zelda
       - /stats/aggregate?metric=user_score&name_contains=mario&platform=Wii
+      - /stats/aggregate?metric=critic_score&genre=Shooter&distribution=true
+    """
+    if franchise and name_contains:
+        raise HTTPException(status_code=422, detail="Informe name_contains ou franchise, não ambos")
+    filters = {
+        "year": year,
+        "year_from": year_from,
+        "year_to": year_to,
+        "platform": platform,
+        "genre": genre,
+        "publisher": publisher,
+        "rating": rating,
+    }
+    agg = _aggregate(metric, filters, name_contains, distribution, franchise=franchise)
+    if _wants_arrow(request):
+        cols = {"metric": [metric], "count": [agg["count"]], "mean": [agg["mean"]], "sum": [agg["sum"]]}
+        if distribution:
+            cols.update({q: [agg["distribution"].get(q)] for q in QUANTILES})
+        meta = {k: agg.get(k) for k in ("filters", "name_contains", "franchise", "matched_by") if k in agg}
+        return _arrow_response(records_to_arrow(cols, meta))
+    return agg
+
+@app.get("/stats/pivot")
+def stats_pivot(
+    rows: str = Query(..., enum=list(PIVOT_DIMS)),
+    cols: str = Query(..., enum=list(PIVOT_DIMS)),
+    metrics: List[str] = Query(["global_sales"], description="Métricas (repetido ou separado por vírgula)"),
+    agg: str = Query("sum", enum=list(PIVOT_AGGS)),
+    year: Optional[int] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    platform: Optional[str] = None,
+    genre: Optional[str] = None,
+    publisher: Optional[str] = None,
+    rating: Optional[str] = None,
+    max_rows: Optional[int] = Query(None, ge=1, description="Mantém as N categorias mais frequentes; o resto vira \"Outros\""),
+    max_cols: Optional[int] = Query(None, ge=1),
+):
     """
+    Tabela cruzada (ex.: vendas por região em plataforma x ano, ou gênero x rating) numa única
+    passada sobre os códigos das categorias, com os mesmos filtros de /stats/aggregate.
+    Ex.: /stats/pivot?rows=platform&cols=year&metrics=na_sales,eu_sales,jp_sales,other_sales
+    Matrizes com mais de PIVOT_MAX_CELLS células devolvem 422.
+    """
+    if rows == cols:
+        raise HTTPException(status_code=422, detail="rows e cols precisam ser dimensões diferentes")
+    wanted = list(dict.fromkeys(m.strip() for raw in metrics for m in raw.split(",") if m.strip()))
+    invalid = [m for m in wanted if m not in PIVOT_METRICS]
+    if invalid or not wanted:
+        raise HTTPException(status_code=422, detail=f"Métricas inválidas: {', '.join(invalid)}")
     df = get_df()
     filters = {
         "year": year,
@@ -95,10 +385,22 @@ def stats_aggregate(
         "publisher": publisher,
         "rating": rating,
     }
-    return aggregate_metric(df, metric=metric, filters=filters, name_contains=name_contains)
+    key = ("pivot", rows, cols, tuple(wanted), agg, normalize_filters(filters), max_rows, max_cols)
+    try:
+        res = _cached(
+            df, key, lambda: pivot(
+                df, rows, cols, wanted, filters, agg=agg,
+                max_rows=max_rows, max_cols=max_cols, max_cells=PIVOT_MAX_CELLS,
+            )
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"metrics": wanted, "filters": {k: v for k, v in filters.items() if v is not None}, **res}
+
 
 @app.get("/rankings/games", response_model=RankingResponse)
 def rankings_games(
+    request: Request,
     metric: str = Query("global_sales", enum=list(METRICS_MAP.keys())),
     year: Optional[int] = None,
     year_from: Optional[int] = None,
@@ -109,7 +411,112 @@ def rankings_games(
     rating: Optional[str] = None,
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    format: str = Query("rows", enum=list(RESPONSE_FORMATS)),
+    metrics: Optional[List[str]] = Query(
+        None, description="Várias métricas (repetido ou separado por vírgula): top-k de cada com um único filtro"
+    ),
+    level: str = Query("game", enum=list(LEVELS), description="title: um item por título, somado entre plataformas"),
+):
+    """
+    `format=columnar` devolve items como {campo: [valores]} (nomes das colunas uma única vez).
+    `level=title` ranqueia títulos (vendas somadas entre plataformas, notas pela média, items no
+    schema de TitleItem) a partir da tabela por título montada no startup.
+    Com `metrics=...`, devolve {"rankings": {metric: {"total", "items"}}} a partir de uma única
+    avaliação dos filtros (o parâmetro `metric` é ignorado).
+    Com `Accept: application/vnd.apache.arrow.stream`, a página sai como Arrow IPC stream
+    (schema de GameItem; metric/filters/total nos metadados do schema).
+    """
+    filters = {
+        "year": year,
+        "year_from": year_from,
+        "year_to": year_to,
+        "platform": platform,
+        "genre": genre,
+        "publisher": publisher,
+        "rating": rating,
+    }
+    columnar = format == "columnar"
+    if level == "title":
+        if metrics or wants_arrow(request.headers.get("accept")):
+            raise HTTPException(status_code=422, detail="level=title não aceita metrics nem Arrow")
+        key = ("rankings_title", metric, normalize_filters(filters), limit, offset, columnar)
+        df = get_df()
+        total, items = _cached(
+            df, key, lambda: title_rankings(df, metric, filters, limit=limit, offset=offset, columnar=columnar)
+        )
+        body = {
+            "metric": metric,
+            "level": "title",
+            "filters": {k: v for k, v in filters.items() if v is not None},
+            "total": total,
+            "items": items,
+        }
+        return JSONResponse({**body, "format": "columnar"} if columnar else body)
+
+    if metrics:
+        wanted = [m.strip() for raw in metrics for m in raw.split(",") if m.strip()]
+        invalid = [m for m in wanted if m not in METRICS_MAP]
+        if invalid:
+            raise HTTPException(status_code=422, detail=f"Métricas inválidas: {', '.join(invalid)}")
+        wanted = list(dict.fromkeys(wanted))
+        key = ("rankings_multi", tuple(wanted), normalize_filters(filters), limit, offset, columnar)
+        df = get_df()
+        res = _cached(
+            df, key, lambda: rankings_multi(df, wanted, filters, limit=limit, offset=offset, columnar=columnar)
+        )
+        body = {
+            "metrics": wanted,
+            "filters": {k: v for k, v in filters.items() if v is not None},
+            "rankings": {m: {"total": t, "items": it} for m, (t, it) in res.items()},
+        }
+        if columnar:
+            body["format"] = "columnar"
+        return JSONResponse(body)
+
+    if _wants_arrow(request):
+        key = ("rankings_arrow", metric, normalize_filters(filters), limit, offset)
+        df = get_df()
+
+        def _encode():
+            dff = ranked_frame(df, metric, filters)
+            meta = {"metric": metric, "filters": {k: v for k, v in filters.items() if v is not None}, "total": len(dff)}
+            return items_frame_to_arrow(dff.iloc[offset: offset + limit], meta)
+
+        return _arrow_response(_cached(df, key, _encode))
+
+    total, items = _rankings(get_backend(), metric, filters, limit, offset, columnar)
+    body = {
+        "metric": metric,
+        "filters": {k: v for k, v in filters.items() if v is not None},
+        "total": total,
+        "items": items,
+    }
+    if columnar:
+        return JSONResponse({**body, "format": "columnar"})
+    return body
+
+
+@app.get("/rankings/score")
+def rankings_score(
+    expr: Optional[str] = Query(None, description="Ex.: global_sales * critic_score / 100"),
+    weights: Optional[str] = Query(None, description="Ex.: global_sales:1,critic_score:0.05"),
+    preset: Optional[str] = Query(None, enum=list(PRESETS)),
+    year: Optional[int] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    platform: Optional[str] = None,
+    genre: Optional[str] = None,
+    publisher: Optional[str] = None,
+    rating: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
 ):
+    """
+    Ranking por score composto: uma expressão (`expr`), uma soma ponderada (`weights`) ou um
+    `preset`. O score é calculado vetorizado sobre o dataset e reaproveitado entre requisições.
+    """
+    if sum(x is not None for x in (expr, weights, preset)) != 1:
+        raise HTTPException(status_code=422, detail="Informe exatamente um de: expr, weights, preset")
     df = get_df()
     filters = {
         "year": year,
@@ -120,76 +527,263 @@ def rankings_games(
         "publisher": publisher,
         "rating": rating,
     }
-    total, items = rankings(df, metric=metric, filters=filters, limit=limit, offset=offset)
+    try:
+        source = PRESETS[preset] if preset else (expr if expr is not None else weights_to_expression(weights))
+        key = ("rankings_score", source, normalize_filters(filters), limit, offset)
+        canonical, total, items = _cached(
+            df, key, lambda: score_rankings(df, source, filters, limit=limit, offset=offset)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     return {
-        "metric": metric,
+        "expr": canonical,
         "filters": {k: v for k, v in filters.items() if v is not None},
         "total": total,
         "items": items,
     }
 
 
-@app.get("/games/suggest")
-def games_suggest(q: str, limit: int = 10):
+@app.get("/charts/rankings")
+def chart_rankings(
+    metric: str = Query("global_sales", enum=list(METRICS_MAP.keys())),
+    year: Optional[int] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    platform: Optional[str] = None,
+    genre: Optional[str] = None,
+    publisher: Optional[str] = None,
+    rating: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    extra: Optional[str] = Query(None, description=f"Colunas extras separadas por vírgula: {', '.join(CHART_FIELDS)}"),
+):
+    """
+    Top-N em formato colunar para gráficos de barras: {"labels": [...nomes], "values": [...métrica]}.
+    Ex.: /charts/rankings?metric=global_sales&limit=10&extra=platform,year
+    """
     df = get_df()
-    return {"q": q, "items": suggest_names(df, q, limit=limit)}
+    filters = {
+        "year": year,
+        "year_from": year_from,
+        "year_to": year_to,
+        "platform": platform,
+        "genre": genre,
+        "publisher": publisher,
+        "rating": rating,
+    }
+    fields = tuple(f.strip() for f in (extra or "").split(",") if f.strip())
+    return {
+        "metric": metric,
+        "filters": {k: v for k, v in filters.items() if v is not None},
+        **_cached(
+            df, ("chart_rankings", metric, normalize_filters(filters), limit, fields),
+            lambda: ranking_chart(df, metric, filters, limit=limit, extra=fields),
+        ),
+    }
 
 
-@app.get("/games/{name}", response_model=GameItem)
-def game_details(name: str):
+@app.get("/charts/top-by-year")
+def chart_top_by_year(
+    metric: str = Query("global_sales", enum=list(METRICS_MAP.keys())),
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    platform: Optional[str] = None,
+    genre: Optional[str] = None,
+    publisher: Optional[str] = None,
+    rating: Optional[str] = None,
+    max_points: Optional[int] = Query(None, ge=3, le=1000),
+):
+    """Top 1 da métrica por ano: {"x": [anos], "y": [valores], "labels": [nomes]}."""
     df = get_df()
-    row = best_match(df, name)
-    if row is None:
-        suggestions = suggest_names(df, name, limit=1)
-        if not suggestions:
-            raise HTTPException(status_code=404, detail="Game not found")
-        row = best_match(df, suggestions[0])
-        if row is None:
-            raise HTTPException(status_code=404, detail="Game not found")
+    filters = {"platform": platform, "genre": genre, "publisher": publisher, "rating": rating}
+    return {
+        "metric": metric,
+        "filters": {k: v for k, v in filters.items() if v is not None},
+        **_cached(
+            df, ("chart_top_by_year", metric, normalize_filters(filters), year_from, year_to, max_points),
+            lambda: top_by_year_chart(df, metric, filters, year_from=year_from, year_to=year_to, max_points=max_points),
+        ),
+    }
+
 
-    def _s(v): return None if pd.isna(v) else str(v)
-    def _f(v): return float(v) if pd.notna(v) else None
-    def _i(v): return int(v) if pd.notna(v) else None
-
-    item = {
-        "name": str(row["Name"]),
-        "platform": _s(row.get("Platform")),
-        "genre": _s(row.get("Genre")),
-        "year": _i(row.get("Year_of_Release")),
-        "publisher": _s(row.get("Publisher")),
-        "developer": _s(row.get("Developer")),
-        "rating": _s(row.get("Rating")),
-        "global_sales": _f(row.get("Global_Sales")),
-        "na_sales": _f(row.get("NA_Sales")),
-        "eu_sales": _f(row.get("EU_Sales")),
-        "jp_sales": _f(row.get("JP_Sales")),
-        "other_sales": _f(row.get("Other_Sales")),
-        "critic_score": _f(row.get("Critic_Score")),
-        "user_score": _f(row.get("User_Score")),
+@app.get("/charts/aggregate-by-year")
+def chart_aggregate_by_year(
+    request: Request,
+    metric: str = Query("critic_score", enum=list(METRICS_MAP.keys())),
+    name_contains: Optional[str] = None,
+    agg: str = Query("sum", enum=["sum", "mean", "count"]),
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    platform: Optional[str] = None,
+    genre: Optional[str] = None,
+    publisher: Optional[str] = None,
+    rating: Optional[str] = None,
+    max_points: Optional[int] = Query(None, ge=3, le=1000),
+    franchise: Optional[str] = None,
+):
+    """
+    Série anual de /stats/aggregate (sum/mean/count) numa chamada: {"x": [anos], "y": [valores]}.
+    `franchise` tem a mesma semântica de /stats/aggregate (série pré-calculada por franquia).
+    Aceita `Accept: application/vnd.apache.arrow.stream` (colunas year, value).
+    """
+    if franchise and name_contains:
+        raise HTTPException(status_code=422, detail="Informe name_contains ou franchise, não ambos")
+    df = get_df()
+    filters = {"platform": platform, "genre": genre, "publisher": publisher, "rating": rating}
+    ids = _resolve_franchise(df, franchise) if franchise else []
+    if len(ids):
+        key = ("chart_franchise_by_year", metric, normalize_filters(filters), tuple(ids.tolist()),
+               year_from, year_to, agg, max_points)
+        fn = lambda: franchise_by_year(
+            df, metric, ids, filters, year_from=year_from, year_to=year_to, agg=agg, max_points=max_points
+        )
+        extra = {"franchise": franchise, "matched_by": "franchise"}
+    else:
+        if franchise:
+            name_contains = franchise
+        term = name_contains
+        key = ("chart_aggregate_by_year", metric, normalize_filters(filters), (term or "").lower().strip(),
+               year_from, year_to, agg, max_points)
+        fn = lambda: aggregate_by_year_chart(
+            df, metric, filters, name_contains=term,
+            year_from=year_from, year_to=year_to, agg=agg, max_points=max_points,
+        )
+        extra = {"franchise": franchise, "matched_by": "name"} if franchise else {}
+    body = {
+        "metric": metric,
+        "agg": agg,
+        "name_contains": None if extra.get("matched_by") == "franchise" else name_contains,
+        "filters": {k: v for k, v in filters.items() if v is not None},
+        **extra,
+        **_cached(df, key, fn),
     }
+    if _wants_arrow(request):
+        meta = {k: body[k] for k in ("metric", "agg", "name_contains", "filters", "franchise") if k in body}
+        return _arrow_response(records_to_arrow({"year": body["x"], "value": body["y"]}, meta))
+    return body
+
+
+@app.get("/franchises")
+def franchises(q: Optional[str] = None, limit: int = Query(20, ge=1, le=100)):
+    """Franquias derivadas dos títulos (todas ou as que casam com `q`), por vendas globais."""
+    df = get_df()
+    total, items = list_franchises(df, q, limit=limit)
+    return {"q": q, "total": total, "items": items}
+
+
+@app.get("/games/suggest")
+def games_suggest(q: str, limit: int = Query(10, ge=1, le=50)):
+    df = get_df()
+    items = _cached(df, ("suggest", (q or "").strip().lower(), limit), lambda: suggest_names(df, q, limit=limit))
+    return {"q": q, "items": items}
+
+
+@app.websocket("/ws/suggest")
+async def ws_suggest(websocket: WebSocket):
+    """
+    Autocomplete por WebSocket: o cliente manda cada termo digitado ({"q": ..., "limit": 10, "id": ...}
+    ou só o texto) e recebe {"id", "q", "items"}. Só a consulta mais recente é processada: termos que
+    chegam enquanto outra busca roda substituem os pendentes, e a resposta de uma busca já superada
+    é descartada. A conexão guarda os candidatos do último prefixo para estreitar a próxima busca.
+    """
+    await websocket.accept()
+    session = SuggestSession(await run_in_threadpool(get_df))
+    latest: Dict[str, Any] = {}
+    arrived = asyncio.Event()
+
+    async def _receive():
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                msg = json.loads(raw)
+            except ValueError:
+                msg = raw
+            latest["msg"] = msg if isinstance(msg, dict) else {"q": str(msg)}
+            arrived.set()
+
+    reader = asyncio.create_task(_receive())
+    try:
+        while True:
+            waiter = asyncio.create_task(arrived.wait())
+            await asyncio.wait({reader, waiter}, return_when=asyncio.FIRST_COMPLETED)
+            if reader.done():
+                waiter.cancel()
+                break
+            arrived.clear()
+            msg = latest["msg"]
+            q = str(msg.get("q") or "")
+            try:
+                limit = max(1, min(50, int(msg.get("limit") or 10)))
+            except (TypeError, ValueError):
+                limit = 10
+            items = await run_in_threadpool(session.suggest, q, limit)
+            if latest["msg"] is not msg:
+                continue
+            await websocket.send_json({"id": msg.get("id"), "q": q, "items": items})
+    finally:
+        reader.cancel()
+        # desconexão do cliente encerra o leitor com WebSocketDisconnect: não é erro
+        if reader.done() and not reader.cancelled():
+            reader.exception()
+
+
+@app.get("/games/{name}", response_model=Union[TitleItem, GameItem])
+def game_details(name: str, level: str = Query("game", enum=list(LEVELS))):
+    """Detalhes de um jogo (linha do dataset) ou, com `level=title`, do título somado entre plataformas."""
+    if level == "title":
+        df = get_df()
+
+        def _find_title():
+            item = title_details(df, name)
+            if item is None:
+                suggestions = suggest_names(df, name, limit=1)
+                if suggestions:
+                    item = title_details(df, suggestions[0])
+            return item
+
+        item = _cached(df, ("game_title", (name or "").strip().lower()), _find_title)
+        if item is None:
+            raise HTTPException(status_code=404, detail="Game not found")
+        return item
+
+    backend = get_backend()
+
+    def _find():
+        item = backend.best_match(name)
+        if item is None:
+            suggestions = suggest_names(get_df(), name, limit=1)
+            if suggestions:
+                item = backend.best_match(suggestions[0])
+        return item
+
+    item = _cached(backend, ("game", (name or "").strip().lower()), _find)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Game not found")
     return item
 
 
 @app.post("/ask")
-def ask(payload: Dict[str, Any]):
+def ask(request: Request, payload: Dict[str, Any], format: str = Query("rows", enum=list(RESPONSE_FORMATS))):
     """
     NLQ simples:
       - "Quais são os jogos mais vendidos em 2010?"
          -> mode=rankings, metric=global_sales, filters={year:2010}
       - "Qual a média de nota da franquia Zelda?"
-         -> mode=aggregate, metric=critic_score (ou user_score), name_contains="zelda"
+         -> mode=aggregate, metric=critic_score (ou user_score), termo "zelda"
+            (resolvido no índice de franquias; sem casamento, busca por substring no nome)
+    `?format=columnar` vale para o modo rankings (items como {campo: [valores]}).
     """
     question = (payload.get("question") or "").strip()
+    if recorder is not None and question and not is_prewarm(request.scope):
+        recorder.record("POST", "/ask", {"format": format}, {"question": question})
     parsed = parse_question(question)
-    df = get_df()
 
     if parsed.get("mode") == "aggregate":
-        agg = aggregate_metric(
-            df,
-            metric=parsed["metric"],
-            filters=parsed.get("filters") or {},
-            name_contains=parsed.get("name_contains"),
-        )
+        term = parsed.get("name_contains")
+        # a tabela de franquias vem do DataFrame: com duckdb, a pergunta vai por substring no SQL
+        if DATA_BACKEND == "pandas":
+            agg = _aggregate(parsed["metric"], parsed.get("filters") or {}, None, franchise=term)
+        else:
+            agg = _aggregate(parsed["metric"], parsed.get("filters") or {}, term)
         return {
             "question": question,
             "mode": "aggregate",
@@ -198,17 +792,21 @@ def ask(payload: Dict[str, Any]):
             "items": [],
         }
 
-    total, items = rankings(
-        df,
-        metric=parsed["metric"],
-        filters=parsed.get("filters") or {},
-        limit=int(parsed.get("limit") or 10),
-        offset=0,
+    total, items = _rankings(
+        get_backend(),
+        parsed["metric"],
+        parsed.get("filters") or {},
+        int(parsed.get("limit") or 10),
+        0,
+        format == "columnar",
     )
-    return {
+    body = {
         "question": question,
         "mode": "rankings",
         "parsed": parsed,
         "total": total,
         "items": items,
     }
+    if format == "columnar":
+        body["format"] = "columnar"
+    return body
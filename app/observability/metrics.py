@@ -1,3 +1,7 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Iterator
+
 from fastapi import FastAPI
 try:
     from prometheus_fastapi_instrumentator import Instrumentator
@@ -7,3 +11,68 @@ try:
 except Exception:
     def setup_metrics(app: FastAPI) -> None:
         return
+
+try:
+    from prometheus_client import Counter, Gauge, Histogram
+
+    STAGE_LATENCY = Histogram(
+        "ia_games_stage_seconds",
+        "Latência por estágio dos serviços de consulta.",
+        ["stage"],
+        buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+    )
+    ROWS_SCANNED = Counter("ia_games_rows_scanned_total", "Linhas lidas pelas consultas.", ["op"])
+    ROWS_RETURNED = Counter("ia_games_rows_returned_total", "Linhas devolvidas pelas consultas.", ["op"])
+    DATASET_ROWS = Gauge("ia_games_dataset_rows", "Linhas do dataset carregado.")
+    TIME_TO_READY = Gauge("ia_games_time_to_ready_seconds", "Tempo do início do processo até o /readyz responder 200.")
+    ADMISSION_REJECTED = Counter(
+        "ia_games_admission_rejected_total", "Requisições recusadas (429) pelo controle de admissão.", ["route"]
+    )
+    ADMISSION_WAIT = Histogram(
+        "ia_games_admission_wait_seconds",
+        "Espera na fila do cliente antes de atender (controle de admissão).",
+        ["route"],
+        buckets=(0.0, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+    )
+except Exception:
+    STAGE_LATENCY = ROWS_SCANNED = ROWS_RETURNED = DATASET_ROWS = TIME_TO_READY = None
+    ADMISSION_REJECTED = ADMISSION_WAIT = None
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Mede a duração de um estágio (ex.: "filters", "rankings.sort") no histograma de estágios."""
+    if STAGE_LATENCY is None:
+        yield
+        return
+    t0 = perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(stage=name).observe(perf_counter() - t0)
+
+
+def observe_rows(op: str, scanned: int, returned: int) -> None:
+    if ROWS_SCANNED is None:
+        return
+    ROWS_SCANNED.labels(op=op).inc(scanned)
+    ROWS_RETURNED.labels(op=op).inc(returned)
+
+
+def set_dataset_rows(n: int) -> None:
+    if DATASET_ROWS is not None:
+        DATASET_ROWS.set(n)
+
+
+def set_time_to_ready(seconds: float) -> None:
+    if TIME_TO_READY is not None:
+        TIME_TO_READY.set(seconds)
+
+
+def observe_admission(route: str, rejected: bool = False, waited: float = 0.0) -> None:
+    if ADMISSION_REJECTED is None:
+        return
+    if rejected:
+        ADMISSION_REJECTED.labels(route=route).inc()
+    else:
+        ADMISSION_WAIT.labels(route=route).observe(waited)
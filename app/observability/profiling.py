@@ -0,0 +1,294 @@
+import asyncio
+import functools
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Callable, Collection, Dict, Optional, Tuple
+
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRoute
+
+from ..deps import require_admin
+
+MAX_SECONDS = 120.0
+_OWN_MODULE = __name__
+
+Stack = Tuple[str, ...]
+
+
+def _frame_label(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+def _is_app_stack(stack: Stack) -> bool:
+    return any(f.startswith("app.") and not f.startswith(_OWN_MODULE) for f in stack)
+
+
+class StackSampler:
+    """
+    Profiler por amostragem: em intervalos fixos lê `sys._current_frames()` de todas as
+    threads (menos a própria) e conta as pilhas que passam por código do pacote `app`.
+    `threads`, quando informado, devolve os ids das únicas threads a amostrar (ex.: as que
+    estão tratando requisições de interesse); vazio = nada a amostrar naquele instante.
+    """
+
+    def __init__(self, interval: float = 0.005, threads: Optional[Callable[[], Collection[int]]] = None):
+        self.interval = max(0.001, float(interval))
+        self.threads = threads
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample_once(self, only: Optional[Collection[int]] = None) -> None:
+        me = threading.get_ident()
+        for tid, frame in sys._current_frames().items():
+            if tid == me or (only is not None and tid not in only):
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            st = tuple(reversed(stack))
+            if _is_app_stack(st):
+                self.stacks[st] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if self.threads is None:
+                self._sample_once()
+                continue
+            only = set(self.threads())
+            if only:
+                self._sample_once(only)
+
+    def start(self) -> "StackSampler":
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "StackSampler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+
+    def collapsed(self) -> str:
+        """Formato "collapsed" (flamegraph.pl / speedscope): `a;b;c <contagem>` por linha."""
+        return "\n".join(f"{';'.join(st)} {n}" for st, n in self.stacks.most_common())
+
+    def hotspots(self, prefix: str = "app.services", top: int = 20) -> list[dict]:
+        """Funções sob `prefix` ordenadas por amostras inclusivas, com amostras próprias (self)."""
+        inclusive: Counter = Counter()
+        own: Counter = Counter()
+        for st, n in self.stacks.items():
+            for f in set(st):
+                if f.startswith(prefix):
+                    inclusive[f] += n
+            if st[-1].startswith(prefix):
+                own[st[-1]] += n
+        total = sum(self.stacks.values()) or 1
+        return [
+            {"function": f, "inclusive": n, "self": own.get(f, 0), "inclusive_pct": round(100.0 * n / total, 2)}
+            for f, n in inclusive.most_common(top)
+        ]
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "samples": self.samples,
+            "app_stacks": sum(self.stacks.values()),
+            "hotspots": self.hotspots(),
+            "collapsed": self.collapsed(),
+        }
+
+
+def _route_regex(route: str) -> re.Pattern:
+    parts = re.split(r"(\{[^/]+\})", route.rstrip("/") or "/")
+    body = "".join("[^/]+" if p.startswith("{") else re.escape(p) for p in parts)
+    return re.compile(f"^{body}/?$")
+
+
+class RequestProfile:
+    """
+    Sessão que amostra as próximas `n` requisições cujo path casa com `route`. Só entram na
+    amostra as threads que estão executando o handler dessas requisições (`attach`/`detach`).
+    """
+
+    def __init__(self, route: str, n: int, interval: float):
+        self.route = route
+        self.pattern = _route_regex(route)
+        self.remaining = n
+        self.requested = n
+        self.inflight = 0
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._threads: Counter = Counter()
+        self.sampler = StackSampler(interval, threads=self.handler_threads).start()
+
+    def handler_threads(self) -> Collection[int]:
+        with self._lock:
+            return list(self._threads)
+
+    def attach(self) -> int:
+        tid = threading.get_ident()
+        with self._lock:
+            self._threads[tid] += 1
+        return tid
+
+    def detach(self, tid: int) -> None:
+        with self._lock:
+            self._threads[tid] -= 1
+            if self._threads[tid] <= 0:
+                del self._threads[tid]
+
+    def enter(self, path: str) -> bool:
+        with self._lock:
+            if self.finished_at is not None or self.remaining <= 0 or not self.pattern.match(path):
+                return False
+            self.remaining -= 1
+            self.inflight += 1
+            return True
+
+    def exit(self) -> None:
+        with self._lock:
+            self.inflight -= 1
+            done = self.remaining <= 0 and self.inflight == 0
+        if done:
+            self.finish()
+
+    def finish(self) -> None:
+        with self._lock:
+            if self.finished_at is not None:
+                return
+            self.finished_at = time.time()
+        self.sampler.stop()
+
+    def status(self) -> Dict[str, Any]:
+        if self.finished_at is None and time.time() - self.started_at > MAX_SECONDS:
+            self.finish()
+        out = {
+            "route": self.route,
+            "requested": self.requested,
+            "profiled": self.requested - self.remaining,
+            "done": self.finished_at is not None,
+        }
+        if out["done"]:
+            out.update(self.sampler.report())
+        return out
+
+
+_session: Optional[RequestProfile] = None
+_request_session: ContextVar[Optional[RequestProfile]] = ContextVar("profile_session", default=None)
+
+
+def _on_handler_thread(call: Callable) -> Callable:
+    """Registra na sessão da requisição a thread que de fato executa o endpoint."""
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def run_async(*args, **kwargs):
+            session = _request_session.get()
+            if session is None:
+                return await call(*args, **kwargs)
+            tid = session.attach()
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                session.detach(tid)
+        return run_async
+
+    @functools.wraps(call)
+    def run(*args, **kwargs):
+        session = _request_session.get()
+        if session is None:
+            return call(*args, **kwargs)
+        tid = session.attach()
+        try:
+            return call(*args, **kwargs)
+        finally:
+            session.detach(tid)
+    return run
+
+
+class ProfiledRoute(APIRoute):
+    """
+    Rota cujo endpoint se registra na sessão de profiling ao começar. Endpoints síncronos
+    rodam no pool de threads, então o id precisa ser lido lá dentro, não no middleware.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dependant.call = _on_handler_thread(self.dependant.call)
+
+router = APIRouter(prefix="/admin/profile", dependencies=[Depends(require_admin)], include_in_schema=False)
+
+
+def _render(report: Dict[str, Any], fmt: str):
+    if fmt == "collapsed":
+        return PlainTextResponse(report.get("collapsed", ""))
+    return report
+
+
+@router.get("")
+async def profile_process(
+    seconds: float = Query(5.0, gt=0, le=MAX_SECONDS),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+    format: str = Query("json", enum=["json", "collapsed"]),
+):
+    """
+    Amostra o processo por `seconds` segundos e devolve as pilhas agregadas. A espera é
+    assíncrona: a captura não ocupa uma thread do pool que atende as outras requisições.
+    """
+    sampler = StackSampler(interval_ms / 1000.0).start()
+    await asyncio.sleep(seconds)
+    return _render(sampler.stop().report(), format)
+
+
+@router.post("/requests", status_code=202)
+def profile_requests(
+    route: str = Query(..., description="Ex.: /rankings/games ou /games/{name}"),
+    n: int = Query(10, ge=1, le=1000),
+    interval_ms: float = Query(2.0, ge=1, le=1000),
+):
+    """Arma uma sessão que amostra as próximas `n` requisições para `route`."""
+    global _session
+    if _session is not None and _session.finished_at is None:
+        raise HTTPException(status_code=409, detail="Já existe uma sessão de profiling em andamento")
+    _session = RequestProfile(route, n, interval_ms / 1000.0)
+    return _session.status()
+
+
+@router.get("/requests")
+def profile_requests_result(format: str = Query("json", enum=["json", "collapsed"])):
+    if _session is None:
+        raise HTTPException(status_code=404, detail="Nenhuma sessão de profiling")
+    status = _session.status()
+    if not status["done"] and format == "collapsed":
+        raise HTTPException(status_code=409, detail="Sessão ainda em andamento")
+    return _render(status, format)
+
+
+def setup_profiling(app: FastAPI) -> None:
+    """
+    Registra rotas /admin/profile e o middleware de sessão. Só é chamado quando habilitado,
+    antes de declarar as rotas da aplicação (elas passam a usar `ProfiledRoute`).
+    """
+    app.include_router(router)
+    app.router.route_class = ProfiledRoute
+
+    @app.middleware("http")
+    async def _profile_requests(request: Request, call_next):
+        session = _session
+        if session is None or not session.enter(request.url.path):
+            return await call_next(request)
+        token = _request_session.set(session)
+        try:
+            return await call_next(request)
+        finally:
+            _request_session.reset(token)
+            session.exit()
@@ -1,4 +1,4 @@
-from typing import Any, Literal, Optional
+from typing import Any, Literal, Optional, Union
 from pydantic import BaseModel, Field
 
 class Overview(BaseModel):
@@ -24,8 +24,26 @@ class GameItem(BaseModel):
     critic_score: Optional[float] = None
     user_score: Optional[float] = None
 
+class TitleItem(BaseModel):
+    """Um título somado entre plataformas (`level=title`): vendas somadas, notas pela média."""
+    name: str
+    platforms: list[str]
+    releases: int = 1
+    genre: Optional[str] = None
+    year: Optional[int] = None
+    publisher: Optional[str] = None
+    developer: Optional[str] = None
+    rating: Optional[str] = None
+    global_sales: Optional[float] = None
+    na_sales: Optional[float] = None
+    eu_sales: Optional[float] = None
+    jp_sales: Optional[float] = None
+    other_sales: Optional[float] = None
+    critic_score: Optional[float] = None
+    user_score: Optional[float] = None
+
 class RankingResponse(BaseModel):
     metric: Literal["global_sales","na_sales","eu_sales","jp_sales","critic_score","user_score"]
     filters: dict[str, Any]
     total: int
-    items: list[GameItem]
+    items: list[Union[TitleItem, GameItem]]
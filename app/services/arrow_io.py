@@ -0,0 +1,54 @@
+import json
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from .queries import ITEM_COLUMNS
+
+try:
+    import pyarrow as pa
+except Exception:
+    pa = None
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+
+def wants_arrow(accept: Optional[str]) -> bool:
+    return ARROW_STREAM in (accept or "")
+
+
+def arrow_available() -> bool:
+    return pa is not None
+
+
+def _ipc_bytes(table: "pa.Table") -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def frame_to_arrow(frame: pd.DataFrame, columns: Dict[str, str], meta: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    Serializa `frame` como Arrow IPC stream, com as colunas renomeadas por `columns`
+    ({nome de saída: coluna do dataset}). Colunas numéricas são convertidas sem cópia
+    a partir dos buffers do pandas; `meta` vai como JSON nos metadados do schema.
+    """
+    sub = frame[list(columns.values())]
+    sub.columns = list(columns.keys())
+    table = pa.Table.from_pandas(sub, preserve_index=False)
+    schema_meta = {b"ia_games": json.dumps(meta or {}, ensure_ascii=False, default=str).encode("utf-8")}
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), **schema_meta})
+    return _ipc_bytes(table)
+
+
+def items_frame_to_arrow(page: pd.DataFrame, meta: Optional[Dict[str, Any]] = None) -> bytes:
+    """Página de rankings no schema de `GameItem`."""
+    return frame_to_arrow(page, ITEM_COLUMNS, meta)
+
+
+def records_to_arrow(columns: Dict[str, list], meta: Optional[Dict[str, Any]] = None) -> bytes:
+    """Resultados pequenos já agregados (ex.: /stats/aggregate) em layout colunar."""
+    table = pa.table(columns)
+    schema_meta = {b"ia_games": json.dumps(meta or {}, ensure_ascii=False, default=str).encode("utf-8")}
+    return _ipc_bytes(table.replace_schema_metadata(schema_meta))
@@ -0,0 +1,41 @@
+from typing import Any, Callable, Dict, Optional, Protocol, Tuple
+
+import pandas as pd
+
+BACKENDS = ("pandas", "duckdb")
+
+
+class QueryBackend(Protocol):
+    """
+    Consultas principais da API (rankings, agregados, busca por nome, overview e as dimensões
+    dos metadados), que não dependem do DataFrame pandas.
+    Todas as implementações devolvem exatamente o mesmo resultado para o mesmo dataset:
+    empates em rankings e na busca por nome seguem a ordem das linhas no arquivo.
+    """
+
+    name: str
+    rows: int
+
+    def rankings(
+        self, metric: str, filters: Dict[str, Any], limit: int = 10, offset: int = 0, columnar: bool = False
+    ) -> Tuple[int, Any]: ...
+
+    def aggregate_metric(self, metric: str, filters: Dict[str, Any], name_contains: Optional[str] = None) -> dict: ...
+
+    def best_match(self, name: str) -> Optional[dict]: ...
+
+    def overview(self) -> dict: ...
+
+    def dimensions(self) -> Dict[str, list]: ...
+
+
+def create_backend(kind: str, path: str, load_df: Callable[[], pd.DataFrame]) -> QueryBackend:
+    """`kind` vem de DATA_BACKEND; o backend pandas reaproveita o DataFrame de `load_df`."""
+    kind = (kind or "pandas").lower()
+    if kind == "pandas":
+        from .pandas_backend import PandasBackend
+        return PandasBackend(load_df())
+    if kind == "duckdb":
+        from .duckdb_backend import DuckDBBackend
+        return DuckDBBackend(path)
+    raise ValueError(f"DATA_BACKEND inválido: {kind} (opções: {', '.join(BACKENDS)})")
@@ -0,0 +1,201 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from ..dataset import EXPECTED_COLS
+from ..queries import ITEM_COLUMNS, METRICS_MAP, _TEXT_KEYS, frame_to_columns, row_to_item
+from ...observability.metrics import observe_rows, stage
+
+try:
+    import duckdb
+except Exception:
+    duckdb = None
+
+_NUMERIC = {"NA_Sales", "EU_Sales", "JP_Sales", "Other_Sales", "Global_Sales",
+            "Critic_Score", "Critic_Count", "User_Score", "User_Count"}
+# mesmos marcadores de ausente que o pandas.read_csv reconhece por padrão
+_NA_STRINGS = ["", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+               "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"]
+# "Name" ausente sai como "nan", o mesmo que str(NaN) no backend pandas
+_ITEM_SELECT = ", ".join(
+    "coalesce(\"Name\", 'nan') AS \"Name\"" if c == "Name" else f'"{c}"' for c in ITEM_COLUMNS.values()
+)
+
+
+def _q(col: str) -> str:
+    return '"' + col.replace('"', '""') + '"'
+
+
+def _literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _text(col: str) -> str:
+    # mesmo texto de `astype(str).str.lower()` no pandas, onde ausente vira "nan"
+    return f"lower(coalesce({_q(col)}, 'nan'))"
+
+
+class DuckDBBackend:
+    """
+    Mesmas consultas do backend pandas em SQL (DuckDB), executadas em paralelo pelo engine.
+    CSV é carregado numa tabela colunar do DuckDB (com spill para disco quando não cabe na memória);
+    Parquet é consultado direto do arquivo. `row_id` guarda a ordem das linhas no arquivo para
+    desempatar exatamente como o pandas.
+    """
+
+    name = "duckdb"
+
+    def __init__(self, path: str, threads: Optional[int] = None):
+        if duckdb is None:
+            raise RuntimeError("DATA_BACKEND=duckdb requer o pacote duckdb")
+        self.path = str(path)
+        self._con = duckdb.connect(":memory:")
+        if threads:
+            self._con.execute(f"SET threads = {int(threads)}")
+        with stage("duckdb.load"):
+            self._load()
+        self.rows = self._con.execute("SELECT count(*) FROM games").fetchone()[0]
+
+    def _load(self) -> None:
+        con = self._con
+        if Path(self.path).suffix.lower() == ".parquet":
+            con.execute(
+                "CREATE VIEW raw AS SELECT file_row_number AS row_id, * EXCLUDE (file_row_number) "
+                f"FROM read_parquet({_literal(self.path)}, file_row_number = true)"
+            )
+        else:
+            con.execute(
+                "CREATE TABLE raw_csv AS SELECT * FROM read_csv(?, header = true, all_varchar = true, nullstr = ?)",
+                [self.path, _NA_STRINGS],
+            )
+            con.execute("CREATE VIEW raw AS SELECT rowid AS row_id, * FROM raw_csv")
+
+        present = {r[0].strip(): r[0] for r in con.execute("DESCRIBE raw").fetchall()}
+        cols = []
+        for c in EXPECTED_COLS:
+            src = _q(present[c]) if c in present else "NULL"
+            if c in _NUMERIC:
+                cols.append(f"TRY_CAST({src} AS DOUBLE) AS {_q(c)}")
+            elif c == "Year_of_Release":
+                cols.append(f"CAST(TRY_CAST({src} AS DOUBLE) AS BIGINT) AS {_q(c)}")
+            else:
+                cols.append(f"CAST({src} AS VARCHAR) AS {_q(c)}")
+        con.execute(
+            f"CREATE VIEW games AS SELECT row_id, {', '.join(cols)}, {_text('Name')} AS name_lower FROM raw"
+        )
+
+    def _one(self, sql: str, params: List[Any]) -> tuple:
+        # um cursor por chamada: requisições concorrentes não disputam a mesma conexão
+        with self._con.cursor() as cur:
+            return cur.execute(sql, params).fetchone()
+
+    def _frame(self, sql: str, params: List[Any]) -> pd.DataFrame:
+        with self._con.cursor() as cur:
+            return cur.execute(sql, params).df()
+
+    def _where(self, filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        """Tradução de `queries._filter_frame` (inclusive valores de ano inválidos -> nenhum resultado)."""
+        conds: List[str] = []
+        params: List[Any] = []
+        try:
+            if filters.get("year") is not None:
+                params.append(float(filters["year"]))
+                conds.append('round("Year_of_Release") = ?')
+            if filters.get("year_from") is not None:
+                params.append(float(filters["year_from"]))
+                conds.append('"Year_of_Release" >= ?')
+            if filters.get("year_to") is not None:
+                params.append(float(filters["year_to"]))
+                conds.append('"Year_of_Release" <= ?')
+        except (TypeError, ValueError):
+            return "false", []
+        for key in _TEXT_KEYS:
+            if filters.get(key):
+                conds.append(f"{_text(key.capitalize())} = ?")
+                params.append(str(filters[key]).lower())
+        return (" AND ".join(conds) or "true"), params
+
+    def rankings(
+        self, metric: str, filters: Dict[str, Any], limit: int = 10, offset: int = 0, columnar: bool = False
+    ) -> Tuple[int, Any]:
+        col = _q(METRICS_MAP[metric])
+        where, params = self._where(filters)
+        with stage("duckdb.rankings"):
+            page = self._frame(
+                f"WITH f AS (SELECT * FROM games WHERE {where} AND {col} IS NOT NULL) "
+                f"SELECT (SELECT count(*) FROM f) AS _total, {_ITEM_SELECT} FROM f "
+                f"ORDER BY {col} DESC, row_id LIMIT ? OFFSET ?",
+                params + [int(limit), int(offset)],
+            )
+            if page.empty:
+                total = self._one(f"SELECT count(*) FROM games WHERE {where} AND {col} IS NOT NULL", params)[0]
+            else:
+                total = int(page["_total"].iloc[0])
+        observe_rows("rankings", self.rows, len(page))
+        if columnar:
+            return int(total), frame_to_columns(page)
+        return int(total), [row_to_item(row) for _, row in page.iterrows()]
+
+    def aggregate_metric(self, metric: str, filters: Dict[str, Any], name_contains: Optional[str] = None) -> dict:
+        col = _q(METRICS_MAP[metric])
+        where, params = self._where(filters)
+        needle = str(name_contains or "").lower().strip()
+        if needle:
+            where = f"contains(name_lower, ?) AND {where}"
+            params = [needle] + params
+        with stage("duckdb.aggregate"):
+            count, total = self._one(
+                f"SELECT count({col}), fsum({col}) FROM games WHERE {where} AND {col} IS NOT NULL", params
+            )
+        observe_rows("aggregate", self.rows, count)
+        return {
+            "metric": metric,
+            "filters": {k: v for k, v in filters.items() if v is not None},
+            "name_contains": name_contains,
+            "count": int(count),
+            "mean": round(float(total) / count, 3) if count else None,
+            "sum": round(float(total), 3) if count else None,
+        }
+
+    def best_match(self, name: str) -> Optional[dict]:
+        name_l = (name or "").lower().strip()
+        if not name_l:
+            return None
+        with stage("duckdb.best_match"):
+            found = self._frame(
+                f"SELECT {_ITEM_SELECT} FROM games WHERE name_lower = ? ORDER BY row_id LIMIT 1", [name_l]
+            )
+            if found.empty:
+                found = self._frame(
+                    f"SELECT {_ITEM_SELECT} FROM games WHERE contains(name_lower, ?) "
+                    f'ORDER BY "Global_Sales" DESC NULLS LAST, row_id LIMIT 1',
+                    [name_l],
+                )
+        observe_rows("best_match", self.rows, len(found))
+        return None if found.empty else row_to_item(found.iloc[0])
+
+    def overview(self) -> dict:
+        titles, y0, y1, sales, critic_sum, critic_n, user_sum, user_n = self._one(
+            'SELECT count(DISTINCT "Name"), min("Year_of_Release"), max("Year_of_Release"), fsum("Global_Sales"), '
+            'fsum("Critic_Score"), count("Critic_Score"), fsum("User_Score"), count("User_Score") FROM games',
+            [],
+        )
+        return {
+            "total_titles": int(titles),
+            "year_range": None if y0 is None else (int(y0), int(y1)),
+            "sum_global_sales": None if sales is None else round(float(sales), 2),
+            "avg_critic_score": round(critic_sum / critic_n, 2) if critic_n else None,
+            "avg_user_score": round(user_sum / user_n, 2) if user_n else None,
+        }
+
+    def dimensions(self) -> Dict[str, list]:
+        """Mesmos valores de `meta.dimensions` no pandas (distintos, sem ausentes, ordenados)."""
+        out: Dict[str, list] = {}
+        with self._con.cursor() as cur:
+            for key, col in (("platforms", "Platform"), ("genres", "Genre")):
+                vals = cur.execute(f"SELECT DISTINCT {_q(col)} FROM games WHERE {_q(col)} IS NOT NULL").fetchall()
+                out[key] = sorted(str(v[0]) for v in vals)
+            vals = cur.execute('SELECT DISTINCT "Year_of_Release" FROM games WHERE "Year_of_Release" IS NOT NULL').fetchall()
+            out["years"] = sorted(int(v[0]) for v in vals)
+        return out
@@ -0,0 +1,34 @@
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from .. import queries
+from ..meta import dimensions
+
+
+class PandasBackend:
+    """Backend padrão: as funções de `queries` sobre o DataFrame em memória."""
+
+    name = "pandas"
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.rows = len(df)
+
+    def rankings(
+        self, metric: str, filters: Dict[str, Any], limit: int = 10, offset: int = 0, columnar: bool = False
+    ) -> Tuple[int, Any]:
+        return queries.rankings(self.df, metric=metric, filters=filters, limit=limit, offset=offset, columnar=columnar)
+
+    def aggregate_metric(self, metric: str, filters: Dict[str, Any], name_contains: Optional[str] = None) -> dict:
+        return queries.aggregate_metric(self.df, metric=metric, filters=filters, name_contains=name_contains)
+
+    def best_match(self, name: str) -> Optional[dict]:
+        row = queries.best_match(self.df, name)
+        return None if row is None else queries.row_to_item(row)
+
+    def overview(self) -> dict:
+        return queries.overview(self.df)
+
+    def dimensions(self) -> Dict[str, list]:
+        return dimensions(self.df)
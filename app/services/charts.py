@@ -0,0 +1,157 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .dataset import year_range
+from .queries import METRICS_MAP, aggregate_frame, ranked_frame
+from ..observability.metrics import stage
+
+CHART_FIELDS = {
+    "platform": "Platform",
+    "genre": "Genre",
+    "year": "Year_of_Release",
+    "publisher": "Publisher",
+    **METRICS_MAP,
+}
+
+
+def _clean(values: Sequence[Any]) -> List[Any]:
+    out = []
+    for v in values:
+        if v is None or v is pd.NA or (isinstance(v, float) and np.isnan(v)):
+            out.append(None)
+        elif isinstance(v, (np.integer,)):
+            out.append(int(v))
+        elif isinstance(v, (np.floating,)):
+            out.append(float(v))
+        else:
+            out.append(v)
+    return out
+
+
+def lttb(x: Sequence[float], y: Sequence[float], n_out: int) -> List[int]:
+    """
+    Downsampling "Largest-Triangle-Three-Buckets": escolhe `n_out` índices que preservam a forma
+    da série (picos e vales). Devolve os índices escolhidos, em ordem.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return list(range(n))
+    xs = np.asarray(x, dtype=float)
+    ys = np.nan_to_num(np.asarray(y, dtype=float))
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    picked = [0]
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_lo, nxt_hi = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = xs[nxt_lo:nxt_hi].mean() if nxt_hi > nxt_lo else xs[-1]
+        avg_y = ys[nxt_lo:nxt_hi].mean() if nxt_hi > nxt_lo else ys[-1]
+        a = picked[-1]
+        area = np.abs((xs[a] - avg_x) * (ys[lo:hi] - ys[a]) - (xs[a] - xs[lo:hi]) * (avg_y - ys[a]))
+        picked.append(lo + int(area.argmax()))
+    picked.append(n - 1)
+    return picked
+
+
+def _downsample(series: Dict[str, List[Any]], x_key: str, y_key: str, max_points: Optional[int]) -> Dict[str, List[Any]]:
+    if not max_points or len(series[x_key]) <= max_points:
+        return series
+    idx = lttb(series[x_key], series[y_key], max_points)
+    return {k: [v[i] for i in idx] for k, v in series.items()}
+
+
+def ranking_chart(
+    df: pd.DataFrame,
+    metric: str,
+    filters: Dict[str, Any],
+    limit: int = 10,
+    extra: Sequence[str] = (),
+) -> Dict[str, Any]:
+    """
+    Top-N em layout colunar: `labels` (nomes) e `values` (métrica), na mesma ordem de /rankings/games.
+    `extra` acrescenta colunas de CHART_FIELDS (ex.: platform, year) sob `columns`.
+    """
+    dff = ranked_frame(df, metric, filters).head(limit)
+    with stage("charts.serialize"):
+        out: Dict[str, Any] = {
+            "labels": dff["Name"].astype(str).tolist(),
+            "values": _clean(dff[METRICS_MAP[metric]].tolist()),
+        }
+        cols = [f for f in extra if f in CHART_FIELDS]
+        if cols:
+            out["columns"] = {f: _clean(dff[CHART_FIELDS[f]].astype(object).tolist()) for f in cols}
+    return out
+
+
+def _year_span(df: pd.DataFrame, year_from: Optional[int], year_to: Optional[int]) -> List[int]:
+    yr = year_range(df) or (2000, 2015)
+    y0 = int(year_from) if year_from is not None else yr[0]
+    y1 = int(year_to) if year_to is not None else yr[1]
+    if y0 > y1:
+        y0, y1 = y1, y0
+    return list(range(y0, y1 + 1))
+
+
+def top_by_year_chart(
+    df: pd.DataFrame,
+    metric: str,
+    filters: Dict[str, Any],
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    max_points: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Top 1 por ano numa única passada (groupby + idxmax), equivalente a chamar
+    /rankings/games?year=Y&limit=1 para cada ano. Anos sem dados saem com valor 0 e label null.
+    """
+    col = METRICS_MAP[metric]
+    years = _year_span(df, year_from, year_to)
+    base = {k: v for k, v in filters.items() if k not in ("year", "year_from", "year_to")}
+    dff = ranked_frame(df, metric, {**base, "year_from": years[0], "year_to": years[-1]})
+
+    with stage("charts.group"):
+        top = dff.drop_duplicates(subset=["Year_of_Release"], keep="first")
+        by_year = {int(y): (v, n) for y, v, n in zip(top["Year_of_Release"], top[col], top["Name"]) if pd.notna(y)}
+
+    series = {
+        "x": years,
+        "y": [float(by_year[y][0]) if y in by_year else 0 for y in years],
+        "labels": [str(by_year[y][1]) if y in by_year else None for y in years],
+    }
+    return _downsample(series, "x", "y", max_points)
+
+
+def aggregate_by_year_chart(
+    df: pd.DataFrame,
+    metric: str,
+    filters: Dict[str, Any],
+    name_contains: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    agg: str = "sum",
+    max_points: Optional[int] = None,
+    rows: Optional[np.ndarray] = None,
+) -> Dict[str, Any]:
+    """
+    Série anual (sum/mean/count) de /stats/aggregate numa única passada groupby, equivalente
+    a uma chamada por ano. Anos sem dados saem com 0 (sum/count) ou null (mean).
+    `rows` restringe às posições informadas (como em `aggregate_frame`).
+    """
+    col = METRICS_MAP[metric]
+    years = _year_span(df, year_from, year_to)
+    base = {k: v for k, v in filters.items() if k not in ("year", "year_from", "year_to")}
+    dff = aggregate_frame(df, metric, {**base, "year_from": years[0], "year_to": years[-1]}, name_contains, rows=rows)
+
+    with stage("charts.group"):
+        grouped = pd.to_numeric(dff[col], errors="coerce").groupby(dff["Year_of_Release"]).agg(["sum", "mean", "count"])
+        stats = {int(y): row for y, row in grouped.iterrows()}
+
+    def _val(y: int):
+        if y not in stats:
+            return None if agg == "mean" else 0
+        v = stats[y][agg]
+        return int(v) if agg == "count" else round(float(v), 3)
+
+    series = {"x": years, "y": [_val(y) for y in years]}
+    return _downsample(series, "x", "y", max_points)
@@ -1,7 +1,12 @@
 import pandas as pd
 EXPECTED_COLS = ["Name","Platform","Year_of_Release","Genre","Publisher","NA_Sales","EU_Sales","JP_Sales","Other_Sales","Global_Sales","Critic_Score","Critic_Count","User_Score","User_Count","Developer","Rating"]
 def load_dataset(path: str) -> pd.DataFrame:
-    df = pd.read_csv(path)
+    if str(path).lower().endswith(".parquet"):
+        df = pd.read_parquet(path)
+        # texto ausente como NaN, igual ao read_csv (o parquet traz None)
+        df = df.apply(lambda s: s.fillna(float("nan")) if s.dtype == object else s)
+    else:
+        df = pd.read_csv(path)
     df.columns = [c.strip() for c in df.columns]
     for c in EXPECTED_COLS:
         if c not in df.columns:
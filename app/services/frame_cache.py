@@ -0,0 +1,45 @@
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from .singleflight import flight
+
+_lock = threading.Lock()
+_registry: Dict[int, Tuple[weakref.ref, Dict[Hashable, "OrderedDict[Hashable, Any]"]]] = {}
+
+
+def _forget(key: int) -> Callable[[weakref.ref], None]:
+    def _cb(_ref: weakref.ref) -> None:
+        with _lock:
+            _registry.pop(key, None)
+    return _cb
+
+
+def derived(df: Any, key: Hashable, build: Callable[[], Any], max_entries: int = 256) -> Any:
+    """
+    Estruturas derivadas de um DataFrame (índices, colunas calculadas, tabelas auxiliares) ou de
+    outro objeto do dataset carregado (ex.: o backend de consultas), calculadas uma vez por dataset
+    e liberadas junto com ele. Builds concorrentes da mesma chave são coalescidos.
+    O primeiro elemento da chave é o namespace: cada um tem sua própria LRU de `max_entries`.
+    """
+    fid = id(df)
+    namespace = key[0] if isinstance(key, tuple) else key
+    with _lock:
+        entry = _registry.get(fid)
+        if entry is None or entry[0]() is not df:
+            entry = (weakref.ref(df, _forget(fid)), {})
+            _registry[fid] = entry
+        cache = entry[1].setdefault(namespace, OrderedDict())
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+    value = flight.do(("derived", fid, key), build)
+
+    with _lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_entries:
+            cache.popitem(last=False)
+    return value
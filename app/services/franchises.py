@@ -0,0 +1,264 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .charts import _downsample, _year_span, aggregate_by_year_chart
+from .frame_cache import derived
+from .queries import METRICS_MAP, _YEAR_KEYS, aggregate_frame, normalize_filters
+from ..observability.metrics import observe_rows, stage
+
+# subtítulo/edição: tudo depois de ":", " - ", "(" ou "/" (ex.: "Pokemon Red/Pokemon Blue")
+_SUBTITLE = re.compile(r"\s*(?::|\s[-–]\s|\(|/).*$")
+# marcadores de sequência no fim do título: 2, 3, II, IV, 2nd...
+_SEQUEL = re.compile(r"^(?:[ivx]+|\d+(?:st|nd|rd|th)?)$")
+_SUFFIXES = {"hd", "3d", "remastered", "edition"}
+_STOPWORDS = {"the", "a", "an", "of", "and", "de", "la", "le"}
+
+
+def tokenize(text: str) -> List[str]:
+    """Minúsculas, sem acentos (Pokémon -> pokemon), só letras e dígitos."""
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii").lower()
+    return re.findall(r"[a-z0-9]+", text)
+
+
+def franchise_key(name: str, platforms: frozenset = frozenset()) -> str:
+    """
+    Chave da franquia de um título: o nome sem subtítulo, sem artigo inicial e sem os marcadores
+    de sequência/plataforma no fim. Ex.: "The Legend of Zelda: Ocarina of Time" -> "legend of zelda",
+    "Super Mario Bros. 3" -> "super mario bros", "Mario Kart Wii" -> "mario kart".
+    """
+    tokens = tokenize(_SUBTITLE.sub("", name) or name)
+    if len(tokens) > 1 and tokens[0] == "the":
+        tokens = tokens[1:]
+    while len(tokens) > 1 and (_SEQUEL.match(tokens[-1]) or tokens[-1] in platforms or tokens[-1] in _SUFFIXES):
+        tokens = tokens[:-1]
+    return " ".join(tokens)
+
+
+@dataclass(frozen=True)
+class _YearSeries:
+    """Soma/contagem da métrica por (título, ano), ordenadas por título; `offsets` delimita cada um."""
+    offsets: np.ndarray
+    year: np.ndarray
+    count: np.ndarray
+    total: np.ndarray
+
+
+@dataclass(frozen=True)
+class FranchiseTable:
+    """
+    Dimensão "franquia" do dataset, derivada dos títulos uma única vez. A unidade é o título (Name):
+    linhas de cada título (CSR), franquia de cada título, índice palavra -> títulos (palavras do
+    título inteiro) e, por métrica, os totais de cada título e a série anual. Uma busca por
+    franquia seleciona só os títulos que têm as palavras do termo (não a franquia inteira de cada
+    um) e vira somas sobre poucas entradas em vez de varrer nomes.
+    """
+    keys: np.ndarray
+    title_franchise: np.ndarray
+    row_codes: np.ndarray
+    order: np.ndarray
+    offsets: np.ndarray
+    tokens: Dict[str, np.ndarray]
+    count: Dict[str, np.ndarray]
+    total: Dict[str, np.ndarray]
+    series: Dict[str, _YearSeries]
+
+    def rows(self, ids: np.ndarray) -> np.ndarray:
+        """Posições (em ordem do arquivo) das linhas dos títulos `ids`."""
+        if len(ids) == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate([self.order[self.offsets[i]: self.offsets[i + 1]] for i in ids]))
+
+    def franchises(self, ids: np.ndarray) -> List[str]:
+        """Chaves das franquias dos títulos `ids`."""
+        return [str(self.keys[f]) for f in np.unique(self.title_franchise[ids])]
+
+
+def _build_table(df: pd.DataFrame) -> FranchiseTable:
+    with stage("franchises.build"):
+        platforms = frozenset(df["Platform"].dropna().astype(str).str.lower())
+        codes, titles = pd.factorize(df["Name"], use_na_sentinel=True)
+        codes = codes.astype(np.int64)
+        titles = [str(t) for t in titles]
+        n = len(titles)
+        title_franchise, keys = pd.factorize(pd.Series([franchise_key(t, platforms) for t in titles], dtype=object))
+
+        valid = codes >= 0
+        order = np.flatnonzero(valid)[np.argsort(codes[valid], kind="mergesort")]
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(codes[valid], minlength=n))])
+
+        index: Dict[str, List[int]] = {}
+        for i, title in enumerate(titles):
+            for tok in set(tokenize(title)) - _STOPWORDS:
+                index.setdefault(tok, []).append(i)
+
+        year = pd.to_numeric(df["Year_of_Release"], errors="coerce").to_numpy(dtype=float)
+        count, total, series = {}, {}, {}
+        for metric, col in METRICS_MAP.items():
+            vals = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+            ok = valid & ~np.isnan(vals)
+            count[metric] = np.bincount(codes[ok], minlength=n).astype(np.int64)
+            total[metric] = np.bincount(codes[ok], weights=vals[ok], minlength=n)
+
+            ok &= ~np.isnan(year)
+            g = pd.Series(vals[ok]).groupby([codes[ok], year[ok]]).agg(["count", "sum"])
+            tc = g.index.get_level_values(0).to_numpy()
+            series[metric] = _YearSeries(
+                offsets=np.searchsorted(tc, np.arange(n + 1)),
+                year=g.index.get_level_values(1).to_numpy(dtype=float),
+                count=g["count"].to_numpy(dtype=np.int64),
+                total=g["sum"].to_numpy(dtype=float),
+            )
+
+        return FranchiseTable(
+            keys=np.asarray(keys, dtype=object),
+            title_franchise=title_franchise.astype(np.int64),
+            row_codes=codes,
+            order=order,
+            offsets=offsets,
+            tokens={tok: np.asarray(ids, dtype=np.int64) for tok, ids in index.items()},
+            count=count,
+            total=total,
+            series=series,
+        )
+
+
+def franchise_table(df: pd.DataFrame) -> FranchiseTable:
+    """Tabela de franquias do dataset, construída uma vez (aquecida no startup da API)."""
+    return derived(df, ("franchises",), lambda: _build_table(df))
+
+
+def resolve(df: pd.DataFrame, term: Optional[str]) -> np.ndarray:
+    """
+    Títulos que têm todas as palavras do termo, por busca exata no índice ("zelda" -> títulos de
+    legend of zelda, zelda, ...; "Crisis Core: Final Fantasy VII" entra em "final fantasy").
+    Vazio quando alguma palavra não é palavra de nenhum título: nesse caso quem chama volta à
+    busca por substring no nome.
+    """
+    words = [t for t in tokenize(term or "") if t not in _STOPWORDS]
+    if not words:
+        return np.empty(0, dtype=np.int64)
+    table = franchise_table(df)
+    ids: Optional[np.ndarray] = None
+    for w in words:
+        hit = table.tokens.get(w)
+        if hit is None:
+            return np.empty(0, dtype=np.int64)
+        ids = hit if ids is None else np.intersect1d(ids, hit, assume_unique=True)
+    return ids
+
+
+def _series_slice(table: FranchiseTable, metric: str, ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    s = table.series[metric]
+    if len(ids) == 0:
+        return s.year[:0], s.count[:0], s.total[:0]
+    idx = np.concatenate([np.arange(s.offsets[i], s.offsets[i + 1]) for i in ids])
+    return s.year[idx], s.count[idx], s.total[idx]
+
+
+def _year_mask(year: np.ndarray, filters: Dict[str, Any]) -> np.ndarray:
+    mask = np.ones(len(year), dtype=bool)
+    try:
+        if filters.get("year") is not None:
+            mask &= np.round(year) == float(filters["year"])
+        if filters.get("year_from") is not None:
+            mask &= year >= float(filters["year_from"])
+        if filters.get("year_to") is not None:
+            mask &= year <= float(filters["year_to"])
+    except (TypeError, ValueError):
+        return np.zeros(len(year), dtype=bool)
+    return mask
+
+
+def _only_years(filters: Dict[str, Any]) -> bool:
+    return all(k in _YEAR_KEYS for k, _ in normalize_filters(filters))
+
+
+def franchise_frame(df: pd.DataFrame, metric: str, ids: np.ndarray, filters: Dict[str, Any]) -> pd.DataFrame:
+    """Linhas dos títulos `ids` que passam pelos filtros, sem NaN na métrica (como `aggregate_frame`)."""
+    return aggregate_frame(df, metric, filters, rows=franchise_table(df).rows(ids))
+
+
+def franchise_aggregate(df: pd.DataFrame, metric: str, ids: np.ndarray, filters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    count/mean/sum da métrica nos títulos `ids`. Sem filtros, soma os totais pré-calculados;
+    só com filtros de ano, usa a série anual; com os demais, agrega apenas as linhas dos títulos.
+    """
+    table = franchise_table(df)
+    with stage("franchises.aggregate"):
+        if not normalize_filters(filters):
+            count, total = int(table.count[metric][ids].sum()), float(table.total[metric][ids].sum())
+        elif _only_years(filters):
+            year, cnt, tot = _series_slice(table, metric, ids)
+            mask = _year_mask(year, filters)
+            count, total = int(cnt[mask].sum()), float(tot[mask].sum())
+        else:
+            vals = franchise_frame(df, metric, ids, filters)[METRICS_MAP[metric]]
+            count, total = int(len(vals)), float(vals.sum())
+    observe_rows("franchises.aggregate", len(ids), count)
+    return {
+        "count": count,
+        "mean": round(total / count, 3) if count else None,
+        "sum": round(total, 3) if count else None,
+    }
+
+
+def franchise_by_year(
+    df: pd.DataFrame,
+    metric: str,
+    ids: np.ndarray,
+    filters: Dict[str, Any],
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    agg: str = "sum",
+    max_points: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Mesma saída de `aggregate_by_year_chart`, restrita aos títulos `ids`."""
+    years = _year_span(df, year_from, year_to)
+    base = {k: v for k, v in filters.items() if k not in _YEAR_KEYS}
+    if normalize_filters(base):
+        return aggregate_by_year_chart(
+            df, metric, base, year_from=years[0], year_to=years[-1], agg=agg, max_points=max_points,
+            rows=franchise_table(df).rows(ids),
+        )
+
+    with stage("franchises.series"):
+        year, cnt, tot = _series_slice(franchise_table(df), metric, ids)
+        mask = (year >= years[0]) & (year <= years[-1])
+        pos = (year[mask] - years[0]).astype(np.int64)
+        counts = np.bincount(pos, weights=cnt[mask], minlength=len(years)).astype(np.int64)
+        sums = np.bincount(pos, weights=tot[mask], minlength=len(years))
+
+    def _val(i: int):
+        if counts[i] == 0:
+            return None if agg == "mean" else 0
+        if agg == "count":
+            return int(counts[i])
+        return round(float(sums[i] / counts[i] if agg == "mean" else sums[i]), 3)
+
+    series = {"x": years, "y": [_val(i) for i in range(len(years))]}
+    return _downsample(series, "x", "y", max_points)
+
+
+def list_franchises(df: pd.DataFrame, term: Optional[str] = None, limit: int = 20) -> Tuple[int, List[Dict[str, Any]]]:
+    """Franquias com títulos que casam com `term` (ou todas), ordenadas por vendas globais. Retorna (total, items)."""
+    table = franchise_table(df)
+    nf = len(table.keys)
+    titles = np.bincount(table.title_franchise, minlength=nf)
+    releases = np.bincount(table.title_franchise, weights=np.diff(table.offsets), minlength=nf)
+    sales = np.bincount(table.title_franchise, weights=table.total["global_sales"], minlength=nf)
+    ids = np.unique(table.title_franchise[resolve(df, term)]) if (term or "").strip() else np.arange(nf)
+    top = ids[np.argsort(-sales[ids], kind="mergesort")][:limit]
+    return len(ids), [
+        {
+            "franchise": str(table.keys[i]),
+            "titles": int(titles[i]),
+            "releases": int(releases[i]),
+            "global_sales": round(float(sales[i]), 3),
+        }
+        for i in top
+    ]
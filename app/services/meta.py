@@ -0,0 +1,75 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Tuple
+
+import pandas as pd
+
+
+def encode_json(obj: Any) -> bytes:
+    """Mesmo encoding do JSONResponse do FastAPI (compacto, UTF-8)."""
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _etag(payload: bytes) -> str:
+    return '"' + hashlib.sha1(payload).hexdigest()[:20] + '"'
+
+
+@dataclass(frozen=True)
+class MetaSnapshot:
+    """
+    Metadados e overview de uma versão do dataset, calculados uma única vez.
+    `payloads`/`etags` guardam o JSON já codificado de cada endpoint.
+    """
+    version: str
+    platforms: Tuple[str, ...]
+    genres: Tuple[str, ...]
+    years: Tuple[int, ...]
+    overview: Mapping[str, Any]
+    payloads: Mapping[str, bytes]
+    etags: Mapping[str, str]
+
+
+def dimensions(df: pd.DataFrame) -> Dict[str, list]:
+    """Plataformas, gêneros e anos distintos do dataset, ordenados."""
+    return {
+        "platforms": sorted(str(p) for p in df["Platform"].dropna().unique()),
+        "genres": sorted(str(g) for g in df["Genre"].dropna().unique()),
+        "years": sorted(set(int(y) for y in df["Year_of_Release"].dropna().unique())),
+    }
+
+
+def build_meta_snapshot(dims: Mapping[str, Any], ov: Mapping[str, Any]) -> MetaSnapshot:
+    """Snapshot a partir das dimensões e do overview do backend de consultas (sem exigir o DataFrame)."""
+    platforms = tuple(dims["platforms"])
+    genres = tuple(dims["genres"])
+    years = tuple(dims["years"])
+    ov = dict(ov)
+
+    bodies = {
+        "platforms": {"items": list(platforms), "count": len(platforms)},
+        "genres": {"items": list(genres), "count": len(genres)},
+        "years": {"items": list(years), "count": len(years)},
+        "overview": {**ov, "year_range": list(ov["year_range"]) if ov["year_range"] else None},
+    }
+    payloads = {k: encode_json(v) for k, v in bodies.items()}
+    version = hashlib.sha1(b"".join(payloads[k] for k in sorted(payloads))).hexdigest()[:12]
+
+    payloads["bootstrap"] = encode_json({
+        "version": version,
+        "platforms": bodies["platforms"]["items"],
+        "genres": bodies["genres"]["items"],
+        "years": bodies["years"]["items"],
+        "overview": bodies["overview"],
+    })
+
+    return MetaSnapshot(
+        version=version,
+        platforms=platforms,
+        genres=genres,
+        years=years,
+        overview=MappingProxyType(ov),
+        payloads=MappingProxyType(payloads),
+        etags=MappingProxyType({k: _etag(v) for k, v in payloads.items()}),
+    )
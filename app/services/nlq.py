@@ -1,6 +1,8 @@
 import re
 from typing import Dict, Any
 
+from ..observability.metrics import stage
+
 PLATFORM_ALIASES = {
     "ps": "PS", "ps1": "PS", "ps2": "PS2", "ps3": "PS3", "ps4": "PS4", "ps5": "PS5",
     "x360": "X360", "xbox360": "X360", "xbox 360": "X360",
@@ -131,6 +133,11 @@ def parse_question(question: str) -> Dict[str, Any]:
     - Se detectar "média/average" + termo, entra em modo aggregate.
     - Caso contrário, retorna modo rankings.
     """
+    with stage("nlq.parse"):
+        return _parse_question(question)
+
+
+def _parse_question(question: str) -> Dict[str, Any]:
     text = (question or "").strip()
     lower = text.lower()
 
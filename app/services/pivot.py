@@ -0,0 +1,105 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .frame_cache import derived
+from .queries import METRICS_MAP, filter_positions
+from ..observability.metrics import observe_rows, stage
+
+PIVOT_DIMS = {
+    "platform": "Platform",
+    "genre": "Genre",
+    "year": "Year_of_Release",
+    "rating": "Rating",
+    "publisher": "Publisher",
+}
+PIVOT_METRICS = {**METRICS_MAP, "other_sales": "Other_Sales"}
+PIVOT_AGGS = ("sum", "mean", "count")
+OTHERS = "Outros"
+
+
+def _codes(df: pd.DataFrame, dim: str) -> Tuple[np.ndarray, List[Any]]:
+    """Códigos da dimensão para todas as linhas do dataset (-1 = ausente) e os rótulos em ordem."""
+
+    def _build():
+        codes, labels = pd.factorize(df[PIVOT_DIMS[dim]], sort=True)
+        labels = [int(v) for v in labels] if dim == "year" else [str(v) for v in labels]
+        return codes.astype(np.int64), labels
+
+    return derived(df, ("pivot_codes", dim), _build)
+
+
+def _fold(presence: np.ndarray, labels: List[Any], top: Optional[int]) -> Tuple[np.ndarray, List[Any]]:
+    """
+    Mapa código -> linha/coluna da matriz: só categorias presentes, e com `top` as N mais
+    frequentes mantêm a ordem dos rótulos e o restante vira uma única categoria "Outros".
+    """
+    present = np.flatnonzero(presence)
+    if top is not None and len(present) > top:
+        keep = np.sort(present[np.argsort(-presence[present], kind="mergesort")[:top]])
+        mapping = np.full(len(labels), len(keep), dtype=np.int64)
+        mapping[keep] = np.arange(len(keep))
+        return mapping, [labels[i] for i in keep] + [OTHERS]
+    mapping = np.full(len(labels), -1, dtype=np.int64)
+    mapping[present] = np.arange(len(present))
+    return mapping, [labels[i] for i in present]
+
+
+def pivot(
+    df: pd.DataFrame,
+    rows: str,
+    cols: str,
+    metrics: Sequence[str],
+    filters: Dict[str, Any],
+    agg: str = "sum",
+    max_rows: Optional[int] = None,
+    max_cols: Optional[int] = None,
+    max_cells: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Tabela cruzada `rows` x `cols` das métricas, numa passada: as linhas filtradas (mesma semântica
+    de `_apply_filters`) viram um índice de célula pelos códigos das duas dimensões e cada métrica é
+    somada/contada com `np.bincount`. Linhas com a dimensão ausente ficam de fora.
+    A matriz sai densa, linha a linha: `matrix[metric][i][j]` é (rows[i], cols[j]).
+    Levanta ValueError se a matriz passar de `max_cells` células.
+    """
+    rcodes, rlabels = _codes(df, rows)
+    ccodes, clabels = _codes(df, cols)
+    pos = filter_positions(df, filters)
+    with stage("pivot.build"):
+        r, c = rcodes[pos], ccodes[pos]
+        ok = (r >= 0) & (c >= 0)
+        r, c, pos = r[ok], c[ok], pos[ok]
+
+        rmap, rlabels = _fold(np.bincount(r, minlength=len(rlabels)), rlabels, max_rows)
+        cmap, clabels = _fold(np.bincount(c, minlength=len(clabels)), clabels, max_cols)
+        nr, nc = len(rlabels), len(clabels)
+        if max_cells is not None and nr * nc > max_cells:
+            raise ValueError(
+                f"Tabela {nr}x{nc} passa do limite de {max_cells} células; use filtros, max_rows ou max_cols"
+            )
+        cell = rmap[r] * nc + cmap[c]
+
+        out: Dict[str, List[List[Any]]] = {}
+        for metric in metrics:
+            vals = pd.to_numeric(df[PIVOT_METRICS[metric]], errors="coerce").to_numpy(dtype=float, na_value=np.nan)[pos]
+            has = ~np.isnan(vals)
+            counts = np.bincount(cell[has], minlength=nr * nc).reshape(nr, nc)
+            if agg == "count":
+                out[metric] = counts.tolist()
+                continue
+            sums = np.bincount(cell[has], weights=vals[has], minlength=nr * nc).reshape(nr, nc)
+            if agg == "sum":
+                out[metric] = np.round(sums, 3).tolist()
+            else:
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    means = np.round(sums / counts, 3)
+                out[metric] = [[None if n == 0 else v for v, n in zip(vr, cr)] for vr, cr in zip(means.tolist(), counts.tolist())]
+    observe_rows("pivot", len(df), len(pos))
+    return {
+        "rows": {"dim": rows, "labels": rlabels},
+        "cols": {"dim": cols, "labels": clabels},
+        "agg": agg,
+        "matrix": out,
+    }
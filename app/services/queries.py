@@ -1,6 +1,11 @@
-from typing import Any, Dict, List, Optional, Tuple
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 from .dataset import year_range
+from .frame_cache import derived
+from ..observability.metrics import observe_rows, stage
 
 METRICS_MAP = {
     "global_sales": "Global_Sales",
@@ -24,102 +29,319 @@ def overview(df: pd.DataFrame) -> dict:
     }
 
 
+_YEAR_KEYS = ("year", "year_from", "year_to")
+_TEXT_KEYS = ("platform", "genre", "publisher", "rating")
+
+
+def normalize_filters(filters: Optional[Dict[str, Any]]) -> Tuple[Tuple[str, Any], ...]:
+    """
+    Forma canônica (hashable) dos filtros, com a mesma semântica de `_apply_filters`:
+    descarta vazios, normaliza anos para número e textos para minúsculas.
+    Usada como parte da chave de coalescing/cache.
+    """
+    out: Dict[str, Any] = {}
+    for k, v in (filters or {}).items():
+        if k in _YEAR_KEYS:
+            if v is None:
+                continue
+            try:
+                f = float(v)
+                out[k] = int(f) if f.is_integer() else f
+            except (TypeError, ValueError):
+                out[k] = str(v)
+        elif k in _TEXT_KEYS:
+            if v:
+                out[k] = str(v).lower()
+        elif v is not None:
+            out[k] = v
+    return tuple(sorted(out.items()))
+
+
 def _apply_filters(df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
     """
     Aplica filtros comuns: ano (exato / intervalo), plataforma, gênero, publisher, rating.
     Robusto a valores inválidos e NaN.
     """
-    out = df.copy()
+    with stage("filters"):
+        out = _filter_frame(df, filters)
+    observe_rows("filters", len(df), len(out))
+    return out
 
-    if filters.get("year") is not None:
-        try:
-            ycol = pd.to_numeric(out["Year_of_Release"], errors="coerce")
-            y = float(filters["year"])
-            out = out[ycol.round(0) == y]
-        except Exception:
-            return out.iloc[0:0] 
 
-    if filters.get("year_from") is not None:
-        try:
-            ycol = pd.to_numeric(out["Year_of_Release"], errors="coerce")
-            out = out[ycol >= float(filters["year_from"])]
-        except Exception:
-            return out.iloc[0:0]
+def _text_codes(df: pd.DataFrame, key: str) -> Tuple[np.ndarray, Dict[str, int]]:
+    """Coluna de texto em minúsculas (ausente = "nan", como `astype(str)`) como códigos + {valor: código}."""
+
+    def _build():
+        codes, uniques = pd.factorize(df[key.capitalize()].astype(str).str.lower())
+        return codes, {v: i for i, v in enumerate(uniques)}
+
+    return derived(df, ("filter_text", key), _build)
+
+
+def _text_counts(df: pd.DataFrame, key: str) -> np.ndarray:
+    """Frequência de cada valor (por código): a estimativa de linhas do predicado."""
+    return derived(df, ("filter_freq", key), lambda: np.bincount(_text_codes(df, key)[0]))
+
 
+def _years(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Ano como float (NaN = ausente) e os anos presentes ordenados, para estimar intervalos."""
+
+    def _build():
+        year = pd.to_numeric(df["Year_of_Release"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        return year, np.sort(year[~np.isnan(year)])
+
+    return derived(df, ("filter_years",), _build)
+
+
+def filter_stats(df: pd.DataFrame) -> None:
+    """Monta as colunas codificadas e as frequências usadas pelo planejador (aquecido no startup)."""
+    _years(df)
+    for key in _TEXT_KEYS:
+        _text_counts(df, key)
+
+
+@dataclass(frozen=True)
+class _Predicate:
+    label: str
+    estimate: int
+    test: Callable[[Optional[np.ndarray]], np.ndarray]
+
+
+def _year_predicates(df: pd.DataFrame, filters: Dict[str, Any]) -> List[_Predicate]:
+    year, ordered = _years(df)
+
+    def _count(lo: float, hi: float) -> int:
+        return int(np.searchsorted(ordered, hi, side="right") - np.searchsorted(ordered, lo, side="left"))
+
+    def _cmp(op, value):
+        return lambda idx: op(year if idx is None else year[idx], value)
+
+    out = []
+    if filters.get("year") is not None:
+        y = float(filters["year"])
+        out.append(_Predicate(f"year = {filters['year']}", _count(y - 0.5, y + 0.5),
+                              lambda idx: np.round(year if idx is None else year[idx]) == y))
+    if filters.get("year_from") is not None:
+        y0 = float(filters["year_from"])
+        out.append(_Predicate(f"year >= {filters['year_from']}", _count(y0, np.inf), _cmp(np.greater_equal, y0)))
     if filters.get("year_to") is not None:
-        try:
-            ycol = pd.to_numeric(out["Year_of_Release"], errors="coerce")
-            out = out[ycol <= float(filters["year_to"])]
-        except Exception:
-            return out.iloc[0:0]
-
-    if filters.get("platform"):
-        out = out[out["Platform"].astype(str).str.lower() == str(filters["platform"]).lower()]
-    if filters.get("genre"):
-        out = out[out["Genre"].astype(str).str.lower() == str(filters["genre"]).lower()]
-    if filters.get("publisher"):
-        out = out[out["Publisher"].astype(str).str.lower() == str(filters["publisher"]).lower()]
-    if filters.get("rating"):
-        out = out[out["Rating"].astype(str).str.lower() == str(filters["rating"]).lower()]
+        y1 = float(filters["year_to"])
+        out.append(_Predicate(f"year <= {filters['year_to']}", _count(-np.inf, y1), _cmp(np.less_equal, y1)))
+    return out
+
+
+def _text_predicate(df: pd.DataFrame, key: str, value: Any) -> _Predicate:
+    codes, index = _text_codes(df, key)
+    v = str(value).lower()
+    code = index.get(v, -1)
+    estimate = int(_text_counts(df, key)[code]) if code >= 0 else 0
+    return _Predicate(f"{key} = {v}", estimate, lambda idx: (codes if idx is None else codes[idx]) == code)
+
+
+def plan_filters(df: pd.DataFrame, filters: Dict[str, Any]) -> List[_Predicate]:
+    """
+    Predicados dos filtros, do mais seletivo para o menos (estimativa pelas frequências de cada
+    valor no dataset). Ano inválido levanta ValueError (nenhum resultado, como antes).
+    """
+    preds = _year_predicates(df, filters)
+    preds += [_text_predicate(df, k, filters[k]) for k in _TEXT_KEYS if filters.get(k)]
+    return sorted(preds, key=lambda p: p.estimate)
+
+
+def _run_plan(df: pd.DataFrame, filters: Dict[str, Any], trace: Optional[List[dict]] = None) -> Optional[np.ndarray]:
+    """Posições das linhas que passam (None = todas), avaliando cada predicado só sobre os candidatos."""
+    try:
+        preds = plan_filters(df, filters)
+    except (TypeError, ValueError):
+        return np.empty(0, dtype=np.int64)
+    cand: Optional[np.ndarray] = None
+    for p in preds:
+        if cand is not None and len(cand) == 0:
+            if trace is not None:
+                trace.append({"predicate": p.label, "estimated": p.estimate, "actual": 0, "skipped": True})
+            continue
+        mask = p.test(cand)
+        cand = np.flatnonzero(mask) if cand is None else cand[mask]
+        if trace is not None:
+            trace.append({"predicate": p.label, "estimated": p.estimate, "actual": int(len(cand))})
+    return cand
+
+
+def filter_positions(df: pd.DataFrame, filters: Dict[str, Any]) -> np.ndarray:
+    """Posições (em ordem do arquivo) das linhas que passam pelos filtros."""
+    with stage("filters"):
+        cand = _run_plan(df, filters)
+    pos = np.arange(len(df)) if cand is None else cand
+    observe_rows("filters", len(df), len(pos))
+    return pos
+
+
+def _filter_frame(df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
+    cand = _run_plan(df, filters)
+    # sem filtros devolve o próprio DataFrame: quem chama não altera o resultado
+    return df if cand is None else df.iloc[cand]
+
 
+def explain_filters(df: pd.DataFrame, filters: Dict[str, Any]) -> Dict[str, Any]:
+    """Plano dos filtros com linhas estimadas x reais por passo (depuração do planejador)."""
+    trace: List[dict] = []
+    t0 = time.perf_counter()
+    cand = _run_plan(df, filters, trace)
+    return {
+        "rows": len(df),
+        "filters": {k: v for k, v in filters.items() if v is not None},
+        "steps": trace,
+        "result": len(df) if cand is None else int(len(cand)),
+        "seconds": round(time.perf_counter() - t0, 6),
+    }
+
+
+def _s(v):
+    return None if pd.isna(v) else str(v)
+
+
+def _f(v):
+    return float(v) if pd.notna(v) else None
+
+
+def _i(v):
+    return int(v) if pd.notna(v) else None
+
+
+def row_to_item(row: pd.Series) -> dict:
+    """Converte uma linha do dataset no formato `GameItem` (NaN -> None)."""
+    return {
+        "name": str(row["Name"]),
+        "platform": _s(row.get("Platform")),
+        "genre": _s(row.get("Genre")),
+        "year": _i(row.get("Year_of_Release")),
+        "publisher": _s(row.get("Publisher")),
+        "developer": _s(row.get("Developer")),
+        "rating": _s(row.get("Rating")),
+        "global_sales": _f(row.get("Global_Sales")),
+        "na_sales": _f(row.get("NA_Sales")),
+        "eu_sales": _f(row.get("EU_Sales")),
+        "jp_sales": _f(row.get("JP_Sales")),
+        "other_sales": _f(row.get("Other_Sales")),
+        "critic_score": _f(row.get("Critic_Score")),
+        "user_score": _f(row.get("User_Score")),
+    }
+
+
+ITEM_COLUMNS = {
+    "name": "Name",
+    "platform": "Platform",
+    "genre": "Genre",
+    "year": "Year_of_Release",
+    "publisher": "Publisher",
+    "developer": "Developer",
+    "rating": "Rating",
+    "global_sales": "Global_Sales",
+    "na_sales": "NA_Sales",
+    "eu_sales": "EU_Sales",
+    "jp_sales": "JP_Sales",
+    "other_sales": "Other_Sales",
+    "critic_score": "Critic_Score",
+    "user_score": "User_Score",
+}
+_INT_ITEMS = {"year"}
+_FLOAT_ITEMS = {"global_sales", "na_sales", "eu_sales", "jp_sales", "other_sales", "critic_score", "user_score"}
+
+
+def frame_to_columns(page: pd.DataFrame) -> Dict[str, List[Any]]:
+    """
+    Mesmos campos/tipos de `row_to_item`, mas em layout colunar ({campo: [valores]}),
+    convertidos coluna a coluna em vez de linha a linha.
+    """
+    out: Dict[str, List[Any]] = {}
+    for key, col in ITEM_COLUMNS.items():
+        ser = page[col]
+        mask = ser.isna().tolist()
+        if key in _FLOAT_ITEMS:
+            vals = pd.to_numeric(ser, errors="coerce").astype(float).tolist()
+        elif key in _INT_ITEMS:
+            vals = [None if m else int(v) for v, m in zip(ser.tolist(), mask)]
+        elif key == "name":
+            vals = ser.astype(str).tolist()
+            mask = [False] * len(vals)
+        else:
+            vals = ser.astype(object).tolist()
+            vals = [None if m else str(v) for v, m in zip(vals, mask)]
+        out[key] = [None if m else v for v, m in zip(vals, mask)]
     return out
 
 
+def _rank(dff: pd.DataFrame, metric: str) -> pd.DataFrame:
+    col = METRICS_MAP[metric]
+    with stage("rankings.sort"):
+        dff = dff.dropna(subset=[col])
+        if not dff.empty:
+            # estável: empates ficam na ordem do arquivo (igual em todos os backends)
+            dff = dff.sort_values(by=col, ascending=False, kind="mergesort")
+    return dff
+
+
+def ranked_frame(df: pd.DataFrame, metric: str, filters: Dict[str, Any]) -> pd.DataFrame:
+    """Subconjunto filtrado, sem NaN na métrica, ordenado por ela (desc)."""
+    return _rank(_apply_filters(df, filters), metric)
+
+
+def _page_items(page: pd.DataFrame, columnar: bool) -> Any:
+    with stage("rankings.serialize"):
+        if columnar:
+            return frame_to_columns(page)
+        return [row_to_item(row) for _, row in page.iterrows()]
+
+
 def rankings(
     df: pd.DataFrame,
     metric: str,
     filters: Dict[str, Any],
     limit: int = 10,
     offset: int = 0,
-) -> Tuple[int, List[dict]]:
+    columnar: bool = False,
+) -> Tuple[int, Any]:
     """
     Lista ordenada por uma métrica (desc), com filtros e paginação.
     Retorna (total, items). Faz sanitize de NaN -> None para validação Pydantic.
+    Com `columnar=True`, items vem como {campo: [valores]} (ver `frame_to_columns`).
     """
-    col = METRICS_MAP[metric]
-    dff = _apply_filters(df, filters)
-
-    dff = dff.dropna(subset=[col])
+    dff = ranked_frame(df, metric, filters)
     if dff.empty:
-        return 0, []
-
-    dff = dff.sort_values(by=col, ascending=False)
+        observe_rows("rankings", len(df), 0)
+        return 0, frame_to_columns(dff) if columnar else []
     total = len(dff)
     page = dff.iloc[offset: offset + limit]
+    items = _page_items(page, columnar)
 
-    def _s(v):  
-        return None if pd.isna(v) else str(v)
-
-    def _f(v): 
-        return float(v) if pd.notna(v) else None
-
-    def _i(v): 
-        return int(v) if pd.notna(v) else None
-
-    items: List[dict] = []
-    for _, row in page.iterrows():
-        items.append(
-            {
-                "name": str(row["Name"]),
-                "platform": _s(row.get("Platform")),
-                "genre": _s(row.get("Genre")),
-                "year": _i(row.get("Year_of_Release")),
-                "publisher": _s(row.get("Publisher")),
-                "developer": _s(row.get("Developer")),
-                "rating": _s(row.get("Rating")),
-                "global_sales": _f(row.get("Global_Sales")),
-                "na_sales": _f(row.get("NA_Sales")),
-                "eu_sales": _f(row.get("EU_Sales")),
-                "jp_sales": _f(row.get("JP_Sales")),
-                "other_sales": _f(row.get("Other_Sales")),
-                "critic_score": _f(row.get("Critic_Score")),
-                "user_score": _f(row.get("User_Score")),
-            }
-        )
-
+    observe_rows("rankings", len(df), len(page))
     return total, items
 
 
+def rankings_multi(
+    df: pd.DataFrame,
+    metrics: List[str],
+    filters: Dict[str, Any],
+    limit: int = 10,
+    offset: int = 0,
+    columnar: bool = False,
+) -> Dict[str, Tuple[int, Any]]:
+    """
+    Top-k de várias métricas com uma única avaliação dos filtros.
+    Retorna {metric: (total, items)}, cada um igual ao que `rankings` devolveria.
+    """
+    base = _apply_filters(df, filters)
+    out: Dict[str, Tuple[int, Any]] = {}
+    returned = 0
+    for metric in dict.fromkeys(metrics):
+        dff = _rank(base, metric)
+        page = dff.iloc[offset: offset + limit]
+        out[metric] = (len(dff), _page_items(page, columnar))
+        returned += len(page)
+    observe_rows("rankings", len(df), returned)
+    return out
+
+
 def best_match(df: pd.DataFrame, name: str) -> Optional[pd.Series]:
     """
     Busca um jogo por nome (case-insensitive), usando exato e depois "contains" com fallback.
@@ -129,40 +351,65 @@ def best_match(df: pd.DataFrame, name: str) -> Optional[pd.Series]:
     if not name_l:
         return None
 
-    exact = df[df["name_lower"] == name_l]
+    with stage("best_match.exact"):
+        exact = df[df["name_lower"] == name_l]
     if not exact.empty:
+        observe_rows("best_match", len(df), 1)
         return exact.iloc[0]
 
-    contains = df[df["name_lower"].str.contains(name_l, na=False)]
+    with stage("best_match.contains"):
+        contains = df[df["name_lower"].str.contains(name_l, na=False, regex=False)]
+        if not contains.empty:
+            contains = contains.sort_values("Global_Sales", ascending=False, kind="mergesort")
+    observe_rows("best_match", len(df), 0 if contains.empty else 1)
     if not contains.empty:
-        contains = contains.sort_values("Global_Sales", ascending=False)
         return contains.iloc[0]
 
     return None
 
 
-def aggregate_metric(
+def aggregate_frame(
     df: pd.DataFrame,
-    metric: str, 
+    metric: str,
     filters: Dict[str, Any],
     name_contains: Optional[str] = None,
-) -> dict:
+    rows: Optional[np.ndarray] = None,
+) -> pd.DataFrame:
     """
-    Agrega por métrica (mean/sum) sobre um subconjunto definido por:
-    - filtros usuais (ano, plataforma, gênero, ...)
-    - e/ou "franquia"/termo no nome (name_contains, case-insensitive)
+    Linhas que entram na agregação: termo no nome + filtros, sem NaN na métrica.
+    Os filtros rodam sobre o próprio `df` (com as estatísticas do planejador já montadas) e o termo
+    só é procurado nas linhas que passaram; `rows` restringe a essas posições (ex.: uma franquia).
     """
     col = METRICS_MAP[metric]
-    dff = df.copy()
+    pos = filter_positions(df, filters)
+    if rows is not None:
+        pos = np.intersect1d(pos, rows, assume_unique=True)
 
     if name_contains:
         needle = str(name_contains).lower().strip()
         if needle:
-            dff = dff[dff["Name"].astype(str).str.lower().str.contains(needle, na=False)]
+            with stage("aggregate.name_match"):
+                hit = df["name_lower"].iloc[pos].str.contains(needle, na=False, regex=False).to_numpy(dtype=bool)
+                pos = pos[hit]
 
-    dff = _apply_filters(dff, filters)
+    dff = df.iloc[pos]
+    return dff[dff[col].notna().to_numpy()]
 
-    dff = dff.dropna(subset=[col])
+
+def aggregate_metric(
+    df: pd.DataFrame,
+    metric: str, 
+    filters: Dict[str, Any],
+    name_contains: Optional[str] = None,
+) -> dict:
+    """
+    Agrega por métrica (mean/sum) sobre um subconjunto definido por:
+    - filtros usuais (ano, plataforma, gênero, ...)
+    - e/ou "franquia"/termo no nome (name_contains, case-insensitive)
+    """
+    col = METRICS_MAP[metric]
+    dff = aggregate_frame(df, metric, filters, name_contains)
+    observe_rows("aggregate", len(df), len(dff))
     if dff.empty:
         return {
             "metric": metric,
@@ -173,12 +420,14 @@ def aggregate_metric(
             "sum": None,
         }
 
-    vals = pd.to_numeric(dff[col], errors="coerce").dropna()
+    with stage("aggregate.reduce"):
+        vals = pd.to_numeric(dff[col], errors="coerce").dropna()
+        count, mean, total = int(len(vals)), round(float(vals.mean()), 3), round(float(vals.sum()), 3)
     return {
         "metric": metric,
         "filters": {k: v for k, v in filters.items() if v is not None},
         "name_contains": name_contains,
-        "count": int(len(vals)),
-        "mean": round(float(vals.mean()), 3),
-        "sum": round(float(vals.sum()), 3),
+        "count": count,
+        "mean": mean,
+        "sum": total,
     }
@@ -0,0 +1,199 @@
+import ast
+import math
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .frame_cache import derived
+from .queries import filter_positions, row_to_item
+from ..observability.metrics import observe_rows, stage
+
+SCORE_COLUMNS = {
+    "global_sales": "Global_Sales",
+    "na_sales": "NA_Sales",
+    "eu_sales": "EU_Sales",
+    "jp_sales": "JP_Sales",
+    "other_sales": "Other_Sales",
+    "critic_score": "Critic_Score",
+    "critic_count": "Critic_Count",
+    "user_score": "User_Score",
+    "user_count": "User_Count",
+    "year": "Year_of_Release",
+}
+
+PRESETS = {
+    "sales_x_critic": "global_sales * critic_score / 100",
+    "bayes_user": "bayes(user_score, user_count, 50)",
+    "bayes_critic": "bayes(critic_score, critic_count, 20)",
+}
+
+MAX_EXPR_LEN = 300
+MAX_CACHED_SCORES = 64
+
+_BINOPS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.divide,
+    ast.Pow: np.power,
+}
+
+
+def _bayes(score: np.ndarray, count: np.ndarray, m: Any) -> np.ndarray:
+    """Média bayesiana: (v/(v+m))*R + (m/(v+m))*C, com C = média global de R."""
+    m = float(np.nanmax(np.atleast_1d(m)))
+    c = float(np.nanmean(score)) if np.isfinite(score).any() else math.nan
+    v = np.nan_to_num(count, nan=0.0)
+    return (v / (v + m)) * score + (m / (v + m)) * c
+
+
+_FUNCS: Dict[str, Tuple[int, Callable[..., Any]]] = {
+    "log1p": (1, np.log1p),
+    "sqrt": (1, np.sqrt),
+    "abs": (1, np.abs),
+    "min": (2, np.fmin),
+    "max": (2, np.fmax),
+    "coalesce": (2, lambda x, d: np.where(np.isnan(x), d, x)),
+    "bayes": (3, _bayes),
+}
+
+
+def parse_expression(expr: str) -> ast.Expression:
+    """
+    Valida uma expressão de score: números, colunas de SCORE_COLUMNS, + - * / **, sinais
+    e as funções log1p, sqrt, abs, min, max, coalesce(x, padrão) e bayes(nota, contagem, m).
+    Levanta ValueError para qualquer outra construção.
+    """
+    expr = (expr or "").strip()
+    if not expr:
+        raise ValueError("Expressão vazia")
+    if len(expr) > MAX_EXPR_LEN:
+        raise ValueError(f"Expressão maior que {MAX_EXPR_LEN} caracteres")
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Expressão inválida: {e.msg}") from None
+
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Expression, ast.Load, ast.operator, ast.unaryop)):
+            if isinstance(node, ast.operator) and type(node) not in _BINOPS:
+                raise ValueError(f"Operador não permitido: {type(node).__name__}")
+            if isinstance(node, ast.unaryop) and not isinstance(node, (ast.USub, ast.UAdd)):
+                raise ValueError(f"Operador não permitido: {type(node).__name__}")
+            continue
+        if isinstance(node, (ast.BinOp, ast.UnaryOp)):
+            continue
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            continue
+        if isinstance(node, ast.Name):
+            if node.id not in SCORE_COLUMNS and node.id not in _FUNCS:
+                raise ValueError(f"Coluna desconhecida: {node.id}")
+            continue
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCS or node.keywords:
+                raise ValueError("Só são permitidas as funções: " + ", ".join(_FUNCS))
+            arity = _FUNCS[node.func.id][0]
+            if len(node.args) != arity:
+                raise ValueError(f"{node.func.id}() recebe {arity} argumento(s)")
+            continue
+        raise ValueError(f"Construção não permitida: {type(node).__name__}")
+    return tree
+
+
+def weights_to_expression(weights: str) -> str:
+    """"global_sales:1,critic_score:0.05" -> "1.0 * global_sales + 0.05 * critic_score"."""
+    terms = []
+    for part in (weights or "").split(","):
+        if not part.strip():
+            continue
+        name, _, w = part.partition(":")
+        name = name.strip()
+        if name not in SCORE_COLUMNS:
+            raise ValueError(f"Coluna desconhecida: {name}")
+        try:
+            weight = float(w) if w.strip() else 1.0
+        except ValueError:
+            raise ValueError(f"Peso inválido para {name}: {w}") from None
+        terms.append(f"{weight!r} * {name}")
+    if not terms:
+        raise ValueError("Nenhum peso informado")
+    return " + ".join(terms)
+
+
+def canonical_expression(expr: str) -> str:
+    return ast.unparse(parse_expression(expr))
+
+
+def _evaluate(node: ast.AST, cols: Dict[str, np.ndarray]) -> Any:
+    if isinstance(node, ast.Expression):
+        return _evaluate(node.body, cols)
+    if isinstance(node, ast.Constant):
+        return float(node.value)
+    if isinstance(node, ast.Name):
+        return cols[node.id]
+    if isinstance(node, ast.UnaryOp):
+        v = _evaluate(node.operand, cols)
+        return -v if isinstance(node.op, ast.USub) else v
+    if isinstance(node, ast.BinOp):
+        return _BINOPS[type(node.op)](_evaluate(node.left, cols), _evaluate(node.right, cols))
+    if isinstance(node, ast.Call):
+        return _FUNCS[node.func.id][1](*[_evaluate(a, cols) for a in node.args])
+    raise ValueError(f"Construção não permitida: {type(node).__name__}")
+
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray:
+    return derived(
+        df, ("score_col", name),
+        lambda: pd.to_numeric(df[SCORE_COLUMNS[name]], errors="coerce").to_numpy(dtype=float, na_value=np.nan),
+    )
+
+
+def score_column(df: pd.DataFrame, expr: str) -> Tuple[str, np.ndarray]:
+    """
+    Avalia a expressão (vetorizada em NumPy) sobre o dataset inteiro e guarda o resultado
+    por dataset + expressão canônica, para que rankings repetidos pela mesma fórmula não recalculem.
+    Valores não finitos viram NaN (ficam fora do ranking).
+    """
+    tree = parse_expression(expr)
+    canonical = ast.unparse(tree)
+
+    def _build() -> np.ndarray:
+        with stage("scoring.evaluate"):
+            names = {n.id for n in ast.walk(tree) if isinstance(n, ast.Name) and n.id in SCORE_COLUMNS}
+            cols = {n: _column(df, n) for n in names}
+            with np.errstate(all="ignore"):
+                out = np.broadcast_to(np.asarray(_evaluate(tree, cols), dtype=float), (len(df),)).copy()
+            out[~np.isfinite(out)] = np.nan
+            out.flags.writeable = False
+            return out
+
+    return canonical, derived(df, ("score", canonical), _build, max_entries=MAX_CACHED_SCORES)
+
+
+def score_rankings(
+    df: pd.DataFrame,
+    expr: str,
+    filters: Dict[str, Any],
+    limit: int = 10,
+    offset: int = 0,
+) -> Tuple[str, int, List[dict]]:
+    """
+    Ranking (desc) por um score derivado, com os filtros usuais e paginação.
+    Retorna (expressão canônica, total, items); cada item é um GameItem com o campo `score`.
+    """
+    canonical, scores = score_column(df, expr)
+    pos = filter_positions(df, filters)
+    with stage("scoring.sort"):
+        vals = scores[pos]
+        keep = ~np.isnan(vals)
+        pos, vals = pos[keep], vals[keep]
+        order = np.argsort(-vals, kind="stable")
+        page = order[offset: offset + limit]
+    items = []
+    for p in page:
+        item = row_to_item(df.iloc[pos[p]])
+        item["score"] = round(float(vals[p]), 6)
+        items.append(item)
+    observe_rows("scoring", len(df), len(items))
+    return canonical, int(len(vals)), items
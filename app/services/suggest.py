@@ -1,14 +1,56 @@
-from typing import List
+from typing import List, Optional
+import numpy as np
 import pandas as pd
-from rapidfuzz import process, fuzz
-def suggest_names(df: pd.DataFrame, q: str, limit: int = 10) -> List[str]:
+from ..observability.metrics import observe_rows, stage
+def prefix_matches(df: pd.DataFrame, q: str, candidates: Optional[np.ndarray] = None) -> np.ndarray:
+    """Posições (em ordem do arquivo) dos nomes que começam com `q`, procurando só em `candidates` se informado."""
+    names = df["name_lower"]
+    if candidates is None:
+        return np.flatnonzero(names.str.startswith(q, na=False).to_numpy())
+    return candidates[names.iloc[candidates].str.startswith(q, na=False).to_numpy(dtype=bool)]
+def suggest_names(df: pd.DataFrame, q: str, limit: int = 10, candidates: Optional[np.ndarray] = None) -> List[str]:
+    """
+    Nomes que começam com `q` e, se não chegarem a `limit`, os mais parecidos (fuzzy).
+    `candidates` restringe a busca por prefixo a essas posições (ex.: os resultados de um prefixo
+    mais curto de `q`, que necessariamente contêm os de `q`).
+    """
     q = (q or "").strip().lower()
     if not q:
         return []
-    pref = df.loc[df["name_lower"].str.startswith(q, na=False), "Name"].head(limit).tolist()
+    with stage("suggest.prefix"):
+        hits = prefix_matches(df, q, candidates)
+        pref = df["Name"].iloc[hits[:limit]].tolist()
     if len(pref) >= limit:
-        return pref[:limit]
-    candidates = df["Name"].astype(str).unique().tolist()
-    fuzzed = process.extract(q, candidates, scorer=fuzz.WRatio, limit=limit*2)
+        pref = pref[:limit]
+        observe_rows("suggest", len(df) if candidates is None else len(candidates), len(pref))
+        return pref
+    with stage("suggest.fuzzy"):
+        # rapidfuzz só é importado na primeira busca fuzzy (não pesa no startup)
+        from rapidfuzz import fuzz, process
+
+        pool = df["Name"].astype(str).unique().tolist()
+        fuzzed = process.extract(q, pool, scorer=fuzz.WRatio, limit=limit*2)
     names = [name for name, score, _ in fuzzed if name not in pref]
-    return (pref + names)[:limit]
+    out = (pref + names)[:limit]
+    observe_rows("suggest", len(df) + len(pool), len(out))
+    return out
+class SuggestSession:
+    """
+    Estado de uma conexão de autocomplete (/ws/suggest): guarda as linhas que casam com o último
+    prefixo e, enquanto o usuário continua digitando (o novo termo estende o anterior), procura
+    só entre elas em vez de varrer todos os nomes de novo.
+    """
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._prefix: Optional[str] = None
+        self._hits: Optional[np.ndarray] = None
+    def suggest(self, q: str, limit: int = 10) -> List[str]:
+        q = (q or "").strip().lower()
+        if not q:
+            self._prefix, self._hits = None, None
+            return []
+        narrowed = self._hits if self._prefix is not None and q.startswith(self._prefix) else None
+        with stage("suggest.narrow"):
+            hits = prefix_matches(self.df, q, narrowed)
+        self._prefix, self._hits = q, hits
+        return suggest_names(self.df, q, limit, candidates=hits)
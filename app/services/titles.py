@@ -0,0 +1,167 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .frame_cache import derived
+from .queries import METRICS_MAP, row_to_item
+from ..observability.metrics import observe_rows, stage
+
+_SALES = ["Global_Sales", "NA_Sales", "EU_Sales", "JP_Sales", "Other_Sales"]
+_SCORES = ["Critic_Score", "User_Score"]
+# atributos do título vêm da versão mais vendida
+_LEAD = ["Genre", "Publisher", "Developer", "Rating"]
+_TEXT = {"genre": "Genre", "publisher": "Publisher", "rating": "Rating"}
+
+
+@dataclass(frozen=True)
+class TitleTable:
+    """
+    Uma linha por título (Name), somando vendas e tirando a média das notas das versões de cada
+    plataforma. Guarda a ordem de cada métrica (desc, empates na ordem do arquivo), as colunas de
+    texto em minúsculas para os filtros e, por plataforma, quais títulos saíram nela.
+    """
+    frame: pd.DataFrame
+    orders: Dict[str, np.ndarray]
+    year: np.ndarray
+    text: Dict[str, np.ndarray]
+    platforms: Dict[str, np.ndarray]
+    names: pd.Series
+    index: Dict[str, int]
+    sales_rank: np.ndarray
+
+
+def _build_table(df: pd.DataFrame) -> TitleTable:
+    with stage("titles.build"):
+        d = df[df["Name"].notna()]
+        g = d.groupby("Name", sort=False)
+        frame = pd.concat(
+            [
+                # arredondado: somas de valores com 2 casas não carregam ruído de ponto flutuante
+                g[_SALES].sum(min_count=1).round(4),
+                g[_SCORES].mean().round(3),
+                g["Year_of_Release"].min(),
+                g.size().rename("Releases"),
+            ],
+            axis=1,
+        )
+        by_sales = d.sort_values("Global_Sales", ascending=False, kind="mergesort", na_position="last")
+        lead = by_sales.drop_duplicates("Name").set_index("Name")[_LEAD]
+        plats = by_sales["Platform"].astype(str).groupby(by_sales["Name"], sort=False).agg(list)
+        frame = frame.join(lead).assign(Platforms=plats)
+        frame.index.name = "Name"
+        frame = frame.reset_index()
+
+        orders = {}
+        for metric, col in METRICS_MAP.items():
+            vals = frame[col].to_numpy(dtype=float, na_value=np.nan)
+            ok = np.flatnonzero(~np.isnan(vals))
+            orders[metric] = ok[np.argsort(-vals[ok], kind="mergesort")]
+
+        codes = pd.Index(frame["Name"]).get_indexer(d["Name"])
+        platforms: Dict[str, np.ndarray] = {}
+        for plat, rows in pd.Series(codes).groupby(d["Platform"].astype(str).str.lower().to_numpy()):
+            mask = np.zeros(len(frame), dtype=bool)
+            mask[rows.to_numpy()] = True
+            platforms[plat] = mask
+
+        lower = frame["Name"].astype(str).str.lower()
+        # posição de cada título no ranking de vendas globais (sem vendas: depois de todos)
+        sales_rank = np.full(len(frame), len(frame), dtype=np.int64)
+        sales_rank[orders["global_sales"]] = np.arange(len(orders["global_sales"]))
+        return TitleTable(
+            frame=frame,
+            orders=orders,
+            year=pd.to_numeric(frame["Year_of_Release"], errors="coerce").to_numpy(dtype=float),
+            text={k: frame[c].astype(str).str.lower().to_numpy() for k, c in _TEXT.items()},
+            platforms=platforms,
+            names=lower,
+            index={n: i for i, n in reversed(list(enumerate(lower)))},
+            sales_rank=sales_rank,
+        )
+
+
+def title_table(df: pd.DataFrame) -> TitleTable:
+    """Tabela por título do dataset, construída uma vez (aquecida no startup da API)."""
+    return derived(df, ("titles",), lambda: _build_table(df))
+
+
+def _mask(tt: TitleTable, filters: Dict[str, Any]) -> Optional[np.ndarray]:
+    """
+    Mesma semântica de `_filter_frame`, no nível de título: ano é o do primeiro lançamento,
+    plataforma seleciona os títulos que saíram nela. None quando não há filtro.
+    """
+    mask = None
+
+    def _and(m):
+        nonlocal mask
+        mask = m if mask is None else mask & m
+
+    try:
+        if filters.get("year") is not None:
+            _and(np.round(tt.year) == float(filters["year"]))
+        if filters.get("year_from") is not None:
+            _and(tt.year >= float(filters["year_from"]))
+        if filters.get("year_to") is not None:
+            _and(tt.year <= float(filters["year_to"]))
+    except (TypeError, ValueError):
+        return np.zeros(len(tt.year), dtype=bool)
+    if filters.get("platform"):
+        plat = str(filters["platform"]).lower()
+        _and(tt.platforms.get(plat, np.zeros(len(tt.year), dtype=bool)))
+    for key, values in tt.text.items():
+        if filters.get(key):
+            _and(values == str(filters[key]).lower())
+    return mask
+
+
+def title_to_item(row: pd.Series) -> dict:
+    """Linha da tabela por título no formato `TitleItem`."""
+    item = row_to_item(row)
+    item.pop("platform")
+    item["platforms"] = list(row["Platforms"])
+    item["releases"] = int(row["Releases"])
+    return item
+
+
+def title_rankings(
+    df: pd.DataFrame,
+    metric: str,
+    filters: Dict[str, Any],
+    limit: int = 10,
+    offset: int = 0,
+    columnar: bool = False,
+) -> Tuple[int, Any]:
+    """
+    Rankings no nível de título (vendas somadas entre plataformas, notas pela média).
+    Usa a ordem pré-calculada da métrica: filtrar é só selecionar nela, sem reordenar.
+    """
+    tt = title_table(df)
+    with stage("titles.rankings"):
+        order = tt.orders[metric]
+        mask = _mask(tt, filters)
+        if mask is not None:
+            order = order[mask[order]]
+        page = tt.frame.iloc[order[offset: offset + limit]]
+        items = [title_to_item(row) for _, row in page.iterrows()]
+    observe_rows("rankings.title", len(tt.frame), len(page))
+    if columnar:
+        keys = list(items[0]) if items else ["name", "platforms"]
+        return len(order), {k: [it[k] for it in items] for k in keys}
+    return len(order), items
+
+
+def title_details(df: pd.DataFrame, name: str) -> Optional[dict]:
+    """Mesma busca de `best_match` (exato, depois contém com maior venda global), sobre os títulos."""
+    name_l = (name or "").lower().strip()
+    if not name_l:
+        return None
+    tt = title_table(df)
+    pos = tt.index.get(name_l)
+    if pos is None:
+        with stage("titles.contains"):
+            hits = np.flatnonzero(tt.names.str.contains(name_l, regex=False).to_numpy())
+            if len(hits):
+                pos = int(hits[np.argmin(tt.sales_rank[hits])])
+    return None if pos is None else title_to_item(tt.frame.iloc[pos])
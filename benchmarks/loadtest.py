@@ -0,0 +1,301 @@
+"""
+Gerador de carga que reproduz o mix de requisições do `streamlit_app/Home.py`.
+
+    python -m benchmarks.loadtest --workers 2 --concurrency 1,4,16,64 --duration 20
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --concurrency 8
+
+Sem `--url`, sobe um uvicorn local (`--workers N`) e o derruba ao final. Para cada nível de
+concorrência roda usuários virtuais em loop fechado por `--duration` segundos e reporta
+throughput, latência (p50/p90/p99) e taxa de erro, total e por endpoint. O ponto de saturação é
+o primeiro nível em que o throughput cresce menos que `--saturation-gain` em relação ao anterior.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+try:
+    from websockets.sync.client import connect as ws_connect
+except ImportError:  # sem o pacote, o autocomplete vai pelo HTTP, como na UI
+    ws_connect = None
+
+from app.services.nlq import parse_question
+from benchmarks.run_bench import REPORTS_DIR, _git_commit, summarize
+
+Call = Tuple[str, str, str, Optional[dict], Optional[dict]]  # (label, method, path, params, json); method "WS" = /ws/suggest
+
+SUGGEST_TERMS = ["zelda", "mario", "pokemon", "fifa", "call of duty", "grand theft", "halo", "sonic"]
+DETAIL_NAMES = ["Wii Sports", "Mario Kart Wii", "Grand Theft Auto V", "Super Mario Bros.", "Tetris"]
+FRANCHISES = ["zelda", "mario", "pokemon", "sonic", "final fantasy"]
+ASK_EXAMPLES = [
+    "Quais são os jogos mais vendidos em 2010?",
+    "Top nota crítica no PS3 em 2009",
+    "Top vendas no Japão no Nintendo DS",
+    "Top EU sales em 2015",
+    "Jogos com melhor user score no PC",
+    "Top vendas NA de Sports em 2008",
+    "Mais vendidos no Wii",
+    "Qual a média de nota da franquia Zelda?",
+    "Média do user score da franquia Mario no Wii",
+    "Soma das vendas globais da franquia Pokemon no DS de 2006 a 2010",
+]
+METRICS = ["global_sales", "na_sales", "eu_sales", "jp_sales", "critic_score", "user_score"]
+PLATFORMS = ["PS2", "DS", "PS3", "Wii", "X360", "PSP", "PS", "PC"]
+GENRES = ["Action", "Sports", "Misc", "Role-Playing", "Shooter", "Adventure", "Racing"]
+SUGGEST_MIN_CHARS = 2  # a UI não busca sugestões para termos mais curtos
+YEAR_RANGE = (1980, 2020)  # `year_range` do overview, usado pela UI quando não há filtro de ano
+
+
+def _years(rng: random.Random) -> List[int]:
+    y0 = rng.choice([1995, 2000, 2005])
+    return list(range(y0, min(y0 + rng.choice([10, 15, 20]), 2016) + 1))
+
+
+def panorama(rng: random.Random) -> List[Call]:
+    """Aba Panorama: bootstrap + Top 10 (/charts/rankings) + "Evolução do Top 1 por ano" (/charts/top-by-year)."""
+    years = _years(rng)
+    return [
+        ("meta", "GET", "/meta/bootstrap", None, None),
+        ("charts", "GET", "/charts/rankings", {"metric": "global_sales", "limit": 10, "extra": "platform,genre,year"}, None),
+        ("charts", "GET", "/charts/top-by-year", {"metric": "global_sales", "year_from": years[0], "year_to": years[-1]}, None),
+    ]
+
+
+def rankings_tab(rng: random.Random) -> List[Call]:
+    params: Dict[str, Any] = {"metric": rng.choice(METRICS), "limit": rng.choice([10, 20, 50])}
+    if rng.random() < 0.5:
+        params["year"] = rng.randint(2000, 2015)
+    if rng.random() < 0.5:
+        params["platform"] = rng.choice(PLATFORMS)
+    if rng.random() < 0.3:
+        params["genre"] = rng.choice(GENRES)
+    return [("rankings", "GET", "/rankings/games", params, None)]
+
+
+def explore(rng: random.Random) -> List[Call]:
+    """
+    Aba Explorar: um suggest por "tecla" digitada (pelo WebSocket /ws/suggest, como a UI; HTTP se
+    o pacote websockets não estiver instalado) e o detalhe da sugestão escolhida.
+    """
+    term = rng.choice(SUGGEST_TERMS)
+    if ws_connect is not None:
+        suggest = [("suggest_ws", "WS", "/ws/suggest", {"q": term[:i], "limit": 10}, None)
+                   for i in range(SUGGEST_MIN_CHARS, len(term) + 1)]
+    else:
+        suggest = [("suggest", "GET", "/games/suggest", {"q": term[:i], "limit": 10}, None)
+                   for i in range(SUGGEST_MIN_CHARS, len(term) + 1)]
+    calls: List[Call] = suggest
+    calls.append(("details", "GET", f"/games/{rng.choice(DETAIL_NAMES)}", None, None))
+    calls.append(("details", "GET", f"/games/{term}", None, None))
+    return calls
+
+
+def franchises(rng: random.Random) -> List[Call]:
+    """Aba Franquias: agregado + "Evolução anual (soma)" (/charts/aggregate-by-year), em paralelo na UI."""
+    term = rng.choice(FRANCHISES)
+    metric = rng.choice(["critic_score", "user_score", "global_sales"])
+    params: Dict[str, Any] = {"metric": metric, "franchise": term}
+    if rng.random() < 0.3:
+        params["platform"] = rng.choice(PLATFORMS)
+    series = {**params, "agg": "sum", "year_from": YEAR_RANGE[0], "year_to": YEAR_RANGE[1]}
+    return [
+        ("aggregate", "GET", "/stats/aggregate", params, None),
+        ("charts", "GET", "/charts/aggregate-by-year", series, None),
+    ]
+
+
+def ask(rng: random.Random) -> List[Call]:
+    """Aba Perguntas: /ask e, nas perguntas de agregado, a série anual do termo."""
+    question = rng.choice(ASK_EXAMPLES)
+    calls: List[Call] = [("ask", "POST", "/ask", None, {"question": question})]
+    parsed = parse_question(question)
+    if parsed.get("mode") == "aggregate":
+        params = {k: v for k, v in (parsed.get("filters") or {}).items() if k not in ("year", "year_from", "year_to")}
+        params.update({"metric": parsed["metric"], "franchise": parsed.get("name_contains"), "agg": "sum",
+                       "year_from": YEAR_RANGE[0], "year_to": YEAR_RANGE[1]})
+        calls.append(("charts", "GET", "/charts/aggregate-by-year", params, None))
+    return calls
+
+
+ACTIONS: List[Tuple[Callable[[random.Random], List[Call]], float]] = [
+    (panorama, 0.15),
+    (rankings_tab, 0.30),
+    (explore, 0.30),
+    (franchises, 0.10),
+    (ask, 0.15),
+]
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def add(self, label: str, seconds: float, ok: bool) -> None:
+        with self.lock:
+            self.latencies[label].append(seconds)
+            if not ok:
+                self.errors[label] += 1
+
+
+def _ws_request(base_url: str, conn, path: str, params: dict, timeout: float):
+    """Uma mensagem no WebSocket do usuário virtual (aberto na primeira, como a sessão da UI). Retorna (ok, conexão)."""
+    try:
+        if conn is None:
+            conn = ws_connect(base_url.replace("http", "ws", 1) + path, open_timeout=timeout)
+        conn.send(json.dumps(params))
+        json.loads(conn.recv(timeout=timeout))
+        return True, conn
+    except Exception:
+        if conn is not None:
+            conn.close()
+        return False, None
+
+
+def _virtual_user(base_url: str, deadline: float, rec: Recorder, seed: int, timeout: float) -> None:
+    rng = random.Random(seed)
+    session = requests.Session()
+    ws = None
+    funcs, weights = zip(*ACTIONS)
+    try:
+        while time.perf_counter() < deadline:
+            action = rng.choices(funcs, weights=weights)[0]
+            for label, method, path, params, payload in action(rng):
+                if time.perf_counter() >= deadline:
+                    return
+                t0 = time.perf_counter()
+                if method == "WS":
+                    ok, ws = _ws_request(base_url, ws, path, params, timeout)
+                else:
+                    try:
+                        r = session.request(method, base_url + path, params=params, json=payload, timeout=timeout)
+                        ok = r.status_code < 400
+                    except requests.RequestException:
+                        ok = False
+                rec.add(label, time.perf_counter() - t0, ok)
+    finally:
+        if ws is not None:
+            ws.close()
+
+
+def run_level(base_url: str, concurrency: int, duration: float, seed: int, timeout: float) -> Dict[str, Any]:
+    rec = Recorder()
+    deadline = time.perf_counter() + duration
+    t0 = time.perf_counter()
+    threads = [
+        threading.Thread(target=_virtual_user, args=(base_url, deadline, rec, seed + i, timeout), daemon=True)
+        for i in range(concurrency)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    all_lat = [v for vals in rec.latencies.values() for v in vals]
+    total_err = sum(rec.errors.values())
+    overall = summarize(all_lat, total_err, wall)
+    overall["error_rate"] = round(total_err / len(all_lat), 4) if all_lat else 0.0
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(wall, 2),
+        "overall": overall,
+        "endpoints": {k: summarize(v, rec.errors.get(k, 0), wall) for k, v in sorted(rec.latencies.items())},
+    }
+
+
+def find_saturation(levels: List[Dict[str, Any]], min_gain: float) -> Optional[int]:
+    for prev, cur in zip(levels, levels[1:]):
+        if cur["overall"]["rps"] < prev["overall"]["rps"] * (1.0 + min_gain):
+            return prev["concurrency"]
+    return None
+
+
+def _start_server(workers: int, port: int, data_path: Optional[str]) -> subprocess.Popen:
+    env = dict(os.environ)
+    if data_path:
+        env["DATA_PATH"] = data_path
+    cmd = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+           "--workers", str(workers), "--log-level", "warning"]
+    return subprocess.Popen(cmd, env=env)
+
+
+def _wait_healthy(base_url: str, timeout: float = 120.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(base_url + "/readyz", timeout=2).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"API não ficou pronta em {timeout}s: {base_url}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", default=None, help="API já em execução (senão sobe uma local)")
+    ap.add_argument("--workers", type=int, default=1, help="workers do uvicorn local")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--data", default=None, help="DATA_PATH do servidor local (ex.: catálogo sintético)")
+    ap.add_argument("--concurrency", default="1,2,4,8,16,32")
+    ap.add_argument("--duration", type=float, default=15.0)
+    ap.add_argument("--timeout", type=float, default=12.0)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--saturation-gain", type=float, default=0.10)
+    ap.add_argument("--out", type=Path, default=None)
+    args = ap.parse_args()
+
+    server = None
+    base_url = (args.url or f"http://127.0.0.1:{args.port}").rstrip("/")
+    if not args.url:
+        server = _start_server(args.workers, args.port, args.data)
+    try:
+        _wait_healthy(base_url)
+        levels = []
+        for c in [int(x) for x in args.concurrency.split(",") if x.strip()]:
+            res = run_level(base_url, c, args.duration, args.seed, args.timeout)
+            o = res["overall"]
+            print(f"c={c:<4} {o['rps']:>8.1f} req/s  p50={o['p50_ms']:>8.1f}ms  p99={o['p99_ms']:>8.1f}ms  "
+                  f"erros={o['error_rate']:.2%}", flush=True)
+            levels.append(res)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    sat = find_saturation(levels, args.saturation_gain)
+    print(f"\nSaturação: {'c=' + str(sat) if sat else 'não atingida nos níveis testados'}")
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "url": base_url,
+            "workers": None if args.url else args.workers,
+            "data_path": args.data,
+            "duration_s": args.duration,
+            "seed": args.seed,
+            "mix": {f.__name__: w for f, w in ACTIONS},
+        },
+        "saturation_concurrency": sat,
+        "levels": levels,
+    }
+    out = args.out or REPORTS_DIR / f"load_{_git_commit()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Resultado salvo em {out}")
+
+
+if __name__ == "__main__":
+    main()
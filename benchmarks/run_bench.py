@@ -0,0 +1,203 @@
+"""
+Benchmark dos endpoints da API sobre catálogos sintéticos em 1x/10x/100x.
+
+    python -m benchmarks.run_bench                       # escalas 1,10,100
+    python -m benchmarks.run_bench --scales 1,10 -n 50   # mais rápido
+    python -m benchmarks.run_bench --compare reports/bench_a.json reports/bench_b.json
+
+Cada escala roda num subprocesso com DATA_PATH apontando para o CSV da escala (o dataset é
+carregado uma vez por processo, como na API). O cache de resultados da API fica desligado
+(RESULT_CACHE_SIZE=0; `--result-cache N` religa): senão, depois do warmup toda iteração sairia
+do cache e o benchmark não mediria a consulta. O resultado vai para um JSON em `reports/`.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPORTS_DIR = Path("reports")
+
+CASES: List[Dict[str, Any]] = [
+    {"name": "meta_bootstrap", "method": "GET", "path": "/meta/bootstrap"},
+    {"name": "meta_platforms", "method": "GET", "path": "/meta/platforms"},
+    {"name": "meta_genres", "method": "GET", "path": "/meta/genres"},
+    {"name": "meta_years", "method": "GET", "path": "/meta/years"},
+    {"name": "stats_overview", "method": "GET", "path": "/stats/overview"},
+    {"name": "rankings_top10", "method": "GET", "path": "/rankings/games", "params": {"metric": "global_sales", "limit": 10}},
+    {"name": "rankings_year", "method": "GET", "path": "/rankings/games", "params": {"metric": "global_sales", "year": 2008, "limit": 10}},
+    {"name": "rankings_combined", "method": "GET", "path": "/rankings/games",
+     "params": {"metric": "critic_score", "platform": "PS3", "genre": "Action", "year_from": 2006, "year_to": 2012, "limit": 50}},
+    {"name": "rankings_page100", "method": "GET", "path": "/rankings/games", "params": {"metric": "na_sales", "limit": 100, "offset": 200}},
+    {"name": "aggregate_term", "method": "GET", "path": "/stats/aggregate", "params": {"metric": "critic_score", "name_contains": "zelda"}},
+    {"name": "aggregate_term_filters", "method": "GET", "path": "/stats/aggregate",
+     "params": {"metric": "global_sales", "name_contains": "mario", "platform": "Wii", "year_from": 2006, "year_to": 2010}},
+    {"name": "suggest_prefix", "method": "GET", "path": "/games/suggest", "params": {"q": "super", "limit": 10}},
+    {"name": "suggest_fuzzy", "method": "GET", "path": "/games/suggest", "params": {"q": "zeldda", "limit": 10}},
+    {"name": "details_exact", "method": "GET", "path": "/games/Wii Sports"},
+    {"name": "details_partial", "method": "GET", "path": "/games/ocarina"},
+    {"name": "ask_rankings", "method": "POST", "path": "/ask", "json": {"question": "Quais são os jogos mais vendidos em 2010?"}},
+    {"name": "ask_aggregate", "method": "POST", "path": "/ask", "json": {"question": "Qual a média de nota da franquia Zelda?"}},
+]
+
+
+def _percentile(sorted_vals: List[float], p: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = (len(sorted_vals) - 1) * p / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (k - lo)
+
+
+def summarize(latencies: List[float], errors: int, wall: float) -> Dict[str, Any]:
+    """Latências em segundos -> p50/p90/p99/mean/max (ms) e throughput (req/s)."""
+    vals = sorted(latencies)
+    ms = lambda v: round(v * 1000.0, 3)
+    return {
+        "n": len(vals),
+        "errors": errors,
+        "p50_ms": ms(_percentile(vals, 50)),
+        "p90_ms": ms(_percentile(vals, 90)),
+        "p99_ms": ms(_percentile(vals, 99)),
+        "mean_ms": ms(sum(vals) / len(vals)) if vals else 0.0,
+        "max_ms": ms(vals[-1]) if vals else 0.0,
+        "rps": round(len(vals) / wall, 2) if wall > 0 else 0.0,
+    }
+
+
+def run_worker(data_path: str, iterations: int, warmup: int) -> Dict[str, Any]:
+    os.environ["DATA_PATH"] = data_path
+    t0 = time.perf_counter()
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.deps import get_df
+    from app.lifecycle import warmup as app_warmup
+
+    with TestClient(app) as client:
+        # o startup não bloqueia: espera o warmup terminar para medir a carga e não disputar CPU com ele
+        if not app_warmup.wait(600):
+            raise RuntimeError(f"warmup não ficou pronto: {app_warmup.status()}")
+        load_seconds = time.perf_counter() - t0
+        rows = len(get_df())
+        endpoints: Dict[str, Any] = {}
+        for case in CASES:
+            def call():
+                return client.request(case["method"], case["path"], params=case.get("params"), json=case.get("json"))
+
+            for _ in range(warmup):
+                call()
+            lat, errors = [], 0
+            w0 = time.perf_counter()
+            for _ in range(iterations):
+                s = time.perf_counter()
+                r = call()
+                lat.append(time.perf_counter() - s)
+                if r.status_code >= 400:
+                    errors += 1
+            endpoints[case["name"]] = {
+                "method": case["method"],
+                "path": case["path"],
+                "params": case.get("params") or case.get("json"),
+                **summarize(lat, errors, time.perf_counter() - w0),
+            }
+    return {"rows": rows, "startup_seconds": round(load_seconds, 3), "endpoints": endpoints}
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def run(scales: List[int], iterations: int, warmup: int, seed: int, out: Path, result_cache: int = 0) -> Path:
+    from benchmarks.synthetic import ensure_catalogue
+    import numpy, pandas
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pandas.__version__,
+            "numpy": numpy.__version__,
+            "machine": platform.platform(),
+            "iterations": iterations,
+            "warmup": warmup,
+            "seed": seed,
+            "result_cache_size": result_cache,
+        },
+        "scales": {},
+    }
+    for scale in scales:
+        path = ensure_catalogue(scale, seed)
+        print(f"[x{scale}] {path}", flush=True)
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.run_bench", "--worker", str(path), "-n", str(iterations), "--warmup", str(warmup)],
+            capture_output=True, text=True, check=True,
+            env={**os.environ, "RESULT_CACHE_SIZE": str(result_cache)},
+        )
+        res = json.loads(proc.stdout.strip().splitlines()[-1])
+        report["scales"][str(scale)] = res
+        for name, r in res["endpoints"].items():
+            print(f"  {name:<24} p50={r['p50_ms']:>9.2f}ms p99={r['p99_ms']:>9.2f}ms {r['rps']:>8.1f} req/s", flush=True)
+
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nResultado salvo em {out}")
+    return out
+
+
+def compare(base_path: Path, new_path: Path, threshold: float) -> int:
+    """Compara dois relatórios; retorna 1 se algum p50/p99 piorou mais que `threshold`x."""
+    base = json.loads(base_path.read_text(encoding="utf-8"))
+    new = json.loads(new_path.read_text(encoding="utf-8"))
+    print(f"base={base['meta']['commit']} new={new['meta']['commit']}")
+    regressions = 0
+    for scale, sres in new["scales"].items():
+        bres = base["scales"].get(scale)
+        if not bres:
+            continue
+        for name, r in sres["endpoints"].items():
+            b = bres["endpoints"].get(name)
+            if not b:
+                continue
+            ratios = {k: (r[k] / b[k]) if b[k] else 1.0 for k in ("p50_ms", "p99_ms")}
+            flag = any(v > threshold for v in ratios.values())
+            regressions += flag
+            print(f"x{scale:<4} {name:<24} p50 {ratios['p50_ms']:>5.2f}x  p99 {ratios['p99_ms']:>5.2f}x {'  <-- regressão' if flag else ''}")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scales", default="1,10,100")
+    ap.add_argument("-n", "--iterations", type=int, default=200)
+    ap.add_argument("--warmup", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--result-cache", type=int, default=0, help="RESULT_CACHE_SIZE dos workers (0 = sem cache)")
+    ap.add_argument("--out", type=Path, default=None)
+    ap.add_argument("--worker", metavar="DATA_PATH", help=argparse.SUPPRESS)
+    ap.add_argument("--compare", nargs=2, type=Path, metavar=("BASE", "NEW"))
+    ap.add_argument("--threshold", type=float, default=1.2)
+    args = ap.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.iterations, args.warmup)))
+        return
+    if args.compare:
+        sys.exit(compare(args.compare[0], args.compare[1], args.threshold))
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    out = args.out or REPORTS_DIR / f"bench_{_git_commit()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    run(scales, args.iterations, args.warmup, args.seed, out, result_cache=args.result_cache)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Mede o tempo de subida da API, do spawn do processo até a primeira resposta 200 de
+`/healthz` (liveness) e de `/readyz` (readiness: dataset e estruturas derivadas carregados).
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --scale 10 --backend duckdb
+
+Cada rodada sobe um uvicorn novo e o derruba ao final; o relatório traz os tempos de cada
+rodada, o resumo (min/mediana/máx) e os estágios do warmup informados pelo próprio /readyz.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import requests
+
+from benchmarks.run_bench import REPORTS_DIR, _git_commit
+from benchmarks.synthetic import ensure_catalogue
+
+
+def _poll(session: requests.Session, url: str) -> Optional[requests.Response]:
+    try:
+        return session.get(url, timeout=1)
+    except requests.RequestException:
+        return None
+
+
+def measure_once(port: int, env: Dict[str, str], timeout: float, interval: float) -> Dict[str, Any]:
+    cmd = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+           "--log-level", "warning"]
+    base = f"http://127.0.0.1:{port}"
+    session = requests.Session()
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd, env=env)
+    out: Dict[str, Any] = {"healthy_s": None, "ready_s": None}
+    try:
+        deadline = t0 + timeout
+        while time.perf_counter() < deadline:
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn saiu com código {proc.returncode}")
+            if out["healthy_s"] is None:
+                r = _poll(session, base + "/healthz")
+                if r is not None and r.status_code == 200:
+                    out["healthy_s"] = round(time.perf_counter() - t0, 4)
+            if out["healthy_s"] is not None:
+                r = _poll(session, base + "/readyz")
+                if r is not None and r.status_code == 200:
+                    out["ready_s"] = round(time.perf_counter() - t0, 4)
+                    out["server"] = r.json()
+                    break
+            time.sleep(interval)
+        else:
+            raise RuntimeError(f"API não ficou pronta em {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+    return out
+
+
+def _summary(values) -> Dict[str, float]:
+    return {"min": min(values), "median": round(statistics.median(values), 4), "max": max(values)}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--port", type=int, default=8766)
+    ap.add_argument("--scale", type=int, default=1, help="catálogo sintético N vezes o original (1 = dataset real)")
+    ap.add_argument("--data", default=None, help="DATA_PATH explícito (tem precedência sobre --scale)")
+    ap.add_argument("--backend", default=None, help="DATA_BACKEND do servidor (pandas|duckdb)")
+    ap.add_argument("--timeout", type=float, default=120.0)
+    ap.add_argument("--interval-ms", type=float, default=5.0)
+    ap.add_argument("--out", type=Path, default=None)
+    args = ap.parse_args()
+
+    env = dict(os.environ)
+    data_path = args.data or (str(ensure_catalogue(scale=args.scale)) if args.scale > 1 else None)
+    if data_path:
+        env["DATA_PATH"] = data_path
+    if args.backend:
+        env["DATA_BACKEND"] = args.backend
+
+    runs = []
+    for i in range(args.runs):
+        res = measure_once(args.port, env, args.timeout, args.interval_ms / 1000.0)
+        print(f"rodada {i + 1}: healthz={res['healthy_s'] * 1000:>7.0f}ms  readyz={res['ready_s'] * 1000:>7.0f}ms  "
+              f"warmup={res['server'].get('warmup_s', 0) * 1000:>6.0f}ms", flush=True)
+        runs.append(res)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "data_path": data_path,
+            "backend": args.backend or env.get("DATA_BACKEND", "pandas"),
+            "runs": args.runs,
+        },
+        "healthy_s": _summary([r["healthy_s"] for r in runs]),
+        "ready_s": _summary([r["ready_s"] for r in runs]),
+        "runs": runs,
+    }
+    print(f"\nhealthz mediana {report['healthy_s']['median'] * 1000:.0f}ms | "
+          f"readyz mediana {report['ready_s']['median'] * 1000:.0f}ms")
+    out = args.out or REPORTS_DIR / f"startup_{_git_commit()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Resultado salvo em {out}")
+
+
+if __name__ == "__main__":
+    main()
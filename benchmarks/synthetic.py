@@ -0,0 +1,75 @@
+"""
+Gera catálogos sintéticos com o mesmo schema de `EXPECTED_COLS`, em múltiplos do dataset real.
+
+    python -m benchmarks.synthetic --scale 10 --out benchmarks/.data/base_jogos_x10.csv
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.config import DATA_PATH
+from app.services.dataset import EXPECTED_COLS, load_dataset
+
+DATA_DIR = Path(__file__).parent / ".data"
+SALES_COLS = ["NA_Sales", "EU_Sales", "JP_Sales", "Other_Sales"]
+
+
+def make_catalogue(base: pd.DataFrame, scale: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Replica o dataset `scale` vezes. A cópia 0 é o original; as demais recebem sufixo no nome
+    (" #k"), vendas com ruído log-normal, notas com ruído e ano deslocado em até ±2.
+    """
+    base = base[EXPECTED_COLS].reset_index(drop=True)
+    if scale <= 1:
+        return base.copy()
+
+    rng = np.random.default_rng(seed)
+    n = len(base)
+    parts = [base]
+    years = pd.to_numeric(base["Year_of_Release"], errors="coerce")
+    y_min, y_max = years.min(), years.max()
+
+    for k in range(1, scale):
+        c = base.copy()
+        c["Name"] = c["Name"].astype(str) + f" #{k}"
+        factor = rng.lognormal(0.0, 0.35, n)
+        for col in SALES_COLS:
+            c[col] = (pd.to_numeric(c[col], errors="coerce") * factor).round(2)
+        c["Global_Sales"] = c[SALES_COLS].sum(axis=1, min_count=1).round(2)
+        c["Critic_Score"] = (pd.to_numeric(c["Critic_Score"], errors="coerce") + rng.normal(0, 3, n)).clip(0, 100).round(0)
+        c["User_Score"] = (pd.to_numeric(c["User_Score"], errors="coerce") + rng.normal(0, 0.4, n)).clip(0, 10).round(1)
+        c["Year_of_Release"] = (years + rng.integers(-2, 3, n)).clip(y_min, y_max).astype("Int64")
+        parts.append(c)
+
+    return pd.concat(parts, ignore_index=True)
+
+
+def ensure_catalogue(scale: int, seed: int = 42, source: str = DATA_PATH) -> Path:
+    """Gera (uma vez) e devolve o caminho do CSV sintético para a escala pedida."""
+    if scale <= 1:
+        return Path(source)
+    path = DATA_DIR / f"base_jogos_x{scale}_s{seed}.csv"
+    if not path.exists():
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        make_catalogue(load_dataset(source), scale, seed).to_csv(path, index=False)
+    return path
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--scale", type=int, default=10)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--out", type=Path, default=None)
+    args = ap.parse_args()
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        make_catalogue(load_dataset(DATA_PATH), args.scale, args.seed).to_csv(args.out, index=False)
+        print(args.out)
+    else:
+        print(ensure_catalogue(args.scale, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,22 @@
 import os
+import hashlib
+import io
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 import streamlit as st
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+try:
+    from websockets.sync.client import connect as ws_connect
+except Exception:
+    ws_connect = None
 
 def get_api_url():
     if "API_URL" not in st.session_state:
@@ -16,35 +30,297 @@ API_URL = st.session_state.API_URL
 
 st.title("🎮 IA Games — Dashboard e Busca")
 
-def fetch_json(path, params=None, method="GET", payload=None, api_url=None, timeout=12):
-    base = api_url or API_URL
-    url = f"{base}{path}"
+MAX_CONCURRENCY = int(os.getenv("API_MAX_CONCURRENCY", "8"))
+
+@st.cache_resource(show_spinner=False)
+def get_http_session() -> requests.Session:
+    """Sessão HTTP compartilhada (keep-alive + pool de conexões) entre reruns e sessões."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(MAX_CONCURRENCY, 10))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_resource(show_spinner=False)
+def get_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="api-fanout")
+
+# TTL (s) por prefixo de endpoint; vale o prefixo mais longo que casar. 0 = não cacheia.
+CACHE_TTLS = {
+    "/meta/": 600,
+    "/stats/overview": 600,
+    "/games/suggest": 600,
+    "/games/": 900,
+    "/rankings/games": 120,
+    "/stats/aggregate": 300,
+    "/charts/": 300,
+    "/ask": 120,
+}
+CACHE_MAX_ENTRIES = int(os.getenv("UI_CACHE_MAX_ENTRIES", "512"))
+SUGGEST_MIN_CHARS = 2
+SUGGEST_DEBOUNCE_S = float(os.getenv("UI_SUGGEST_DEBOUNCE_S", "0.3"))
+
+class ResponseCache:
+    """LRU limitado com expiração por entrada; seguro para uso a partir das threads do fan-out."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return None
+            expires, value = hit
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value, ttl: float):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+@st.cache_resource(show_spinner=False)
+def get_response_cache() -> ResponseCache:
+    return ResponseCache(CACHE_MAX_ENTRIES)
+
+def _cache_ttl(path: str) -> float:
+    best = ""
+    for prefix in CACHE_TTLS:
+        if path.startswith(prefix) and len(prefix) > len(best):
+            best = prefix
+    return CACHE_TTLS.get(best, 0)
+
+def _cache_key(url, params, payload):
+    return (url, json.dumps(params or {}, sort_keys=True, default=str), json.dumps(payload or {}, sort_keys=True, default=str))
+
+RETRY_AFTER_MAX_S = 5.0
+
+def _request_json(session, url, params=None, method="GET", payload=None, timeout=12):
+    """
+    Faz a chamada e devolve (json, erro). Não usa `st.*`, então pode rodar fora da thread do script.
+    Um 429 (limite de requisições da API) é repetido uma vez, depois do Retry-After (até RETRY_AFTER_MAX_S).
+    """
     try:
-        if method.upper() == "GET":
-            r = requests.get(url, params=params, timeout=timeout)
-        else:
-            r = requests.post(url, json=payload, timeout=timeout)
+        for attempt in range(2):
+            if method.upper() == "GET":
+                r = session.get(url, params=params, timeout=timeout)
+            else:
+                r = session.post(url, json=payload, timeout=timeout)
+            if r.status_code != 429 or attempt:
+                break
+            try:
+                wait = float(r.headers.get("Retry-After", "1"))
+            except ValueError:
+                wait = 1.0
+            if wait > RETRY_AFTER_MAX_S:
+                break
+            time.sleep(wait)
         r.raise_for_status()
-        return r.json()
+        return r.json(), None
     except requests.exceptions.RequestException as e:
-        st.error(f"Falha ao chamar {url}: {e}")
+        return None, f"Falha ao chamar {url}: {e}"
+
+def _cached_request_json(session, cache, path, url, params=None, method="GET", payload=None, timeout=12):
+    """`_request_json` com o cache de respostas (todas as chamadas da UI são de leitura, inclusive o POST /ask)."""
+    ttl = _cache_ttl(path)
+    key = _cache_key(url, params, payload) if ttl else None
+    if key is not None:
+        hit = cache.get(key)
+        if hit is not None:
+            return hit, None
+    data, err = _request_json(session, url, params=params, method=method, payload=payload, timeout=timeout)
+    if key is not None and err is None and data is not None:
+        cache.put(key, data, ttl)
+    return data, err
+
+def fetch_json(path, params=None, method="GET", payload=None, api_url=None, timeout=12):
+    url = f"{api_url or API_URL}{path}"
+    data, err = _cached_request_json(
+        get_http_session(), get_response_cache(), path, url,
+        params=params, method=method, payload=payload, timeout=timeout,
+    )
+    if err:
+        st.error(err)
+    return data
+
+def fetch_many(calls, api_url=None, timeout=12):
+    """
+    Dispara várias chamadas GET em paralelo (concorrência limitada por API_MAX_CONCURRENCY)
+    e devolve os resultados na mesma ordem. `calls` é uma lista de (path, params).
+    """
+    session, cache, executor, base = get_http_session(), get_response_cache(), get_executor(), api_url or API_URL
+    futures = [
+        executor.submit(_cached_request_json, session, cache, path, f"{base}{path}", params, "GET", None, timeout)
+        for path, params in calls
+    ]
+    results, errors = [], []
+    for f in futures:
+        data, err = f.result()
+        results.append(data)
+        if err:
+            errors.append(err)
+    if errors:
+        st.error(f"{errors[0]}" + (f" (+{len(errors) - 1} falhas)" if len(errors) > 1 else ""))
+    return results
+
+CHART_CACHE_MAX_ENTRIES = int(os.getenv("UI_CHART_CACHE_MAX_ENTRIES", "64"))
+
+@st.cache_data(show_spinner=False, max_entries=CHART_CACHE_MAX_ENTRIES)
+def render_chart(kind: str, x: tuple, y: tuple, xlabel: str, ylabel: str) -> bytes:
+    """
+    PNG de um gráfico simples (`barh`, `bar` ou `line`), cacheado pelos dados e rótulos: reruns com
+    os mesmos dados reaproveitam a imagem em vez de redesenhar. Usa `Figure` direto (sem pyplot),
+    então nenhuma figura fica presa no registro global do matplotlib; o cache é limitado a
+    CHART_CACHE_MAX_ENTRIES imagens.
+    """
+    fig = Figure()
+    ax = fig.subplots()
+    if kind == "barh":
+        ax.barh(x, y)
+    elif kind == "bar":
+        ax.bar(x, y)
+    else:
+        ax.plot(x, y, marker="o")
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=100, bbox_inches="tight")
+    fig.clear()
+    return buf.getvalue()
+
+def show_chart(kind: str, x, y, xlabel: str, ylabel: str):
+    st.image(render_chart(kind, tuple(x), tuple(y), xlabel, ylabel), width="stretch")
+
+def suggest_ws(q: str, limit: int = 10):
+    """
+    Autocomplete pelo WebSocket /ws/suggest: uma conexão por sessão do navegador, reaproveitada
+    entre reruns (o servidor estreita os candidatos conforme o termo cresce). Devolve None se o
+    WebSocket não estiver disponível, para o chamador cair no HTTP.
+    """
+    if ws_connect is None:
+        return None
+    for _ in range(2):
+        conn = st.session_state.get("_suggest_ws")
+        try:
+            if conn is None:
+                url = API_URL.replace("http", "ws", 1).rstrip("/") + "/ws/suggest"
+                conn = ws_connect(url, open_timeout=2)
+                st.session_state["_suggest_ws"] = conn
+            req_id = st.session_state.get("_suggest_ws_id", 0) + 1
+            st.session_state["_suggest_ws_id"] = req_id
+            conn.send(json.dumps({"q": q, "limit": limit, "id": req_id}))
+            # respostas de termos anteriores ainda em voo são ignoradas
+            while True:
+                msg = json.loads(conn.recv(timeout=5))
+                if msg.get("id") == req_id:
+                    return msg.get("items") or []
+        except Exception:
+            st.session_state.pop("_suggest_ws", None)
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+    return None
+
+def suggest_debounced(q: str, limit: int = 10):
+    """
+    Autocomplete com debounce: ignora termos curtos e, se a última busca foi há menos de
+    SUGGEST_DEBOUNCE_S, espera o restante da janela antes de chamar a API. Se o usuário digitar
+    de novo nesse intervalo, o Streamlit interrompe este rerun no próximo elemento (o placeholder)
+    e a chamada obsoleta nunca é feita. Respostas já em cache saem sem espera; com o WebSocket
+    disponível, a busca vai por ele, sem debounce.
+    """
+    q = (q or "").strip()
+    if len(q) < SUGGEST_MIN_CHARS:
+        return []
+    params = {"q": q, "limit": limit}
+    cached = get_response_cache().get(_cache_key(f"{API_URL}/games/suggest", params, None))
+    if cached is not None:
+        return cached.get("items") or []
+
+    items = suggest_ws(q, limit)
+    if items is not None:
+        return items
+
+    wait = SUGGEST_DEBOUNCE_S - (time.monotonic() - st.session_state.get("_suggest_last_ts", 0.0))
+    if wait > 0:
+        time.sleep(wait)
+        st.empty()
+    st.session_state["_suggest_last_ts"] = time.monotonic()
+    resp = fetch_json("/games/suggest", params=params)
+    return (resp or {}).get("items") or []
+
+META_CACHE_DIR = Path(os.getenv("UI_META_CACHE_DIR", str(Path.home() / ".cache" / "ia_games")))
+META_REFRESH_S = float(os.getenv("UI_META_REFRESH_S", "300"))
+
+def _meta_cache_path(api_url: str) -> Path:
+    return META_CACHE_DIR / f"meta_{hashlib.sha1(api_url.encode('utf-8')).hexdigest()[:12]}.json"
+
+def _read_persisted_meta(api_url: str):
+    try:
+        return json.loads(_meta_cache_path(api_url).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def _persist_meta(api_url: str, entry: dict) -> None:
+    path = _meta_cache_path(api_url)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+def fetch_meta_snapshot(api_url: str):
+    """
+    Snapshot versionado de /meta/bootstrap (plataformas, gêneros, anos e overview), persistido em
+    disco para sobreviver a restarts da UI. Dentro de UI_META_REFRESH_S não faz nenhuma chamada;
+    depois revalida com If-None-Match (304 = só renova o timestamp). Se a API falhar, usa a cópia local.
+    """
+    entry = _read_persisted_meta(api_url)
+    if entry and time.time() - entry.get("fetched_at", 0) < META_REFRESH_S:
+        return entry.get("data")
+
+    headers = {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else {}
+    try:
+        r = get_http_session().get(f"{api_url}/meta/bootstrap", headers=headers, timeout=12)
+        if r.status_code == 304 and entry:
+            entry["fetched_at"] = time.time()
+            _persist_meta(api_url, entry)
+            return entry.get("data")
+        r.raise_for_status()
+        entry = {"etag": r.headers.get("ETag"), "fetched_at": time.time(), "data": r.json()}
+        _persist_meta(api_url, entry)
+        return entry["data"]
+    except (requests.exceptions.RequestException, ValueError) as e:
+        if entry:
+            return entry.get("data")
+        st.error(f"Falha ao chamar {api_url}/meta/bootstrap: {e}")
         return None
 
 @st.cache_data(ttl=300, show_spinner=False)
 def load_overview(api_url: str):
-    return fetch_json("/stats/overview", api_url=api_url)
+    snap = fetch_meta_snapshot(api_url) or {}
+    return snap.get("overview") or fetch_json("/stats/overview", api_url=api_url)
 
 @st.cache_data(ttl=300, show_spinner=False)
 def bootstrap_meta(api_url: str):
     """
-    Tenta ler plataformas/genres de endpoints 'meta' (se existirem).
-    Caso não existam, coleta a partir de /rankings/games paginando por offset.
+    Plataformas/gêneros do snapshot de metadados (uma chamada, ou nenhuma com a cópia local).
     Também retorna anos possíveis a partir do overview.
     """
-    platforms: set[str] = set()
-    genres: set[str] = set()
-
-    ov = load_overview(api_url) or {}
+    snap = fetch_meta_snapshot(api_url) or {}
+    ov = snap.get("overview") or {}
     yr = ov.get("year_range") or [2000, 2015]
     years = []
     try:
@@ -56,39 +332,10 @@ def bootstrap_meta(api_url: str):
     except Exception:
         years = list(range(2000, 2016))
 
-    meta_plat = fetch_json("/meta/platforms", api_url=api_url)
-    if meta_plat and isinstance(meta_plat, dict):
-        arr = meta_plat.get("items") or meta_plat.get("platforms") or []
-        for p in arr:
-            if p: platforms.add(str(p))
-
-    meta_gen = fetch_json("/meta/genres", api_url=api_url)
-    if meta_gen and isinstance(meta_gen, dict):
-        arr = meta_gen.get("items") or meta_gen.get("genres") or []
-        for g in arr:
-            if g: genres.add(str(g))
-
-    if not platforms or not genres:
-        LIMIT = 100
-        for offset in range(0, 1000, LIMIT):
-            params = {"metric": "global_sales", "limit": LIMIT, "offset": offset}
-            data = fetch_json("/rankings/games", params=params, api_url=api_url)
-            items = (data or {}).get("items") or []
-            if not items:
-                break
-            for it in items:
-                p = it.get("platform")
-                g = it.get("genre")
-                if p: platforms.add(str(p))
-                if g: genres.add(str(g))
-
-    plats = sorted(platforms) if platforms else []
-    gens = sorted(genres) if genres else []
-
     return {
         "years": years,
-        "platforms": plats,
-        "genres": gens,
+        "platforms": sorted(str(p) for p in snap.get("platforms") or [] if p),
+        "genres": sorted(str(g) for g in snap.get("genres") or [] if g),
     }
 
 tab1, tab2, tab3, tab4, tab5 = st.tabs(["Panorama", "Rankings", "Explorar", "Franquias/Agregados", "Perguntas (NLQ)"])
@@ -108,19 +355,22 @@ with tab1:
         st.divider()
 
         st.markdown("### 🏆 Top 10 por **vendas globais**")
-        res_top = fetch_json("/rankings/games", params={"metric": "global_sales", "limit": 10})
-        items_top = (res_top or {}).get("items") or []
-        if items_top:
-            df_top = pd.DataFrame(items_top)
-            cols_keep = [c for c in ["name", "platform", "genre", "global_sales", "year"] if c in df_top.columns]
-            st.dataframe(df_top[cols_keep], width="stretch")
-            fig = plt.figure()
-            names = df_top["name"][:10][::-1]
-            vals = df_top["global_sales"][:10][::-1]
-            plt.barh(names, vals)
-            plt.xlabel("Vendas globais (milhões)")
-            plt.ylabel("Jogo")
-            st.pyplot(fig)
+        res_top = fetch_json(
+            "/charts/rankings",
+            params={"metric": "global_sales", "limit": 10, "extra": "platform,genre,year"},
+        ) or {}
+        names_top = res_top.get("labels") or []
+        if names_top:
+            cols_top = res_top.get("columns") or {}
+            vals_top = res_top.get("values") or []
+            st.dataframe({
+                "name": names_top,
+                "platform": cols_top.get("platform"),
+                "genre": cols_top.get("genre"),
+                "global_sales": vals_top,
+                "year": cols_top.get("year"),
+            }, width="stretch")
+            show_chart("barh", names_top[::-1], vals_top[::-1], "Vendas globais (milhões)", "Jogo")
         else:
             st.info("Sem dados para o Top 10.")
 
@@ -133,18 +383,13 @@ with tab1:
         year_from = col_a.number_input("Ano inicial", value=default_start, step=1)
         year_to = col_b.number_input("Ano final", value=default_end, step=1)
         if year_from <= year_to:
-            years = list(range(int(year_from), int(year_to) + 1))
-            vals = []
-            for y in years:
-                r = fetch_json("/rankings/games", params={"metric": "global_sales", "year": y, "limit": 1})
-                items_y = (r or {}).get("items") or []
-                v = items_y[0].get("global_sales", 0) if items_y else 0
-                vals.append(v or 0)
-            fig2 = plt.figure()
-            plt.plot(years, vals, marker="o")
-            plt.xlabel("Ano")
-            plt.ylabel("Vendas do Top 1 (mi)")
-            st.pyplot(fig2)
+            series = fetch_json(
+                "/charts/top-by-year",
+                params={"metric": "global_sales", "year_from": int(year_from), "year_to": int(year_to)},
+            ) or {}
+            years = series.get("x") or list(range(int(year_from), int(year_to) + 1))
+            vals = series.get("y") or [0] * len(years)
+            show_chart("line", years, vals, "Ano", "Vendas do Top 1 (mi)")
 
 with tab2:
     st.subheader("Rankings de jogos")
@@ -188,11 +433,7 @@ with tab2:
         df = pd.DataFrame(items)
         st.dataframe(df, width="stretch")
         if metric in df.columns and not df.empty:
-            fig = plt.figure()
-            plt.barh(df["name"][:10][::-1], df[metric][:10][::-1])
-            plt.xlabel(metric)
-            plt.ylabel("Jogo")
-            st.pyplot(fig)
+            show_chart("barh", df["name"][:10][::-1], df[metric][:10][::-1], metric, "Jogo")
     else:
         st.info("Nenhum resultado para os filtros atuais.")
 
@@ -200,10 +441,7 @@ with tab3:
     st.subheader("Explorar com autocomplete")
     query = st.text_input("Digite parte do nome do jogo", placeholder="ex.: zelda, mario, fifa...")
 
-    suggestions = []
-    if query.strip():
-        resp = fetch_json("/games/suggest", params={"q": query.strip(), "limit": 10})
-        suggestions = (resp or {}).get("items") or []
+    suggestions = suggest_debounced(query, limit=10)
 
     selected = None
     if suggestions:
@@ -240,13 +478,9 @@ with tab3:
             reg_items = [(k, v) for k, v in regions.items() if v is not None]
             if reg_items:
                 st.markdown("#### Vendas por região (mi)")
-                fig = plt.figure()
                 labels = [k for k, _ in reg_items]
                 values = [v for _, v in reg_items]
-                plt.bar(labels, values)
-                plt.xlabel("Região")
-                plt.ylabel("Vendas (mi)")
-                st.pyplot(fig)
+                show_chart("bar", labels, values, "Região", "Vendas (mi)")
 
             df_detail = pd.DataFrame([{
                 "name": d.get("name"),
@@ -290,7 +524,7 @@ with tab4:
         if not term:
             st.warning("Digite um termo/franquia (ex.: zelda, mario).")
         else:
-            params = {"metric": metric, "name_contains": term}
+            params = {"metric": metric, "franchise": term}
             if sel_plat != "Sem filtro": params["platform"] = sel_plat
             if sel_genre != "Sem filtro": params["genre"] = sel_genre
 
@@ -308,7 +542,20 @@ with tab4:
             if y_from_val is not None: params["year_from"] = y_from_val
             if y_to_val is not None: params["year_to"] = y_to_val
 
-            agg = fetch_json("/stats/aggregate", params=params)
+            ov2 = load_overview(API_URL) or {}
+            yr2 = ov2.get("year_range") or [2000, 2015]
+            y_start = y_from_val if y_from_val is not None else int(yr2[0] or 2000)
+            y_end = y_to_val if y_to_val is not None else int(yr2[1] or y_start)
+
+            if y_start > y_end:
+                y_start, y_end = y_end, y_start
+
+            series_params = {k: v for k, v in params.items() if k not in ("year_from", "year_to")}
+            series_params.update({"agg": "sum", "year_from": y_start, "year_to": y_end})
+            agg, series = fetch_many([
+                ("/stats/aggregate", params),
+                ("/charts/aggregate-by-year", series_params),
+            ])
             if agg:
                 c1, c2, c3 = st.columns(3)
                 c1.metric("Qtd. títulos", agg.get("count", 0))
@@ -318,30 +565,11 @@ with tab4:
                 st.divider()
                 st.markdown("### Evolução anual (soma)")
 
-                ov2 = load_overview(API_URL) or {}
-                yr2 = ov2.get("year_range") or [2000, 2015]
-                y_start = y_from_val if y_from_val is not None else int(yr2[0] or 2000)
-                y_end = y_to_val if y_to_val is not None else int(yr2[1] or y_start)
-
-                if y_start > y_end:
-                    y_start, y_end = y_end, y_start
-
-                years_plot, sums_plot = [], []
-                for y in range(y_start, y_end + 1):
-                    p = dict(params)
-                    p.pop("year_from", None)
-                    p.pop("year_to", None)
-                    p["year"] = y
-                    r = fetch_json("/stats/aggregate", params=p) or {}
-                    years_plot.append(y)
-                    sums_plot.append(r.get("sum") or 0)
+                years_plot = (series or {}).get("x") or []
+                sums_plot = (series or {}).get("y") or []
 
                 if years_plot:
-                    fig = plt.figure()
-                    plt.plot(years_plot, sums_plot, marker="o")
-                    plt.xlabel("Ano")
-                    plt.ylabel(f"Soma anual de {metric}")
-                    st.pyplot(fig)
+                    show_chart("line", years_plot, sums_plot, "Ano", f"Soma anual de {metric}")
             else:
                 st.info("Sem dados para os filtros informados.")
 
@@ -400,18 +628,14 @@ with tab5:
             ov = load_overview(API_URL) or {}
             yr = ov.get("year_range") or [2000, 2015]
             y0 = int(yr[0] or 2000); y1 = int(yr[1] or y0)
-            years, sums = [], []
-            for y in range(y0, y1 + 1):
-                p = {"metric": metric, "name_contains": name_contains, **filters, "year": y}
-                r = fetch_json("/stats/aggregate", params=p) or {}
-                years.append(y); sums.append(r.get("sum") or 0)
+            p = {k: v for k, v in filters.items() if k not in ("year", "year_from", "year_to")}
+            p.update({"metric": metric, "franchise": name_contains, "agg": "sum", "year_from": y0, "year_to": y1})
+            series = fetch_json("/charts/aggregate-by-year", params=p) or {}
+            years = series.get("x") or []
+            sums = series.get("y") or []
 
             st.markdown("##### Evolução anual (soma)")
-            fig = plt.figure()
-            plt.plot(years, sums, marker="o")
-            plt.xlabel("Ano")
-            plt.ylabel(f"Soma anual de {metric}")
-            st.pyplot(fig)
+            show_chart("line", years, sums, "Ano", f"Soma anual de {metric}")
         else:
             items = res.get("items") or []
             if items:
@@ -421,11 +645,7 @@ with tab5:
                 metric = (parsed.get("metric") or "global_sales")
                 if metric in df.columns and not df.empty:
                     st.markdown("##### Top N (gráfico)")
-                    fig = plt.figure()
-                    plt.barh(df["name"][:10][::-1], df[metric][:10][::-1])
-                    plt.xlabel(metric)
-                    plt.ylabel("Jogo")
-                    st.pyplot(fig)
+                    show_chart("barh", df["name"][:10][::-1], df[metric][:10][::-1], metric, "Jogo")
             else:
                 st.info("Sem resultados para a pergunta.")
 
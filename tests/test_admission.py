@@ -0,0 +1,78 @@
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.access_log import normalize_key, replay
+
+from app.admission import AdmissionMiddleware, TokenBuckets, route_cost, DEFAULT_COSTS
+from app.main import app
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_route_costs():
+    assert route_cost("/games/suggest", DEFAULT_COSTS) == ("/games/suggest", 2.0)
+    assert route_cost("/games/Halo 3", DEFAULT_COSTS) == ("/games/", 1.0)
+    assert route_cost("/meta/genres", DEFAULT_COSTS)[1] < route_cost("/stats/aggregate", DEFAULT_COSTS)[1]
+    assert route_cost("/healthz", DEFAULT_COSTS)[1] == 0
+
+
+def test_token_bucket_queue_and_refill():
+    clock = _Clock()
+    tb = TokenBuckets(rate=2.0, burst=4.0, clock=clock)
+    assert tb.reserve("a", 2.0, max_wait=1.0) == 0
+    assert tb.reserve("a", 2.0, max_wait=1.0) == 0
+    assert tb.reserve("a", 2.0, max_wait=1.0) == 1.0  # entra na fila do cliente
+    assert tb.reserve("a", 2.0, max_wait=1.0) is None  # passaria do limite de espera
+    assert tb.reserve("b", 2.0, max_wait=0.0) == 0  # outro cliente não é afetado
+    clock.now = 10.0
+    assert tb.reserve("a", 4.0, max_wait=0.0) == 0
+
+
+def test_bucket_memory_is_bounded():
+    tb = TokenBuckets(rate=1.0, burst=1.0, max_clients=3, clock=_Clock())
+    for i in range(10):
+        tb.reserve(f"c{i}", 1.0, max_wait=0.0)
+    assert len(tb._buckets) == 3
+
+
+def test_middleware_rejects_with_retry_after():
+    limited = TestClient(AdmissionMiddleware(app, rate=1.0, burst=4.0, max_wait=0.0))
+    params = {"metric": "critic_score", "genre": "Shooter"}
+    assert limited.get("/stats/aggregate", params=params).status_code == 200
+    assert limited.get("/stats/aggregate", params=params).status_code == 200
+    r = limited.get("/stats/aggregate", params=params)
+    assert r.status_code == 429
+    assert int(r.headers["retry-after"]) >= 1
+    assert limited.get("/healthz").status_code == 200
+    # o header do pré-aquecimento vem do cliente: não isenta a requisição
+    assert limited.get("/stats/aggregate", params=params, headers={"x-prewarm": "1"}).status_code == 429
+
+    metrics = TestClient(app).get("/metrics").text
+    assert 'ia_games_admission_rejected_total{route="/stats/aggregate"}' in metrics
+
+
+def test_prewarm_replay_is_exempt():
+    limited = AdmissionMiddleware(app, rate=1.0, burst=1.0, max_wait=0.0)
+    keys = [normalize_key("GET", "/stats/aggregate", {"metric": "critic_score", "year": y}) for y in (2001, 2002, 2003)]
+    assert replay(limited, keys)["ok"] == 3
+
+
+def test_websocket_messages_are_charged():
+    limited = TestClient(AdmissionMiddleware(app, rate=0.001, burst=4.0, max_wait=0.0))
+    with limited.websocket_connect("/ws/suggest") as ws:  # conexão: 2 tokens
+        ws.send_json({"q": "mario", "id": 1})  # mensagem: 2 tokens
+        assert ws.receive_json()["id"] == 1
+        ws.send_json({"q": "zelda", "id": 2})
+        with pytest.raises(WebSocketDisconnect) as exc:
+            ws.receive_json()
+        assert exc.value.code == 1008
+    with pytest.raises(WebSocketDisconnect):
+        with limited.websocket_connect("/ws/suggest"):
+            pass
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.arrow_io import ARROW_STREAM
+
+pa = pytest.importorskip("pyarrow")
+client = TestClient(app)
+ARROW = {"Accept": ARROW_STREAM}
+
+
+def _read(resp):
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == ARROW_STREAM
+    return pa.ipc.open_stream(resp.content).read_all()
+
+
+def test_rankings_arrow_matches_json():
+    params = {"metric": "global_sales", "year": 2008, "limit": 25}
+    table = _read(client.get("/rankings/games", params=params, headers=ARROW))
+    rows = client.get("/rankings/games", params=params).json()
+
+    meta = json.loads(table.schema.metadata[b"ia_games"])
+    assert meta["total"] == rows["total"]
+    assert table.column_names == list(rows["items"][0].keys())
+    assert table.to_pylist() == rows["items"]
+    assert pa.types.is_floating(table.schema.field("global_sales").type)
+
+
+def test_aggregate_and_group_by_arrow():
+    params = {"metric": "critic_score", "name_contains": "zelda"}
+    agg = _read(client.get("/stats/aggregate", params=params, headers=ARROW)).to_pylist()[0]
+    assert agg["count"] == client.get("/stats/aggregate", params=params).json()["count"]
+
+    series = _read(client.get("/charts/aggregate-by-year", params=params, headers=ARROW))
+    assert series.column_names == ["year", "value"]
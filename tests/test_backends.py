@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.config import DATA_PATH
+from app.deps import get_df
+from app.services.backends import create_backend
+from app.services.backends.pandas_backend import PandasBackend
+from app.services.meta import build_meta_snapshot
+from app.services.queries import METRICS_MAP
+
+duckdb = pytest.importorskip("duckdb")
+
+FILTERS = [
+    {},
+    {"year": 2010},
+    {"platform": "GEN"},
+    {"genre": "role-playing", "year_from": 2000, "year_to": 2005},
+    {"publisher": "Nintendo", "rating": "E"},
+    {"year": "abc"},
+]
+
+
+@pytest.fixture(scope="module")
+def backends():
+    return PandasBackend(get_df()), create_backend("duckdb", DATA_PATH, get_df)
+
+
+def test_duckdb_matches_pandas(backends):
+    pb, db = backends
+    assert db.overview() == pb.overview()
+    for metric in METRICS_MAP:
+        for filters in FILTERS:
+            for limit, offset, columnar in ((10, 0, False), (50, 30, True), (5, 100000, False)):
+                assert db.rankings(metric, filters, limit, offset, columnar) == pb.rankings(
+                    metric, filters, limit, offset, columnar
+                )
+            for term in (None, "mario", "dr. mario"):
+                assert db.aggregate_metric(metric, filters, term) == pb.aggregate_metric(metric, filters, term)
+    for name in ("Wii Sports", "mario", "call of duty", "xyz123"):
+        assert db.best_match(name) == pb.best_match(name)
+
+
+def test_duckdb_meta_snapshot_matches_pandas(backends):
+    pb, db = backends
+    assert db.rows == pb.rows
+    snaps = [build_meta_snapshot(b.dimensions(), b.overview()) for b in (pb, db)]
+    assert snaps[0].payloads == snaps[1].payloads
+
+
+def test_duckdb_warmup_skips_dataframe(monkeypatch):
+    from app import main
+
+    monkeypatch.setattr(main, "DATA_BACKEND", "duckdb")
+    assert [name for name, _ in main._warmup_steps()] == ["backend", "meta"]
+
+
+def test_duckdb_concurrent_queries(backends):
+    pb, db = backends
+    expected = pb.rankings("critic_score", {"genre": "Shooter"}, 20, 0)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: db.rankings("critic_score", {"genre": "Shooter"}, 20, 0), range(32)))
+    assert all(r == expected for r in results)
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        create_backend("sqlite", DATA_PATH, get_df)
@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.charts import lttb
+
+client = TestClient(app)
+
+
+def test_top_by_year_matches_per_year_rankings():
+    series = client.get("/charts/top-by-year", params={"metric": "global_sales", "year_from": 2004, "year_to": 2008}).json()
+    assert series["x"] == list(range(2004, 2009))
+    for y, v in zip(series["x"], series["y"]):
+        items = client.get("/rankings/games", params={"metric": "global_sales", "year": y, "limit": 1}).json()["items"]
+        assert v == (items[0]["global_sales"] if items else 0)
+
+
+def test_aggregate_by_year_matches_per_year_aggregates():
+    params = {"metric": "global_sales", "name_contains": "mario", "platform": "Wii"}
+    series = client.get("/charts/aggregate-by-year", params={**params, "year_from": 2006, "year_to": 2010}).json()
+    for y, v in zip(series["x"], series["y"]):
+        agg = client.get("/stats/aggregate", params={**params, "year": y}).json()
+        assert v == (agg["sum"] or 0)
+
+
+def test_ranking_chart_is_columnar_and_ordered():
+    chart = client.get("/charts/rankings", params={"metric": "critic_score", "limit": 5, "extra": "platform"}).json()
+    ranked = client.get("/rankings/games", params={"metric": "critic_score", "limit": 5}).json()["items"]
+    assert chart["values"] == [it["critic_score"] for it in ranked]
+    assert len(chart["labels"]) == len(chart["columns"]["platform"]) == 5
+
+
+def test_lttb_keeps_endpoints_and_size():
+    x = list(range(100))
+    y = [(i % 7) * (1 if i != 50 else 100) for i in x]
+    idx = lttb(x, y, 10)
+    assert len(idx) == 10 and idx[0] == 0 and idx[-1] == 99
+    assert 50 in idx
@@ -0,0 +1,54 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.compression import CompressionMiddleware, brotli, choose_encoding
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_choose_encoding_respects_q_values():
+    assert choose_encoding("gzip;q=0, identity") is None
+    assert choose_encoding("gzip, deflate") == "gzip"
+    if brotli is not None:
+        assert choose_encoding("gzip, br") == "br"
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br"])
+def test_large_list_responses_are_compressed(encoding):
+    if encoding == "br" and brotli is None:
+        pytest.skip("brotli não instalado")
+    plain = client.get("/rankings/games", params={"limit": 100}, headers={"Accept-Encoding": "identity"})
+    r = client.get("/rankings/games", params={"limit": 100}, headers={"Accept-Encoding": encoding})
+    assert r.headers["content-encoding"] == encoding
+    assert int(r.headers["content-length"]) < len(plain.content)
+    assert r.json() == plain.json()
+
+
+def test_small_responses_are_not_compressed():
+    r = client.get("/healthz", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in r.headers
+
+
+def test_streaming_responses_are_compressed_incrementally():
+    toy = FastAPI()
+    toy.add_middleware(CompressionMiddleware, minimum_size=10)
+
+    @toy.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a" * 1000, b"b" * 1000]), media_type="text/plain")
+
+    r = TestClient(toy).get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.text == "a" * 1000 + "b" * 1000
+
+
+def test_columnar_format_matches_rows():
+    params = {"metric": "critic_score", "platform": "PS3", "limit": 20}
+    rows = client.get("/rankings/games", params=params).json()
+    cols = client.get("/rankings/games", params={**params, "format": "columnar"}).json()
+    assert cols["format"] == "columnar" and cols["total"] == rows["total"]
+    rebuilt = [dict(zip(cols["items"], vals)) for vals in zip(*cols["items"].values())]
+    assert rebuilt == rows["items"]
@@ -0,0 +1,43 @@
+from fastapi.testclient import TestClient
+
+from app.deps import get_df
+from app.main import app
+from app.services import distribution
+from app.services.distribution import exact_distribution
+from app.services.queries import aggregate_frame
+
+client = TestClient(app)
+
+
+def test_sketch_distribution_close_to_exact():
+    params = {"metric": "critic_score", "genre": "Shooter", "year_from": 2005, "distribution": "true"}
+    r = client.get("/stats/aggregate", params=params)
+    assert r.status_code == 200
+    data = r.json()
+    dist = data["distribution"]
+    assert dist["method"] == "sketch"
+
+    filters = {"genre": "Shooter", "year_from": 2005}
+    exact = exact_distribution(aggregate_frame(get_df(), "critic_score", filters)["Critic_Score"], "critic_score")
+    assert data["count"] == exact["count"]
+    assert data["mean"] == exact["mean"]
+    for q in ("p25", "median", "p75", "p90"):
+        assert abs(dist[q] - exact["distribution"][q]) <= 1.0
+    assert dist["histogram"] == exact["distribution"]["histogram"]
+    assert sum(dist["histogram"]["counts"]) == data["count"]
+
+
+def test_sketch_path_does_not_scan_rows(monkeypatch):
+    monkeypatch.setattr(distribution, "aggregate_frame", lambda *a, **k: (_ for _ in ()).throw(AssertionError))
+    r = client.get("/stats/aggregate", params={"metric": "user_score", "platform": "Wii", "distribution": "true"})
+    assert r.status_code == 200
+    assert r.json()["distribution"]["method"] == "sketch"
+
+
+def test_name_or_publisher_falls_back_to_exact():
+    for params in ({"name_contains": "mario"}, {"publisher": "Nintendo"}):
+        r = client.get("/stats/aggregate", params={"metric": "global_sales", "distribution": "true", **params})
+        assert r.status_code == 200
+        assert r.json()["distribution"]["method"] == "exact"
+    plain = client.get("/stats/aggregate", params={"metric": "global_sales", "name_contains": "mario"}).json()
+    assert "distribution" not in plain
@@ -0,0 +1,57 @@
+from fastapi.testclient import TestClient
+
+from app import deps
+from app.deps import get_df
+from app.main import app
+from app.services import queries
+from app.services.queries import _filter_frame, plan_filters
+
+client = TestClient(app)
+
+
+def _reference(df, filters):
+    out = df
+    ycol = df["Year_of_Release"].astype(float)
+    if filters.get("year") is not None:
+        out = out[ycol.loc[out.index].round(0) == float(filters["year"])]
+    if filters.get("year_from") is not None:
+        out = out[ycol.loc[out.index] >= float(filters["year_from"])]
+    for key in ("platform", "genre", "publisher", "rating"):
+        if filters.get(key):
+            out = out[out[key.capitalize()].astype(str).str.lower() == str(filters[key]).lower()]
+    return out
+
+
+def test_plan_orders_by_selectivity_and_keeps_results():
+    df = get_df()
+    filters = {"platform": "PS2", "publisher": "Electronic Arts", "year_from": 2003}
+    plan = plan_filters(df, filters)
+    assert [p.label.split()[0] for p in plan] == ["publisher", "platform", "year"]
+    assert [p.estimate for p in plan] == sorted(p.estimate for p in plan)
+    assert _filter_frame(df, filters).index.equals(_reference(df, filters).index)
+
+    for f in ({"genre": "shooter", "year": 2010}, {"rating": "M", "platform": "x360"}, {}):
+        assert _filter_frame(df, f).index.equals(_reference(df, f).index)
+    assert _filter_frame(df, {"year": "abc"}).empty
+
+
+def test_explain_short_circuits(monkeypatch):
+    monkeypatch.setattr(deps, "ADMIN_TOKEN", "s3cret")
+    params = {"platform": "Wii", "publisher": "Nao Existe", "year_from": 2000}
+    assert client.get("/admin/explain", params=params).status_code == 403
+    data = client.get("/admin/explain", params=params, headers={"X-Admin-Token": "s3cret"}).json()
+    assert data["result"] == 0
+    first, *rest = data["steps"]
+    assert first["predicate"] == "publisher = nao existe" and first["estimated"] == 0 and first["actual"] == 0
+    assert rest and all(s["skipped"] for s in rest)
+
+
+def test_name_filter_reuses_planner_stats(monkeypatch):
+    df = get_df()
+    filters = {"platform": "Wii", "year_from": 2006}
+    expected = queries.aggregate_frame(df, "global_sales", filters, "mario")
+    # com o termo no nome, os filtros ainda rodam no DataFrame base: nada de refatorar um subconjunto
+    monkeypatch.setattr(queries.pd, "factorize", lambda *a, **k: (_ for _ in ()).throw(AssertionError))
+    dff = queries.aggregate_frame(df, "global_sales", filters, "mario")
+    assert dff.index.equals(expected.index) and len(dff) > 0
+    assert dff["Name"].str.lower().str.contains("mario").all()
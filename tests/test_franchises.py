@@ -0,0 +1,110 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.deps import get_df
+from app.main import app
+from app.services import franchises
+from app.services.charts import aggregate_by_year_chart
+from app.services.franchises import franchise_key, franchise_table, resolve
+from app.services.queries import aggregate_metric
+
+client = TestClient(app)
+
+
+def test_franchise_key():
+    plats = frozenset({"wii", "ds"})
+    assert franchise_key("The Legend of Zelda: Ocarina of Time", plats) == "legend of zelda"
+    assert franchise_key("Super Mario Bros. 3", plats) == "super mario bros"
+    assert franchise_key("Mario Kart Wii", plats) == "mario kart"
+    assert franchise_key("Pokémon Red/Pokémon Blue", plats) == "pokemon red"
+    assert franchise_key("Final Fantasy VII", plats) == "final fantasy"
+
+
+def test_franchise_aggregate_matches_rows():
+    df = get_df()
+    ids = resolve(df, "zelda")
+    assert "legend of zelda" in franchise_table(df).franchises(ids)
+    sub = df.iloc[franchise_table(df).rows(ids)]
+    for params in ({}, {"year_from": 2005}, {"platform": "Wii"}):
+        data = client.get("/stats/aggregate", params={"metric": "critic_score", "franchise": "zelda", **params}).json()
+        assert data["matched_by"] == "franchise"
+        ref = aggregate_metric(sub, "critic_score", params)
+        assert (data["count"], data["mean"], data["sum"]) == (ref["count"], ref["mean"], ref["sum"])
+
+
+def test_franchise_series_matches_rows():
+    df = get_df()
+    sub = df.iloc[franchise_table(df).rows(resolve(df, "mario"))]
+    params = {"metric": "global_sales", "franchise": "mario", "agg": "mean", "year_from": 1985, "year_to": 2015}
+    data = client.get("/charts/aggregate-by-year", params=params).json()
+    ref = aggregate_by_year_chart(sub, "global_sales", {}, year_from=1985, year_to=2015, agg="mean")
+    assert data["matched_by"] == "franchise"
+    assert len(data["y"]) == len(ref["y"])
+    for a, b in zip(data["y"], ref["y"]):
+        # somas por título e depois por ano: só o arredondamento da última casa pode diferir
+        assert (a is None and b is None) or abs(a - b) <= 0.001 + 1e-9
+
+
+def test_franchise_rows_match_title_words():
+    df = get_df()
+    table = franchise_table(df)
+    lower = df["Name"].str.lower()
+    for term in ("zelda", "final fantasy", "call of duty", "fifa"):
+        rows = table.rows(resolve(df, term))
+        hits = np.flatnonzero(lower.str.contains(term, regex=False, na=False).to_numpy())
+        assert set(hits.tolist()) == set(rows.tolist()), term
+    # "Crisis Core: Final Fantasy VII" tem chave própria, mas entra em "final fantasy"
+    assert "crisis core" in table.franchises(resolve(df, "final fantasy"))
+
+
+def test_franchise_does_not_pull_whole_franchises():
+    df = get_df()
+    table = franchise_table(df)
+    zelda = df["Name"].iloc[table.rows(resolve(df, "zelda"))]
+    assert not zelda.str.contains("Mario").any()
+    assert not df["Name"].iloc[table.rows(resolve(df, "sonic"))].str.contains("Budokai").any()
+    assert df["Name"].iloc[table.rows(resolve(df, "mario"))].str.lower().str.contains("mario").all()
+    assert len(resolve(df, "sonic")) and not len(resolve(df, "soni"))
+
+
+def test_ask_uses_franchise_path():
+    r = client.post("/ask", json={"question": "Qual a média de nota da franquia Zelda?"}).json()
+    assert r["aggregate"]["matched_by"] == "franchise"
+    ref = client.get("/stats/aggregate", params={"metric": r["parsed"]["metric"], "name_contains": "zelda"}).json()
+    assert (r["aggregate"]["count"], r["aggregate"]["sum"]) == (ref["count"], ref["sum"])
+
+
+def test_lookup_does_not_scan_names(monkeypatch):
+    get_df()
+    client.get("/franchises")
+    monkeypatch.setattr(franchises, "aggregate_frame", lambda *a, **k: (_ for _ in ()).throw(AssertionError))
+    r = client.get("/stats/aggregate", params={"metric": "global_sales", "franchise": "pokemon", "year": 2006})
+    assert r.status_code == 200
+    assert r.json()["count"] > 0
+
+
+def test_unknown_term_falls_back_to_substring():
+    data = client.get("/stats/aggregate", params={"metric": "global_sales", "franchise": "okem"}).json()
+    ref = client.get("/stats/aggregate", params={"metric": "global_sales", "name_contains": "okem"}).json()
+    assert data["matched_by"] == "name"
+    assert (data["count"], data["sum"]) == (ref["count"], ref["sum"])
+
+    r = client.get("/stats/aggregate", params={"franchise": "zelda", "name_contains": "zelda"})
+    assert r.status_code == 422
+
+
+def test_list_franchises():
+    data = client.get("/franchises", params={"q": "final fantasy", "limit": 5}).json()
+    assert data["total"] >= 1
+    assert "final fantasy" in [it["franchise"] for it in data["items"]]
+    sales = [it["global_sales"] for it in data["items"]]
+    assert sales == sorted(sales, reverse=True)
+
+
+def test_resolve_is_cached(monkeypatch):
+    from app import main
+
+    client.get("/stats/aggregate", params={"metric": "global_sales", "franchise": "Final  Fantasy"})
+    monkeypatch.setattr(main, "resolve", lambda *a, **k: (_ for _ in ()).throw(AssertionError))
+    r = client.get("/charts/aggregate-by-year", params={"metric": "global_sales", "franchise": "final fantasy"})
+    assert r.status_code == 200 and r.json()["matched_by"] == "franchise"
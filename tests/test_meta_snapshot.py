@@ -0,0 +1,25 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_bootstrap_matches_individual_meta_endpoints():
+    boot = client.get("/meta/bootstrap")
+    assert boot.status_code == 200
+    data = boot.json()
+
+    assert data["platforms"] == client.get("/meta/platforms").json()["items"]
+    assert data["genres"] == client.get("/meta/genres").json()["items"]
+    assert data["years"] == client.get("/meta/years").json()["items"]
+    assert data["overview"] == client.get("/stats/overview").json()
+    assert data["version"]
+
+
+def test_meta_etag_conditional_request():
+    r = client.get("/meta/bootstrap")
+    etag = r.headers["etag"]
+    r2 = client.get("/meta/bootstrap", headers={"If-None-Match": etag})
+    assert r2.status_code == 304
+    assert r2.content == b""
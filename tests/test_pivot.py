@@ -0,0 +1,44 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.deps import get_df
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_pivot_matches_pivot_table():
+    params = {"rows": "platform", "cols": "year", "metrics": "na_sales,jp_sales", "genre": "Action"}
+    r = client.get("/stats/pivot", params=params)
+    assert r.status_code == 200
+    data = r.json()
+    df = get_df()
+    sub = df[df["Genre"] == "Action"]
+    for metric, col in (("na_sales", "NA_Sales"), ("jp_sales", "JP_Sales")):
+        ref = sub.pivot_table(index="Platform", columns="Year_of_Release", values=col, aggfunc="sum")
+        ref = ref.reindex(index=data["rows"]["labels"], columns=data["cols"]["labels"]).fillna(0)
+        assert np.allclose(np.array(data["matrix"][metric]), ref.to_numpy())
+
+
+def test_pivot_mean_and_count():
+    params = {"rows": "genre", "cols": "rating", "metrics": "critic_score"}
+    mean = client.get("/stats/pivot", params={**params, "agg": "mean"}).json()
+    count = client.get("/stats/pivot", params={**params, "agg": "count"}).json()
+    i = mean["rows"]["labels"].index("Shooter")
+    j = mean["cols"]["labels"].index("M")
+    agg = client.get("/stats/aggregate", params={"metric": "critic_score", "genre": "Shooter", "rating": "M"}).json()
+    assert mean["matrix"]["critic_score"][i][j] == agg["mean"]
+    assert count["matrix"]["critic_score"][i][j] == agg["count"]
+
+
+def test_pivot_cardinality_cap():
+    r = client.get("/stats/pivot", params={"rows": "publisher", "cols": "year"})
+    assert r.status_code == 422
+
+    data = client.get("/stats/pivot", params={"rows": "publisher", "cols": "year", "max_rows": 5}).json()
+    assert len(data["rows"]["labels"]) == 6 and data["rows"]["labels"][-1] == "Outros"
+    df = get_df()
+    total = sum(map(sum, data["matrix"]["global_sales"]))
+    assert abs(total - df.loc[df["Year_of_Release"].notna() & df["Publisher"].notna(), "Global_Sales"].sum()) < 0.1
+
+    assert client.get("/stats/pivot", params={"rows": "genre", "cols": "genre"}).status_code == 422
@@ -0,0 +1,55 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from app import deps
+from app.access_log import AccessRecorder, normalize_key, replay
+from app.lifecycle import warmup
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_recorder_merges_counts_into_file(tmp_path):
+    path = tmp_path / "access.json"
+    rec = AccessRecorder(str(path))
+    for _ in range(3):
+        rec.record("GET", "/rankings/games", {"metric": "global_sales", "limit": "10", "genre": None})
+    rec.record("POST", "/ask", {"format": "rows"}, {"question": "Top vendas em 2010"})
+    rec.flush()
+
+    other = AccessRecorder(str(path))
+    other.record("POST", "/ask", {"format": "rows"}, {"question": "Top vendas em 2010"})
+    other.flush()
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert [e["count"] for e in data["keys"]] == [3, 2]
+    assert AccessRecorder(str(path)).top(1) == [
+        normalize_key("GET", "/rankings/games", {"limit": "10", "metric": "global_sales"})
+    ]
+
+
+def test_replay_primes_result_cache(monkeypatch):
+    params = {"metric": "jp_sales", "platform": "3DS", "limit": "7"}
+    stats = replay(app, [normalize_key("GET", "/rankings/games", params)])
+    assert stats == {"replayed": 1, "ok": 1, "seconds": stats["seconds"]}
+
+    def boom(*a, **k):
+        raise AssertionError("deveria vir do cache")
+
+    monkeypatch.setattr(deps.get_backend(), "rankings", boom)
+    r = client.get("/rankings/games", params=params)
+    assert r.status_code == 200
+    assert r.json()["total"] > 0
+
+
+def test_admin_reload_swaps_dataset(monkeypatch):
+    monkeypatch.setattr(deps, "ADMIN_TOKEN", "s3cret")
+    assert client.post("/admin/reload").status_code == 403
+
+    before = deps.get_df()
+    r = client.post("/admin/reload", headers={"X-Admin-Token": "s3cret"})
+    assert r.status_code == 202
+    assert warmup.wait(30)
+    assert deps.get_df() is not before
+    assert client.get("/readyz").status_code == 200
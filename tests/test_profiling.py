@@ -0,0 +1,95 @@
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import deps
+from app.main import app as main_app
+from app.observability import profiling
+from app.services.queries import rankings
+
+
+def test_profiling_routes_absent_by_default():
+    client = TestClient(main_app)
+    assert client.get("/admin/profile", params={"seconds": 0.1}).status_code == 404
+
+
+def test_sampler_collects_service_hotspots():
+    df = deps.get_df()
+    sampler = profiling.StackSampler(0.001).start()
+    stop = time.time() + 0.5
+
+    def work():
+        while time.time() < stop:
+            rankings(df, "global_sales", {"platform": "Wii"}, limit=10)
+
+    t = threading.Thread(target=work)
+    t.start()
+    t.join()
+    report = sampler.stop().report()
+
+    assert report["app_stacks"] > 0
+    assert any(h["function"] == "app.services.queries:rankings" for h in report["hotspots"])
+    first = report["collapsed"].splitlines()[0]
+    stack, count = first.rsplit(" ", 1)
+    assert ";" in stack and int(count) > 0
+
+
+def test_request_profile_session_is_admin_guarded(monkeypatch):
+    monkeypatch.setattr(deps, "ADMIN_TOKEN", "s3cret")
+    app = FastAPI()
+    profiling.setup_profiling(app)
+
+    @app.get("/rankings/games")
+    def _r():
+        return rankings(deps.get_df(), "global_sales", {}, limit=5)[0]
+
+    client = TestClient(app)
+    assert client.post("/admin/profile/requests", params={"route": "/rankings/games", "n": 2}).status_code == 403
+
+    h = {"X-Admin-Token": "s3cret"}
+    r = client.post("/admin/profile/requests", params={"route": "/rankings/games", "n": 2}, headers=h)
+    assert r.status_code == 202
+    for _ in range(3):
+        client.get("/rankings/games")
+    status = client.get("/admin/profile/requests", headers=h).json()
+    assert status["done"] and status["profiled"] == 2
+
+
+def test_request_profile_samples_only_handler_thread(monkeypatch):
+    monkeypatch.setattr(deps, "ADMIN_TOKEN", "s3cret")
+    app = FastAPI()
+    profiling.setup_profiling(app)
+    df = deps.get_df()
+
+    def busy(fn, seconds):
+        stop = time.time() + seconds
+        while time.time() < stop:
+            fn(df, "global_sales", {"platform": "Wii"}, limit=10)
+
+    @app.get("/rankings/games")
+    def _r():
+        busy(rankings, 0.3)
+        return {}
+
+    done = threading.Event()
+
+    def background_rankings(df, metric, filters, limit):
+        return rankings(df, metric, filters, limit=limit)
+
+    noise = threading.Thread(target=lambda: [busy(background_rankings, 0.05) for _ in iter(done.is_set, True)])
+    noise.start()
+    try:
+        client = TestClient(app)
+        h = {"X-Admin-Token": "s3cret"}
+        client.post("/admin/profile/requests", params={"route": "/rankings/games", "n": 1, "interval_ms": 1}, headers=h)
+        client.get("/rankings/games")
+    finally:
+        done.set()
+        noise.join()
+
+    status = client.get("/admin/profile/requests", headers=h).json()
+    assert status["done"] and status["app_stacks"] > 0
+    stacks = status["collapsed"]
+    assert "_r" in stacks and "background_rankings" not in stacks
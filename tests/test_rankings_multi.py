@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import queries
+from app.services.queries import METRICS_MAP
+
+client = TestClient(app)
+
+
+def test_multi_metric_matches_single_metric_rankings():
+    filters = {"platform": "PS3", "year_from": 2008, "year_to": 2012}
+    r = client.get("/rankings/games", params={**filters, "metrics": ",".join(METRICS_MAP), "limit": 5})
+    assert r.status_code == 200
+    data = r.json()
+    assert data["metrics"] == list(METRICS_MAP)
+    for m in METRICS_MAP:
+        single = client.get("/rankings/games", params={**filters, "metric": m, "limit": 5}).json()
+        assert data["rankings"][m] == {"total": single["total"], "items": single["items"]}
+
+
+def test_multi_metric_filters_once(monkeypatch):
+    calls = []
+    original = queries._apply_filters
+
+    def counting(df, filters):
+        calls.append(1)
+        return original(df, filters)
+
+    monkeypatch.setattr(queries, "_apply_filters", counting)
+    r = client.get("/rankings/games", params=[("metrics", "global_sales"), ("metrics", "critic_score"), ("genre", "RPG")])
+    assert r.status_code == 200
+    assert len(calls) == 1
+
+
+def test_multi_metric_rejects_unknown_metric():
+    r = client.get("/rankings/games", params={"metrics": "global_sales,bogus"})
+    assert r.status_code == 422
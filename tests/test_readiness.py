@@ -0,0 +1,39 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.lifecycle import Warmup
+from app.main import app
+
+
+def test_readyz_reports_warmup_after_startup():
+    with TestClient(app) as client:
+        assert client.get("/healthz").status_code == 200
+        deadline = time.time() + 30
+        r = client.get("/readyz")
+        while r.status_code == 503 and time.time() < deadline:
+            time.sleep(0.05)
+            r = client.get("/readyz")
+        assert r.status_code == 200
+        data = r.json()
+        assert data["state"] == "ready"
+        assert set(data["steps"]) == {"dataset", "backend", "meta", "filter_stats", "distribution", "franchises", "titles"}
+        assert client.get("/healthz").json()["dataset_loaded"] is True
+
+
+def test_warmup_states():
+    gate = threading.Event()
+    w = Warmup()
+    w.start([("slow", gate.wait)])
+    assert w.status()["state"] == "loading" and not w.ready
+    assert w.start([("other", lambda: None)]) is False
+    gate.set()
+    assert w.wait(5)
+    assert "slow" in w.status()["steps"]
+
+    failing = Warmup()
+    failing.start([("dataset", lambda: 1 / 0)])
+    failing.wait(5)
+    assert failing.status()["state"] == "error"
+    assert failing.status()["error"].startswith("dataset:")
@@ -0,0 +1,40 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.deps import get_df
+from app.main import app
+from app.services import scoring
+
+client = TestClient(app)
+
+
+def test_weighted_score_matches_manual_computation():
+    r = client.get("/rankings/score", params={"weights": "global_sales:1,critic_score:0.05", "genre": "Role-Playing", "limit": 5})
+    assert r.status_code == 200
+    data = r.json()
+    assert data["expr"] == "1.0 * global_sales + 0.05 * critic_score"
+
+    df = get_df()
+    dff = df[df["Genre"] == "Role-Playing"]
+    expected = (dff["Global_Sales"] + 0.05 * dff["Critic_Score"]).dropna()
+    assert data["total"] == len(expected)
+    scores = [it["score"] for it in data["items"]]
+    assert scores == sorted(scores, reverse=True)
+    assert np.isclose(scores[0], expected.max())
+
+
+def test_score_column_is_cached_per_expression(monkeypatch):
+    df = get_df()
+    _, first = scoring.score_column(df, "bayes(user_score, user_count, 50)")
+    calls = []
+    monkeypatch.setattr(scoring, "_evaluate", lambda *a: calls.append(1))
+    _, again = scoring.score_column(df, "bayes( user_score,user_count , 50 )")
+    assert again is first
+    assert calls == []
+
+
+def test_score_rejects_unsafe_or_ambiguous_input():
+    for expr in ["__import__('os')", "global_sales.real", "unknown_col * 2"]:
+        assert client.get("/rankings/score", params={"expr": expr}).status_code == 422
+    assert client.get("/rankings/score").status_code == 422
+    assert client.get("/rankings/score", params={"preset": "bayes_user", "expr": "global_sales"}).status_code == 422
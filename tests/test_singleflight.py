@@ -0,0 +1,60 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.queries import normalize_filters
+from app.services.singleflight import SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_computation():
+    sf = SingleFlight()
+    calls = []
+    start = threading.Barrier(8)
+    results = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"value": 42}
+
+    def worker():
+        start.wait()
+        results.append(sf.do(("k", 1), compute))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"value": 42}] * 8
+    assert sf.in_flight() == 0
+
+
+def test_errors_propagate_to_all_waiters_and_are_not_kept():
+    sf = SingleFlight()
+
+    def boom():
+        raise ValueError("falhou")
+
+    try:
+        sf.do("x", boom)
+    except ValueError:
+        pass
+    assert sf.do("x", lambda: "ok") == "ok"
+
+
+def test_normalize_filters_matches_filter_semantics():
+    a = normalize_filters({"year": 2010, "platform": "PS3", "genre": None, "publisher": ""})
+    b = normalize_filters({"platform": "ps3", "year": "2010.0"})
+    assert a == b == (("platform", "ps3"), ("year", 2010))
+
+
+def test_coalesced_endpoints_echo_own_params():
+    client = TestClient(app)
+    r = client.get("/stats/aggregate", params={"metric": "critic_score", "name_contains": "Zelda"})
+    assert r.status_code == 200
+    assert r.json()["name_contains"] == "Zelda"
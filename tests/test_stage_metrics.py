@@ -0,0 +1,25 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_stage_histograms_exposed_on_metrics():
+    client.get("/rankings/games", params={"metric": "global_sales", "year": 2010, "limit": 5})
+    client.get("/stats/aggregate", params={"metric": "critic_score", "name_contains": "zelda"})
+    client.get("/games/suggest", params={"q": "zeld", "limit": 5})
+    client.post("/ask", json={"question": "Top vendas no Japão no Nintendo DS"})
+
+    body = client.get("/metrics").text
+    for st in ("filters", "rankings.sort", "rankings.serialize", "aggregate.reduce", "suggest.prefix", "nlq.parse"):
+        assert f'ia_games_stage_seconds_count{{stage="{st}"}}' in body
+    assert 'ia_games_rows_scanned_total{op="rankings"}' in body
+    assert "ia_games_dataset_rows" in body
+
+
+def test_suggest_limit_bounds():
+    assert client.get("/games/suggest", params={"q": "mario", "limit": -1}).status_code == 422
+    assert client.get("/games/suggest", params={"q": "mario", "limit": 0}).status_code == 422
+    r = client.get("/games/suggest", params={"q": "mario", "limit": 3})
+    assert r.status_code == 200 and len(r.json()["items"]) == 3
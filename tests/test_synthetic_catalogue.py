@@ -0,0 +1,13 @@
+from app.deps import get_df
+from app.services.dataset import EXPECTED_COLS
+from benchmarks.synthetic import make_catalogue
+
+
+def test_synthetic_catalogue_keeps_schema_and_scales():
+    base = get_df()
+    cat = make_catalogue(base, 3, seed=1)
+    assert list(cat.columns) == EXPECTED_COLS
+    assert len(cat) == 3 * len(base)
+    assert cat["Name"].nunique() >= 3 * base["Name"].nunique() - 3
+    again = make_catalogue(base, 3, seed=1)
+    assert cat["Global_Sales"].equals(again["Global_Sales"])
@@ -0,0 +1,42 @@
+from fastapi.testclient import TestClient
+
+from app.deps import get_df
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_title_rankings_sum_platforms():
+    r = client.get("/rankings/games", params={"level": "title", "limit": 5})
+    assert r.status_code == 200
+    data = r.json()
+    assert data["level"] == "title"
+
+    df = get_df()
+    ref = df.groupby("Name")["Global_Sales"].sum().sort_values(ascending=False)
+    assert [it["name"] for it in data["items"]] == list(ref.index[:5])
+    assert data["total"] == df["Name"].nunique()
+    gta = next(it for it in data["items"] if it["name"] == "Grand Theft Auto V")
+    assert gta["releases"] == 5
+    assert set(gta["platforms"]) == set(df.loc[df["Name"] == "Grand Theft Auto V", "Platform"])
+    assert abs(gta["global_sales"] - ref["Grand Theft Auto V"]) < 1e-6
+
+
+def test_title_filters():
+    data = client.get(
+        "/rankings/games", params={"level": "title", "platform": "Wii", "metric": "critic_score", "limit": 20}
+    ).json()
+    assert data["total"] > 0
+    assert all("Wii" in it["platforms"] for it in data["items"])
+    scores = [it["critic_score"] for it in data["items"]]
+    assert scores == sorted(scores, reverse=True)
+
+    r = client.get("/rankings/games", params={"level": "title", "metrics": "global_sales"})
+    assert r.status_code == 422
+
+
+def test_title_details():
+    item = client.get("/games/Grand Theft Auto V", params={"level": "title"}).json()
+    assert item["releases"] == 5 and "platform" not in item
+    game = client.get("/games/Grand Theft Auto V").json()
+    assert game["platform"] == "PS3" and "platforms" not in game
@@ -0,0 +1,44 @@
+from fastapi.testclient import TestClient
+
+from app.deps import get_df
+from app.main import app
+from app.services import suggest
+from app.services.suggest import SuggestSession, suggest_names
+
+client = TestClient(app)
+
+
+def test_ws_matches_http():
+    with client.websocket_connect("/ws/suggest") as ws:
+        for i, q in enumerate(["ma", "mar", "mario", "zelda"]):
+            ws.send_json({"q": q, "limit": 5, "id": i})
+            msg = ws.receive_json()
+            assert msg["id"] == i and msg["q"] == q
+            assert msg["items"] == client.get("/games/suggest", params={"q": q, "limit": 5}).json()["items"]
+
+
+def test_ws_drops_superseded_queries():
+    with client.websocket_connect("/ws/suggest") as ws:
+        for i, q in enumerate(["p", "po", "pok", "poke", "pokem", "pokemo", "pokemon"]):
+            ws.send_json({"q": q, "id": i})
+        ids = []
+        while not ids or ids[-1] != 6:
+            ids.append(ws.receive_json()["id"])
+        assert ids == sorted(ids)
+
+
+def test_session_narrows_candidates(monkeypatch):
+    df = get_df()
+    seen = []
+    real = suggest.prefix_matches
+
+    def spy(df_, q, candidates=None):
+        seen.append(None if candidates is None else len(candidates))
+        return real(df_, q, candidates)
+
+    monkeypatch.setattr(suggest, "prefix_matches", spy)
+    session = SuggestSession(df)
+    assert session.suggest("gr", 5) == suggest_names(df, "gr", 5)
+    seen.clear()
+    assert session.suggest("gra", 5) == suggest_names(df, "gra", 5)
+    assert seen[0] is not None and seen[0] < len(df)